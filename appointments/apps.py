@@ -5,4 +5,7 @@ from django.apps import AppConfig
 class AppointmentsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "appointments"
-    verbose_name = _("Appointments")
\ No newline at end of file
+    verbose_name = _("Appointments")
+
+    def ready(self):
+        import appointments.signals
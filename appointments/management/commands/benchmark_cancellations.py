@@ -0,0 +1,85 @@
+import time as timer
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+
+from appointments.models import Appointment
+from appointments.services import cancel_appointments_with_notification
+from clinics.models import Clinic
+from common.benchmark import rolled_back
+from users.models import CustomUser as User
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks cancel_appointments_with_notification on generated "
+        "appointments. Everything runs in a rolled back transaction and no SMS "
+        "task is actually enqueued."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=5000)
+        parser.add_argument(
+            "--clinic", type=int, help="Clinic id, defaults to the first clinic"
+        )
+        parser.add_argument(
+            "--patient", type=int, help="Patient user id, defaults to the first patient"
+        )
+
+    def handle(self, *args, **options):
+        clinic = (
+            Clinic.objects.filter(pk=options["clinic"])
+            if options["clinic"]
+            else Clinic.objects.all()
+        )
+        patient = User.objects.filter(role=User.Role.PATIENT)
+        if options["patient"]:
+            patient = patient.filter(pk=options["patient"])
+        clinic, patient = clinic.first(), patient.first()
+        if clinic is None or patient is None:
+            raise CommandError("A clinic and a patient are required.")
+
+        with rolled_back():
+            self.run(clinic, patient, options["count"])
+
+    @override_settings(TESTING=False)
+    def run(self, clinic, patient, count):
+        start = datetime.combine(
+            now().date() + timedelta(days=365), datetime.min.time()
+        )
+        Appointment.objects.bulk_create(
+            [
+                Appointment(
+                    patient=patient,
+                    clinic=clinic,
+                    visit_date=(start + timedelta(minutes=i)).date(),
+                    visit_time=(start + timedelta(minutes=i)).time(),
+                    status=Appointment.Status.WAITING,
+                )
+                for i in range(count)
+            ]
+        )
+        appointments = Appointment.objects.filter(
+            clinic=clinic,
+            visit_date__gte=start.date(),
+            status=Appointment.Status.WAITING,
+        )
+
+        with patch("users.tasks.send_sms_batch.delay") as send_sms_batch:
+            with CaptureQueriesContext(connection) as queries:
+                with TestCase.captureOnCommitCallbacks(execute=True):
+                    started = timer.perf_counter()
+                    cancel_appointments_with_notification(appointments, patient)
+                    elapsed = timer.perf_counter() - started
+
+        messages = sum(len(call.args[0]) for call in send_sms_batch.call_args_list)
+        self.stdout.write(f"appointments cancelled: {count}")
+        self.stdout.write(f"elapsed:                {elapsed * 1000:.1f} ms")
+        self.stdout.write(f"queries:                {len(queries)}")
+        self.stdout.write(f"sms batch tasks:        {send_sms_batch.call_count}")
+        self.stdout.write(f"sms messages:           {messages}")
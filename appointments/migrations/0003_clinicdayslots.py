@@ -0,0 +1,67 @@
+# Generated by Django 5.2.1 on 2025-09-02 12:00
+
+import django.contrib.postgres.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("appointments", "0002_initial"),
+        ("clinics", "0003_trigram_ext"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ClinicDaySlots",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(verbose_name="Date")),
+                (
+                    "is_special",
+                    models.BooleanField(default=False, verbose_name="Is Special"),
+                ),
+                (
+                    "visit_times",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.TimeField(),
+                        blank=True,
+                        default=list,
+                        size=None,
+                        verbose_name="Visit Times",
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Updated At"),
+                ),
+                (
+                    "clinic",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="day_slots",
+                        to="clinics.clinic",
+                        verbose_name="Clinic",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Clinic Day Slots",
+                "verbose_name_plural": "Clinic Day Slots",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("clinic", "date"), name="unique_clinic_day_slots"
+                    )
+                ],
+            },
+        ),
+    ]
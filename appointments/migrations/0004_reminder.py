@@ -0,0 +1,92 @@
+# Generated by Django 5.2.1 on 2025-09-03 12:00
+
+import json
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def move_periodic_task_reminders(apps, schema_editor):
+    """
+    Converts the one-off reminder tasks created per booking into Reminder
+    rows and removes them from the beat schedule.
+    """
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    Appointment = apps.get_model("appointments", "Appointment")
+    Reminder = apps.get_model("appointments", "Reminder")
+
+    tasks = PeriodicTask.objects.filter(
+        task="appointments.tasks.send_appointment_reminder",
+        clocked__isnull=False,
+    ).select_related("clocked")
+
+    pending = {}
+    for task in tasks:
+        if task.enabled and task.clocked.clocked_time > timezone.now():
+            appointment_id = json.loads(task.args)[0]
+            pending[(appointment_id, task.clocked.clocked_time)] = appointment_id
+
+    waiting_ids = set(
+        Appointment.objects.filter(
+            id__in=set(pending.values()), status="waiting"
+        ).values_list("id", flat=True)
+    )
+    Reminder.objects.bulk_create(
+        [
+            Reminder(appointment_id=appointment_id, remind_at=remind_at)
+            for appointment_id, remind_at in pending
+            if appointment_id in waiting_ids
+        ],
+        ignore_conflicts=True,
+    )
+    tasks.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("appointments", "0003_clinicdayslots"),
+        ("django_celery_beat", "0019_alter_periodictasks_options"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Reminder",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "remind_at",
+                    models.DateTimeField(db_index=True, verbose_name="Remind At"),
+                ),
+                (
+                    "appointment",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="reminders",
+                        to="appointments.appointment",
+                        verbose_name="Appointment",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Reminder",
+                "verbose_name_plural": "Reminders",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("appointment", "remind_at"),
+                        name="unique_appointment_reminder",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(move_periodic_task_reminders, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,7 @@
 from django.utils.translation import gettext_lazy as _
 from django.db import models
 from django.db.models import Q
+from django.contrib.postgres.fields import ArrayField
 
 from simple_history.models import HistoricalRecords
 
@@ -150,3 +151,69 @@ class Attachment(models.Model):
 
     def __str__(self):
         return f"Attachment for Appointment {self.appointment.id}"
+
+
+class ClinicDaySlots(models.Model):
+    """
+    Materialized slot grid of a clinic for a single date.
+
+    Rows are built lazily from `ClinicSchedule`/`AvailableHour` and the clinic's
+    `time_slot_per_patient`, and dropped whenever one of them changes.
+    """
+
+    clinic = models.ForeignKey(
+        Clinic,
+        on_delete=models.CASCADE,
+        related_name="day_slots",
+        verbose_name=_("Clinic"),
+    )
+    date = models.DateField(verbose_name=_("Date"))
+    is_special = models.BooleanField(default=False, verbose_name=_("Is Special"))
+    visit_times = ArrayField(
+        models.TimeField(),
+        default=list,
+        blank=True,
+        verbose_name=_("Visit Times"),
+    )
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Updated At"))
+
+    class Meta:
+        verbose_name = _("Clinic Day Slots")
+        verbose_name_plural = _("Clinic Day Slots")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["clinic", "date"],
+                name="unique_clinic_day_slots",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.clinic_id} - {self.date} ({len(self.visit_times)} slots)"
+
+
+class Reminder(models.Model):
+    """
+    Pending SMS reminder of an appointment, claimed and sent by the
+    `send_due_reminders` beat task once `remind_at` is reached.
+    """
+
+    appointment = models.ForeignKey(
+        Appointment,
+        on_delete=models.CASCADE,
+        related_name="reminders",
+        verbose_name=_("Appointment"),
+    )
+    remind_at = models.DateTimeField(db_index=True, verbose_name=_("Remind At"))
+
+    class Meta:
+        verbose_name = _("Reminder")
+        verbose_name_plural = _("Reminders")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["appointment", "remind_at"],
+                name="unique_appointment_reminder",
+            )
+        ]
+
+    def __str__(self):
+        return f"Reminder for Appointment {self.appointment_id} at {self.remind_at}"
@@ -4,14 +4,13 @@ from django.utils.timezone import now
 from rest_framework import serializers
 
 from appointments.models import Appointment
-from schedules.models import AvailableHour, ClinicSchedule
-from appointments.services import get_split_visit_times
+from appointments.services import get_clinic_day_slots
 from clinics.serializers import ClinicSummarySerializer
 
 
 class AppointmentBookingSerializer(serializers.ModelSerializer):
     clinic = ClinicSummarySerializer(read_only=True)
-    
+
     class Meta:
         model = Appointment
         fields = [
@@ -46,14 +45,7 @@ class AppointmentBookingSerializer(serializers.ModelSerializer):
         visit_time = data["visit_time"]
         clinic = self.context.get("clinic")
 
-        try:
-            schedule = ClinicSchedule.objects.get(clinic=clinic, special_date=visit_date)
-        except ClinicSchedule.DoesNotExist:
-            weekday = visit_date.strftime('%A').lower()
-            schedule = ClinicSchedule.objects.get(clinic=clinic, day_name=weekday)
-           
-        available_hours = AvailableHour.objects.filter(schedule=schedule)
-        start_times = get_split_visit_times(available_hours, clinic.time_slot_per_patient)
+        start_times = get_clinic_day_slots(clinic, visit_date)[0].visit_times
 
         if visit_time not in start_times:
             raise serializers.ValidationError({"visit_time": "Invalid visit time. Must match available hours."})
@@ -66,4 +58,3 @@ class AppointmentBookingSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError({"visit_time": _("This time slot is already booked.")})
 
         return data
-
@@ -4,14 +4,13 @@ from django.utils.timezone import now
 from rest_framework import serializers
 
 from appointments.models import Appointment
-from schedules.models import AvailableHour, ClinicSchedule
-from appointments.services import get_split_visit_times
+from appointments.services import get_clinic_day_slots
 from clinics.serializers import ClinicSummarySerializer
 
 
 class UpdateAppointmentSerializer(serializers.ModelSerializer):
     clinic = ClinicSummarySerializer(read_only=True)
-    
+
     class Meta:
         model = Appointment
         fields = [
@@ -41,7 +40,6 @@ class UpdateAppointmentSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(_("Visit date must be in the future."))
         return value
 
-    
     def validate(self, attrs):
         visit_date = attrs.get("visit_date", self.instance.visit_date)
         visit_time = attrs.get("visit_time", self.instance.visit_time)
@@ -49,14 +47,7 @@ class UpdateAppointmentSerializer(serializers.ModelSerializer):
         clinic = instance.clinic
         user = instance.patient
 
-        try:
-            schedule = ClinicSchedule.objects.get(clinic=clinic, special_date=visit_date)
-        except ClinicSchedule.DoesNotExist:
-            weekday = visit_date.strftime('%A').lower()
-            schedule = ClinicSchedule.objects.get(clinic=clinic, day_name=weekday)
-
-        available_hours = AvailableHour.objects.filter(schedule=schedule)
-        start_times = get_split_visit_times(available_hours, clinic.time_slot_per_patient)
+        start_times = get_clinic_day_slots(clinic, visit_date)[0].visit_times
 
         if visit_time not in start_times:
             raise serializers.ValidationError({"visit_time": _("Invalid visit time. Must match available hours.")})
@@ -69,7 +60,7 @@ class UpdateAppointmentSerializer(serializers.ModelSerializer):
             status=Appointment.Status.CANCELLED
         ).exclude(pk=instance.pk).exists():
             raise serializers.ValidationError({"visit_time": _("This time slot is already booked.")})
-        
+
         return attrs
 
     def update(self, instance, validated_data):
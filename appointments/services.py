@@ -1,11 +1,16 @@
-from django.utils.timezone import now
+from django.utils.timezone import now, make_aware
 from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import QuerySet, prefetch_related_objects
 from django.utils.translation import gettext_lazy as _
-from .models import Appointment
+from .models import Appointment, ClinicDaySlots, Reminder
+from .slots import first_free_slots, split_visit_minutes, to_minutes, to_time
 from schedules.models import AvailableHour, ClinicSchedule, Clinic
-from users.tasks import send_sms
-from datetime import datetime, timedelta, time
-from typing import List, Dict
+from users.tasks import enqueue_sms_batches
+from clinic_statistics.services import refresh_clinic_daily_stats
+from datetime import datetime, time, timedelta
+import math
 
 
 def cancel_appointments_with_notification(appointments, cancelled_by_user):
@@ -13,16 +18,27 @@ def cancel_appointments_with_notification(appointments, cancelled_by_user):
     Cancels the given appointments and sends SMS notifications to patients
     if the environment is not TESTING.
 
+    Patients and doctors are fetched in a single query and the notifications
+    are enqueued in batches once the transaction commits.
+
     Args:
         appointments (QuerySet or list): List or queryset of Appointment instances.
         cancelled_by_user (User): The user responsible for the cancellation.
     """
+    if isinstance(appointments, QuerySet):
+        appointments = appointments.select_related("patient", "clinic__doctor__user")
+    else:
+        prefetch_related_objects(appointments, "patient", "clinic__doctor__user")
+    appointments = list(appointments)
     if not appointments:
         return  # Nothing to cancel
 
     if not settings.TESTING:
+        messages = []
         for appointment in appointments:
             patient = appointment.patient
+            if not patient:
+                continue
             doctor = appointment.clinic.doctor.user
             message = _(
                 "Dear {patient},\n your appointment on {date} at {time} with Dr. {doctor} has been cancelled due to clinic schedule changes.\n"
@@ -33,7 +49,8 @@ def cancel_appointments_with_notification(appointments, cancelled_by_user):
                 time=appointment.visit_time.strftime("%H:%M"),
                 doctor=doctor.full_name,
             )
-            send_sms.delay(patient.phone, message)
+            messages.append((patient.phone, str(message)))
+        enqueue_sms_batches(messages)
 
     Appointment.objects.filter(id__in=[a.id for a in appointments]).update(
         status=Appointment.Status.CANCELLED,
@@ -41,19 +58,208 @@ def cancel_appointments_with_notification(appointments, cancelled_by_user):
         cancelled_by=cancelled_by_user,
     )
 
+    # Queryset updates bypass the Appointment signals
+    Reminder.objects.filter(appointment_id__in=[a.id for a in appointments]).delete()
+    dates_by_clinic = {}
+    for appointment in appointments:
+        dates_by_clinic.setdefault(appointment.clinic_id, set()).add(
+            appointment.visit_date
+        )
+    for clinic_id, dates in dates_by_clinic.items():
+        invalidate_next_available_slot(clinic_id)
+        refresh_clinic_daily_stats(clinic_id, dates, ["appointments"])
+
 
 def get_split_visit_times(available_hours, time_slot):
     """
     Converts available hours into discrete visit times based on the time slot.
     """
-    visit_times = []
-    for hour in available_hours:
-        current = datetime.combine(datetime.today(), hour.start_hour)
-        end = datetime.combine(datetime.today(), hour.end_hour)
-        while current + timedelta(minutes=time_slot) <= end:
-            visit_times.append(current.time())
-            current += timedelta(minutes=time_slot)
-    return visit_times
+    return [
+        to_time(minutes) for minutes in split_visit_minutes(available_hours, time_slot)
+    ]
+
+
+def _date_range(start_date, end_date):
+    return [
+        start_date + timedelta(days=offset)
+        for offset in range((end_date - start_date).days + 1)
+    ]
+
+
+class ClinicDayResolver:
+    """
+    Resolves the effective schedule, available hours, visit times and bookings
+    of one or more clinics over a date range.
+
+    Every kind of data is loaded for the whole range at first use, so the
+    resolver costs a constant number of queries whatever the range length:
+    special-date schedules, weekday schedules, their hours and non-cancelled
+    bookings, one query each.
+    """
+
+    def __init__(self, clinics: list[Clinic], start_date, end_date):
+        self.clinics = {clinic.pk: clinic for clinic in clinics}
+        self.start_date = start_date
+        self.end_date = end_date
+        self._schedules = None
+        self._hours = None
+        self._bookings = None
+
+    @property
+    def dates(self):
+        return _date_range(self.start_date, self.end_date)
+
+    def _load_schedules(self):
+        if self._schedules is not None:
+            return self._schedules
+
+        special_schedules = ClinicSchedule.objects.filter(
+            clinic_id__in=self.clinics.keys(),
+            special_date__range=(self.start_date, self.end_date),
+        )
+        weekday_schedules = ClinicSchedule.objects.filter(
+            clinic_id__in=self.clinics.keys(),
+            special_date__isnull=True,
+        )
+        self._schedules = {
+            **{(s.clinic_id, s.day_name): s for s in weekday_schedules},
+            **{(s.clinic_id, s.special_date): s for s in special_schedules},
+        }
+        return self._schedules
+
+    def _load_hours(self):
+        if self._hours is not None:
+            return self._hours
+
+        schedule_ids = [schedule.pk for schedule in self._load_schedules().values()]
+        self._hours = {}
+        for hour in AvailableHour.objects.filter(schedule_id__in=schedule_ids).order_by(
+            "start_hour"
+        ):
+            self._hours.setdefault(hour.schedule_id, []).append(hour)
+        return self._hours
+
+    def _load_bookings(self):
+        if self._bookings is not None:
+            return self._bookings
+
+        self._bookings = {}
+        booked_rows = (
+            Appointment.objects.filter(
+                clinic_id__in=self.clinics.keys(),
+                visit_date__range=(self.start_date, self.end_date),
+            )
+            .exclude(status=Appointment.Status.CANCELLED)
+            .values_list("clinic_id", "visit_date", "visit_time", "status")
+        )
+        for clinic_id, visit_date, visit_time, status in booked_rows:
+            self._bookings.setdefault((clinic_id, visit_date), {})[visit_time] = status
+        return self._bookings
+
+    def schedule(self, clinic_id, visit_date):
+        """
+        Returns (schedule, is_special) for the date; a special-date schedule
+        overrides the weekday schedule.
+        """
+        schedules = self._load_schedules()
+        special = schedules.get((clinic_id, visit_date))
+        if special is not None:
+            return special, True
+        weekday = visit_date.strftime("%A").lower()
+        return schedules.get((clinic_id, weekday)), False
+
+    def available_hours(self, clinic_id, visit_date):
+        schedule, _ = self.schedule(clinic_id, visit_date)
+        if schedule is None:
+            return []
+        return self._load_hours().get(schedule.pk, [])
+
+    def visit_times(self, clinic_id, visit_date):
+        return get_split_visit_times(
+            self.available_hours(clinic_id, visit_date),
+            self.clinics[clinic_id].time_slot_per_patient,
+        )
+
+    def booked_times(self, clinic_id, visit_date, status=None):
+        """
+        Returns the set of booked (non-cancelled) visit times of the date,
+        optionally restricted to a single status.
+        """
+        bookings = self._load_bookings().get((clinic_id, visit_date), {})
+        return {
+            visit_time
+            for visit_time, booking_status in bookings.items()
+            if status is None or booking_status == status
+        }
+
+    def bookings(self):
+        """
+        Yields (clinic_id, visit_date, visit_time) of every non-cancelled
+        booking in range.
+        """
+        for (clinic_id, visit_date), bookings in self._load_bookings().items():
+            for visit_time in bookings:
+                yield clinic_id, visit_date, visit_time
+
+
+def build_clinic_day_slots(resolver: ClinicDayResolver, clinic: Clinic, visit_date):
+    """
+    Builds (without saving) the slot grid of the clinic for the given date.
+    """
+    _, is_special = resolver.schedule(clinic.pk, visit_date)
+    return ClinicDaySlots(
+        clinic=clinic,
+        date=visit_date,
+        is_special=is_special,
+        visit_times=resolver.visit_times(clinic.pk, visit_date),
+    )
+
+
+def get_clinic_day_slots(clinic: Clinic, start_date, end_date=None):
+    """
+    Returns the indexed slot grid of the clinic for every date between
+    start_date and end_date (inclusive), ordered by date.
+
+    Days missing from the index are built and stored on the fly, so a fully
+    indexed range costs a single query.
+    """
+    end_date = end_date or start_date
+    dates = _date_range(start_date, end_date)
+    if not dates:
+        return []
+
+    day_slots_by_date = {
+        day_slots.date: day_slots
+        for day_slots in ClinicDaySlots.objects.filter(
+            clinic=clinic, date__range=(start_date, end_date)
+        )
+    }
+
+    missing_dates = [d for d in dates if d not in day_slots_by_date]
+    if missing_dates:
+        resolver = ClinicDayResolver([clinic], missing_dates[0], missing_dates[-1])
+        missing = [
+            build_clinic_day_slots(resolver, clinic, visit_date)
+            for visit_date in missing_dates
+        ]
+        ClinicDaySlots.objects.bulk_create(missing, ignore_conflicts=True)
+        day_slots_by_date.update({day_slots.date: day_slots for day_slots in missing})
+
+    return [day_slots_by_date[visit_date] for visit_date in dates]
+
+
+def invalidate_clinic_day_slots(clinic_id, **filters):
+    """
+    Drops indexed days of the clinic matching the given filters, both now and
+    once the surrounding transaction commits, so concurrent readers cannot
+    re-index a stale schedule.
+    """
+
+    def invalidate():
+        ClinicDaySlots.objects.filter(clinic_id=clinic_id, **filters).delete()
+
+    invalidate()
+    transaction.on_commit(invalidate)
 
 
 def get_next_available_slot(clinic: Clinic | int, start_datetime=None, days_ahead=30):
@@ -69,6 +275,14 @@ def get_next_available_slots_for_clinics(
     start_datetime=None,
     days_ahead=30,
 ):
+    """
+    Returns a {clinic_id: (date, time)} mapping of the nearest free slot of
+    every clinic within days_ahead days, or (None, None) when there is none.
+
+    The whole window is resolved at once: schedules, hours and bookings are
+    loaded with a constant number of queries and the slot grids of all
+    clinics and days are searched by the vectorized slot engine.
+    """
     if isinstance(clinics, list) and all(isinstance(c, int) for c in clinics):
         clinics = list(Clinic.objects.filter(pk__in=clinics))
 
@@ -77,85 +291,153 @@ def get_next_available_slots_for_clinics(
 
     start = start_datetime or now()
     start_date = start.date()
+    resolver = ClinicDayResolver(
+        clinics, start_date, start_date + timedelta(days=days_ahead)
+    )
 
-    clinic_by_id = {c.pk: c for c in clinics}
-    pending_ids = set(clinic_by_id.keys())
-    results: Dict[int, tuple] = {}
-
-    for day_offset in range(days_ahead + 1):
-        if not pending_ids:
-            break
-        target_date = start_date + timedelta(days=day_offset)
-        weekday = target_date.strftime("%A").lower()
-        is_today = day_offset == 0
-        today_time_bound = start.time() if is_today else None
-
-        # Fetch schedules for all pending clinics for this date
-        specials = ClinicSchedule.objects.filter(
-            clinic_id__in=pending_ids,
-            special_date=target_date,
-            is_available=True,
-        )
-        special_by_clinic = {s.clinic_id: s for s in specials}
+    ranges = []
+    for clinic in clinics:
+        for day_index, visit_date in enumerate(resolver.dates):
+            for hour in resolver.available_hours(clinic.pk, visit_date):
+                ranges.append(
+                    (
+                        clinic.pk,
+                        day_index,
+                        to_minutes(hour.start_hour),
+                        to_minutes(hour.end_hour),
+                        clinic.time_slot_per_patient,
+                    )
+                )
+    booked = [
+        (clinic_id, (visit_date - start_date).days, to_minutes(visit_time))
+        for clinic_id, visit_date, visit_time in resolver.bookings()
+    ]
 
-        remaining_for_weekly = list(pending_ids - set(special_by_clinic.keys()))
-        weekly = ClinicSchedule.objects.filter(
-            clinic_id__in=remaining_for_weekly,
-            day_name=weekday,
-            is_available=True,
-        )
-        weekly_by_clinic = {s.clinic_id: s for s in weekly}
+    # Slots of today must not start before now.
+    elapsed = timedelta(
+        hours=start.hour,
+        minutes=start.minute,
+        seconds=start.second,
+        microseconds=start.microsecond,
+    )
+    first_free = first_free_slots(
+        ranges, booked, not_before=math.ceil(elapsed / timedelta(minutes=1))
+    )
 
-        schedule_by_clinic = {**weekly_by_clinic, **special_by_clinic}
-        if not schedule_by_clinic:
-            continue
+    results = {}
+    for clinic in clinics:
+        if clinic.pk in first_free:
+            day_index, minutes = first_free[clinic.pk]
+            results[clinic.pk] = (
+                start_date + timedelta(days=day_index),
+                to_time(minutes),
+            )
+        else:
+            results[clinic.pk] = (None, None)
+    return results
 
-        schedule_ids = [s.id for s in schedule_by_clinic.values()]
-        hours_qs = AvailableHour.objects.filter(schedule_id__in=schedule_ids).order_by(
-            "start_hour"
-        )
-        hours_by_schedule: Dict[int, list] = {}
-        for h in hours_qs:
-            hours_by_schedule.setdefault(h.schedule_id, []).append(h)
 
-        # Fetch bookings for all involved clinics on this date in one go
-        booked_rows = (
-            Appointment.objects.filter(
-                clinic_id__in=schedule_by_clinic.keys(),
-                visit_date=target_date,
-            )
-            .exclude(status=Appointment.Status.CANCELLED)
-            .values_list("clinic_id", "visit_time")
-        )
-        booked_by_clinic: Dict[int, set] = {}
-        for clinic_id, visit_time in booked_rows:
-            booked_by_clinic.setdefault(clinic_id, set()).add(visit_time)
+NEXT_AVAILABLE_SLOT_CACHE_KEY = "appointments:next-available-slot:{clinic_id}"
+NEXT_AVAILABLE_SLOT_CACHE_TIMEOUT = 60 * 60 * 24  # 24 hours
 
-        for clinic_id in list(pending_ids):
-            schedule = schedule_by_clinic.get(clinic_id)
-            if not schedule:
-                continue
 
-            available_hours = hours_by_schedule.get(schedule.id, [])
-            if not available_hours:
-                continue
+def _next_available_slot_cache_key(clinic_id):
+    return NEXT_AVAILABLE_SLOT_CACHE_KEY.format(clinic_id=clinic_id)
 
-            slot_minutes = clinic_by_id[clinic_id].time_slot_per_patient
-            candidate_times = get_split_visit_times(available_hours, slot_minutes)
-            if is_today:
-                candidate_times = [t for t in candidate_times if t >= today_time_bound]
-            if not candidate_times:
-                continue
 
-            booked_times = booked_by_clinic.get(clinic_id, set())
-            for visit_time in candidate_times:
-                if visit_time not in booked_times:
-                    results[clinic_id] = (target_date, visit_time)
-                    pending_ids.discard(clinic_id)
-                    break
+def get_cached_next_available_slots_for_clinics(clinics: list[Clinic | int]):
+    """
+    Cached variant of get_next_available_slots_for_clinics starting from now.
+
+    All clinics are looked up with a single get_many (MGET); only the misses
+    are computed, in bulk, and written back. A cached slot that is already in
+    the past counts as a miss, and "no slot" entries expire at the end of the
+    day, when the search window moves forward.
+    """
+    if not clinics:
+        return {}
+
+    start = now()
+    clinic_ids = [c.pk if isinstance(c, Clinic) else c for c in clinics]
+    keys = {
+        clinic_id: _next_available_slot_cache_key(clinic_id) for clinic_id in clinic_ids
+    }
+    cached = cache.get_many(keys.values())
+
+    results = {}
+    missing = []
+    for clinic, clinic_id in zip(clinics, clinic_ids):
+        slot = cached.get(keys[clinic_id])
+        if slot is None or (
+            slot[0] is not None and slot < (start.date(), start.time())
+        ):
+            missing.append(clinic)
+        else:
+            results[clinic_id] = slot
 
-    # Fill unresolved clinics with (None, None)
-    for clinic_id in pending_ids:
-        results[clinic_id] = (None, None)
+    if missing:
+        computed = get_next_available_slots_for_clinics(missing, start)
+        found = {
+            keys[clinic_id]: slot
+            for clinic_id, slot in computed.items()
+            if slot[0] is not None
+        }
+        not_found = {
+            keys[clinic_id]: slot
+            for clinic_id, slot in computed.items()
+            if slot[0] is None
+        }
+        if found:
+            cache.set_many(found, NEXT_AVAILABLE_SLOT_CACHE_TIMEOUT)
+        if not_found:
+            end_of_day = datetime.combine(
+                start.date() + timedelta(days=1), time.min, start.tzinfo
+            )
+            cache.set_many(not_found, max(int((end_of_day - start).total_seconds()), 1))
+        results.update(computed)
 
     return results
+
+
+def invalidate_next_available_slot(clinic_id):
+    """
+    Drops the cached next available slot of the clinic, both now and once the
+    surrounding transaction commits.
+    """
+
+    def invalidate():
+        cache.delete(_next_available_slot_cache_key(clinic_id))
+
+    invalidate()
+    transaction.on_commit(invalidate)
+
+
+REMINDER_OFFSETS = [
+    timedelta(days=1),
+    timedelta(hours=1),
+    timedelta(minutes=15),
+]
+
+
+def schedule_appointment_reminders(appointment: Appointment):
+    """
+    Replaces the pending reminders of the appointment: waiting appointments
+    get one reminder per offset that is still in the future, any other
+    status gets none.
+    """
+    Reminder.objects.filter(appointment=appointment).delete()
+    if appointment.status != Appointment.Status.WAITING:
+        return
+
+    visit_datetime = make_aware(
+        datetime.combine(appointment.visit_date, appointment.visit_time)
+    )
+    current_time = now()
+    Reminder.objects.bulk_create(
+        [
+            Reminder(appointment=appointment, remind_at=visit_datetime - offset)
+            for offset in REMINDER_OFFSETS
+            if visit_datetime - offset > current_time
+        ],
+        ignore_conflicts=True,
+    )
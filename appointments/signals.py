@@ -0,0 +1,81 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from clinics.models import Clinic
+from schedules.models import ClinicSchedule, AvailableHour
+from common.utils import _get_django_weekday
+from .models import Appointment
+from .services import (
+    invalidate_clinic_day_slots,
+    invalidate_next_available_slot,
+    schedule_appointment_reminders,
+)
+
+
+def _invalidate_schedule_slots(schedule: ClinicSchedule):
+    if schedule.special_date:
+        invalidate_clinic_day_slots(schedule.clinic_id, date=schedule.special_date)
+    elif schedule.day_name in ClinicSchedule.Day.values:
+        invalidate_clinic_day_slots(
+            schedule.clinic_id,
+            date__week_day=_get_django_weekday(schedule.day_name),
+            is_special=False,
+        )
+    invalidate_next_available_slot(schedule.clinic_id)
+
+
+@receiver(post_save, sender=ClinicSchedule)
+@receiver(post_delete, sender=ClinicSchedule)
+def clinic_schedule_changed(sender, instance, **kwargs):
+    _invalidate_schedule_slots(instance)
+
+
+@receiver(post_save, sender=AvailableHour)
+@receiver(post_delete, sender=AvailableHour)
+def available_hour_changed(sender, instance, **kwargs):
+    schedule = ClinicSchedule.objects.filter(pk=instance.schedule_id).first()
+    if schedule is not None:
+        _invalidate_schedule_slots(schedule)
+
+
+@receiver(pre_save, sender=Clinic)
+def remember_time_slot_per_patient(sender, instance, **kwargs):
+    instance._previous_time_slot_per_patient = (
+        Clinic.objects.filter(pk=instance.pk)
+        .values_list("time_slot_per_patient", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=Clinic)
+def clinic_time_slot_changed(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_previous_time_slot_per_patient", None)
+    if not created and previous != instance.time_slot_per_patient:
+        invalidate_clinic_day_slots(instance.pk)
+        invalidate_next_available_slot(instance.pk)
+
+
+@receiver(post_save, sender=Appointment)
+@receiver(post_delete, sender=Appointment)
+def appointment_changed(sender, instance, **kwargs):
+    invalidate_next_available_slot(instance.clinic_id)
+
+
+# Appointment fields the pending reminders depend on
+REMINDER_FIELDS = ("visit_date", "visit_time", "status")
+
+
+@receiver(pre_save, sender=Appointment)
+def remember_reminder_fields(sender, instance, **kwargs):
+    instance._previous_reminder_fields = (
+        Appointment.objects.filter(pk=instance.pk).values_list(*REMINDER_FIELDS).first()
+    )
+
+
+@receiver(post_save, sender=Appointment)
+def appointment_saved(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_previous_reminder_fields", None)
+    if created or previous != tuple(
+        getattr(instance, field) for field in REMINDER_FIELDS
+    ):
+        schedule_appointment_reminders(instance)
@@ -0,0 +1,105 @@
+"""
+Vectorized visit-time engine.
+
+A day is represented as an array of minute offsets from midnight, so slot
+grids of many clinics over many days are generated, filtered against
+bookings and cut at the current time with a handful of NumPy operations
+instead of nested Python loops over ``datetime`` objects.
+"""
+
+from datetime import time
+
+import numpy as np
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def to_minutes(value: time) -> int:
+    return value.hour * 60 + value.minute
+
+
+def to_time(minutes) -> time:
+    minutes = int(minutes)
+    return time(minutes // 60, minutes % 60)
+
+
+def split_minutes(starts, ends, time_slots):
+    """
+    Splits every [start, end) range into consecutive slots of the matching
+    length, keeping only slots that end before or at the end of their range.
+
+    Returns (range_index, minutes): for every generated slot, the position of
+    the range it belongs to and its start as a minute offset.
+    """
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+    time_slots = np.asarray(time_slots, dtype=np.int64)
+
+    counts = np.maximum((ends - starts) // time_slots, 0)
+    range_index = np.repeat(np.arange(len(starts)), counts)
+    first_slot = np.repeat(np.cumsum(counts) - counts, counts)
+    position = np.arange(counts.sum()) - first_slot
+    minutes = starts[range_index] + position * time_slots[range_index]
+    return range_index, minutes
+
+
+def split_visit_minutes(available_hours, time_slot) -> np.ndarray:
+    """
+    Converts available hours of a single day into visit-time minute offsets.
+    """
+    if not available_hours:
+        return np.empty(0, dtype=np.int64)
+    starts = [to_minutes(hour.start_hour) for hour in available_hours]
+    ends = [to_minutes(hour.end_hour) for hour in available_hours]
+    _, minutes = split_minutes(starts, ends, [time_slot] * len(starts))
+    return minutes
+
+
+def first_free_slots(ranges, booked, not_before=0):
+    """
+    Finds the earliest free slot of every clinic.
+
+    ``ranges`` holds (clinic_id, day_index, start_minute, end_minute,
+    time_slot) rows, ``booked`` holds (clinic_id, day_index, minute) rows and
+    ``not_before`` is an absolute minute (``day_index * MINUTES_PER_DAY +
+    minute``) before which slots are ignored, e.g. the current time of day 0.
+
+    Returns a dict mapping clinic ids to (day_index, minute); clinics without
+    a free slot are left out.
+    """
+    if not ranges:
+        return {}
+
+    clinic_ids, days, starts, ends, time_slots = (
+        np.asarray(column, dtype=np.int64) for column in zip(*ranges)
+    )
+    range_index, minutes = split_minutes(starts, ends, time_slots)
+    slot_clinics = clinic_ids[range_index]
+    slot_absolute = days[range_index] * MINUTES_PER_DAY + minutes
+
+    keep = slot_absolute >= not_before
+    if booked:
+        booked_clinics, booked_days, booked_minutes = (
+            np.asarray(column, dtype=np.int64) for column in zip(*booked)
+        )
+        keep &= ~np.isin(
+            _slot_keys(slot_clinics, slot_absolute),
+            _slot_keys(booked_clinics, booked_days * MINUTES_PER_DAY + booked_minutes),
+        )
+    slot_clinics = slot_clinics[keep]
+    slot_absolute = slot_absolute[keep]
+
+    order = np.lexsort((slot_absolute, slot_clinics))
+    slot_clinics = slot_clinics[order]
+    slot_absolute = slot_absolute[order]
+    found_clinics, first = np.unique(slot_clinics, return_index=True)
+
+    return {
+        int(clinic_id): divmod(int(absolute), MINUTES_PER_DAY)
+        for clinic_id, absolute in zip(found_clinics, slot_absolute[first])
+    }
+
+
+def _slot_keys(clinic_ids, absolute_minutes):
+    # Absolute minutes stay well below 2**32 for any realistic window.
+    return (clinic_ids << 32) | absolute_minutes
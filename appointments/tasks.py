@@ -1,11 +1,24 @@
 from celery import shared_task
-from django.utils.timezone import make_aware
-from datetime import datetime, timedelta
+from django.db import transaction
+from django.utils.timezone import now
 from django.utils.translation import gettext as _
 
-from users.tasks import send_sms
-from appointments.models import Appointment
-from appointments.models import Appointment
+from users.tasks import send_sms, send_bulk_sms
+from appointments.models import Appointment, Reminder
+
+REMINDER_BATCH_SIZE = 500
+
+
+def get_reminder_message(appointment):
+    return _(
+        "Reminder: You have an appointment at {doctor} clinic "
+        "on {date} at {time}. Please arrive on time."
+    ).format(
+        doctor=appointment.clinic.doctor.user.full_name,
+        date=appointment.visit_date,
+        time=appointment.visit_time,
+    )
+
 
 @shared_task
 def send_appointment_reminder(appointment_id):
@@ -14,15 +27,58 @@ def send_appointment_reminder(appointment_id):
         patient = appointment.patient
         if not patient or not patient.phone:
             return f"Appointment {appointment_id} has no patient or phone number"
-        message = _(
-              "Reminder: You have an appointment at {doctor} clinic "
-              "on {date} at {time}. Please arrive on time."
-          ).format(
-              doctor=appointment.clinic.doctor.user.full_name,
-              date=appointment.visit_date,
-              time=appointment.visit_time,
-          )
+        message = get_reminder_message(appointment)
         send_sms.delay(patient.phone, message)  # enqueue SMS sending
         return f"Reminder sent to {patient.phone} for appointment {appointment_id}"
     except Appointment.DoesNotExist:
         return f"Appointment {appointment_id} not found"
+
+
+@shared_task
+def send_due_reminders():
+    """
+    Claims due reminders in batches and sends them, one bulk SMS per
+    distinct message. Claimed rows are locked with SKIP LOCKED, so several
+    workers can drain the table concurrently, and deleted once enqueued.
+    """
+    sent = 0
+    while True:
+        with transaction.atomic():
+            reminders = list(
+                Reminder.objects.select_for_update(skip_locked=True, of=("self",))
+                .filter(remind_at__lte=now())
+                .select_related(
+                    "appointment__patient", "appointment__clinic__doctor__user"
+                )
+                .order_by("remind_at")[:REMINDER_BATCH_SIZE]
+            )
+            if not reminders:
+                break
+
+            # Several due reminders of the same appointment are sent once
+            appointments = {
+                reminder.appointment_id: reminder.appointment for reminder in reminders
+            }
+            phones_by_message = {}
+            for appointment in appointments.values():
+                patient = appointment.patient
+                if (
+                    appointment.status != Appointment.Status.WAITING
+                    or not patient
+                    or not patient.phone
+                ):
+                    continue
+                phones_by_message.setdefault(
+                    get_reminder_message(appointment), []
+                ).append(patient.phone)
+
+            Reminder.objects.filter(
+                id__in=[reminder.id for reminder in reminders]
+            ).delete()
+            for message, phones in phones_by_message.items():
+                transaction.on_commit(
+                    lambda p=phones, m=message: send_bulk_sms.delay(p, m)
+                )
+                sent += len(phones)
+
+    return f"{sent} reminders sent"
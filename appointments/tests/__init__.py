@@ -2,4 +2,9 @@ from .test_list_clinic_visit_times import *
 from .test_book_appointment import *
 from .test_cancel_appointment import *
 from .test_update_appointment import *
-from .test_change_appointment_status import *
\ No newline at end of file
+from .test_change_appointment_status import *
+from .test_clinic_day_slots import *
+from .test_slots import *
+from .test_next_available_slot_cache import *
+from .test_reminders import *
+from .test_cancellation_notifications import *
\ No newline at end of file
@@ -0,0 +1,60 @@
+from datetime import datetime, time, timedelta
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from appointments.models import Appointment
+from appointments.services import cancel_appointments_with_notification
+
+from .test_appointments_base import AppointmentBaseTest
+
+
+@override_settings(TESTING=False, SMS_BATCH_SIZE=10)
+class CancellationNotificationTests(AppointmentBaseTest):
+    def create_appointments(self, count):
+        start = datetime.combine(timezone.now().date() + timedelta(days=30), time(8, 0))
+        Appointment.objects.bulk_create(
+            [
+                Appointment(
+                    patient=self.patient_user,
+                    clinic=self.clinic,
+                    visit_date=(start + timedelta(minutes=i)).date(),
+                    visit_time=(start + timedelta(minutes=i)).time(),
+                    status=Appointment.Status.WAITING,
+                )
+                for i in range(count)
+            ]
+        )
+        return Appointment.objects.filter(
+            clinic=self.clinic, status=Appointment.Status.WAITING
+        )
+
+    @patch("users.tasks.send_sms_batch.delay")
+    def test_notifications_are_enqueued_in_batches(self, send_sms_batch):
+        appointments = self.create_appointments(25)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            cancel_appointments_with_notification(appointments, self.assistantUser)
+
+        self.assertEqual(send_sms_batch.call_count, 3)
+        self.assertEqual(
+            sum(len(call.args[0]) for call in send_sms_batch.call_args_list), 25
+        )
+        self.assertFalse(
+            Appointment.objects.filter(status=Appointment.Status.WAITING).exists()
+        )
+
+    @patch("users.tasks.send_sms_batch.delay")
+    def test_query_count_does_not_grow_with_appointments(self, send_sms_batch):
+        def count_queries(appointments):
+            with CaptureQueriesContext(connection) as context:
+                cancel_appointments_with_notification(appointments, self.assistantUser)
+            return len(context.captured_queries)
+
+        few = count_queries(list(self.create_appointments(2)))
+        many = count_queries(list(self.create_appointments(20)))
+
+        self.assertEqual(few, many)
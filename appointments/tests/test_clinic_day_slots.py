@@ -0,0 +1,97 @@
+from rest_framework import status
+from django.urls import reverse
+from datetime import timedelta, time
+from django.utils import timezone
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from appointments.models import ClinicDaySlots
+from schedules.models import AvailableHour, ClinicSchedule
+
+from .test_appointments_base import AppointmentBaseTest
+
+
+class ClinicDaySlotsTests(AppointmentBaseTest):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse(
+            "list-clinic-visit-times", kwargs={"clinic_id": self.clinic.pk}
+        )
+        self.next_sunday = timezone.now().date() + timedelta(
+            days=(15 - (timezone.now().weekday() + 2) % 7 or 7)
+        )
+
+    def test_visit_times_are_indexed_on_first_read(self):
+        self.assertFalse(
+            ClinicDaySlots.objects.filter(
+                clinic=self.clinic, date=self.next_sunday
+            ).exists()
+        )
+
+        response = self.client.get(f"{self.url}?visitDate={self.next_sunday}")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        day_slots = ClinicDaySlots.objects.get(
+            clinic=self.clinic, date=self.next_sunday
+        )
+        self.assertFalse(day_slots.is_special)
+        self.assertEqual(len(day_slots.visit_times), len(response.data))
+
+    def test_available_hours_change_rebuilds_index(self):
+        self.client.get(f"{self.url}?visitDate={self.next_sunday}")
+
+        AvailableHour.objects.create(
+            schedule=self.weekday_schedule, start_hour=time(20, 0), end_hour=time(21, 0)
+        )
+        response = self.client.get(f"{self.url}?visitDate={self.next_sunday}")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("20:45", str(response.data))
+
+    def test_special_sunday_index_is_kept_on_weekday_change(self):
+        special_sunday = self.next_sunday + timedelta(days=7)
+        schedule = ClinicSchedule.objects.create(
+            clinic=self.clinic, special_date=special_sunday, is_available=True
+        )
+        AvailableHour.objects.create(
+            schedule=schedule, start_hour=time(10, 0), end_hour=time(11, 0)
+        )
+        self.client.get(f"{self.url}?visitDate={special_sunday}")
+
+        AvailableHour.objects.create(
+            schedule=self.weekday_schedule, start_hour=time(20, 0), end_hour=time(21, 0)
+        )
+
+        day_slots = ClinicDaySlots.objects.get(clinic=self.clinic, date=special_sunday)
+        self.assertTrue(day_slots.is_special)
+
+    def test_time_slot_change_rebuilds_index(self):
+        self.client.get(f"{self.url}?visitDate={self.next_sunday}")
+
+        self.clinic.time_slot_per_patient = 30
+        self.clinic.save()
+        response = self.client.get(f"{self.url}?visitDate={self.next_sunday}")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("08:15", str(response.data))
+        self.assertIn("08:30", str(response.data))
+
+    def test_multiple_days_query_count_does_not_grow_with_range(self):
+        url = reverse(
+            "list-clinic-dates-with-visit-times", kwargs={"clinic_id": self.clinic.pk}
+        )
+
+        def count_queries(start_date, end_date):
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(
+                    f"{url}?start-date={start_date}&end-date={end_date}"
+                )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return len(context.captured_queries)
+
+        week = count_queries(self.next_sunday, self.next_sunday + timedelta(days=6))
+        month = count_queries(
+            self.next_sunday + timedelta(days=7), self.next_sunday + timedelta(days=34)
+        )
+
+        self.assertEqual(week, month)
@@ -0,0 +1,64 @@
+from datetime import time, timedelta
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from appointments.models import Appointment
+from appointments.services import (
+    _next_available_slot_cache_key,
+    get_cached_next_available_slots_for_clinics,
+)
+from schedules.models import AvailableHour
+
+from .test_appointments_base import AppointmentBaseTest
+
+
+class NextAvailableSlotCacheTests(AppointmentBaseTest):
+    def setUp(self):
+        super().setUp()
+        self.key = _next_available_slot_cache_key(self.clinic.pk)
+        cache.delete(self.key)
+        self.addCleanup(cache.delete, self.key)
+
+    def test_slot_is_cached_on_first_read(self):
+        slots = get_cached_next_available_slots_for_clinics([self.clinic.pk])
+
+        self.assertEqual(cache.get(self.key), slots[self.clinic.pk])
+
+    def test_booking_the_cached_slot_invalidates_it(self):
+        visit_date, visit_time = get_cached_next_available_slots_for_clinics(
+            [self.clinic.pk]
+        )[self.clinic.pk]
+
+        Appointment.objects.create(
+            patient=self.patient_user,
+            clinic=self.clinic,
+            visit_date=visit_date,
+            visit_time=visit_time,
+            status=Appointment.Status.WAITING,
+        )
+
+        self.assertIsNone(cache.get(self.key))
+        slot = get_cached_next_available_slots_for_clinics([self.clinic.pk])[
+            self.clinic.pk
+        ]
+        self.assertNotEqual(slot, (visit_date, visit_time))
+
+    def test_schedule_change_invalidates_cached_slot(self):
+        get_cached_next_available_slots_for_clinics([self.clinic.pk])
+
+        AvailableHour.objects.create(
+            schedule=self.weekday_schedule, start_hour=time(20, 0), end_hour=time(21, 0)
+        )
+
+        self.assertIsNone(cache.get(self.key))
+
+    def test_past_cached_slot_is_recomputed(self):
+        yesterday = timezone.now().date() - timedelta(days=1)
+        cache.set(self.key, (yesterday, time(8, 0)))
+
+        visit_date, _ = get_cached_next_available_slots_for_clinics([self.clinic.pk])[
+            self.clinic.pk
+        ]
+
+        self.assertNotEqual(visit_date, yesterday)
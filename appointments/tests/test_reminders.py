@@ -0,0 +1,104 @@
+from datetime import timedelta, time
+from unittest.mock import patch
+
+from django.db.models import F
+from django.urls import reverse
+from django.utils import timezone
+
+from appointments.models import Appointment, Reminder
+from appointments.tasks import send_due_reminders
+
+from .test_appointments_base import AppointmentBaseTest
+
+
+class ReminderTests(AppointmentBaseTest):
+    def setUp(self):
+        super().setUp()
+        self.next_sunday = timezone.now().date() + timedelta(
+            days=(15 - (timezone.now().weekday() + 2) % 7 or 7)
+        )
+
+    def test_booking_schedules_reminders(self):
+        self.client.force_authenticate(self.patient_user)
+        url = reverse("book-appointment", kwargs={"clinic_id": self.clinic.pk})
+
+        response = self.client.post(
+            url, {"visit_date": str(self.next_sunday), "visit_time": "08:30"}
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            Reminder.objects.filter(appointment_id=response.data["id"]).count(), 3
+        )
+
+    def test_cancellation_removes_pending_reminders(self):
+        appointment = Appointment.objects.create(
+            patient=self.patient_user,
+            clinic=self.clinic,
+            visit_date=self.next_sunday,
+            visit_time=time(8, 30),
+            status=Appointment.Status.WAITING,
+        )
+
+        appointment.status = Appointment.Status.CANCELLED
+        appointment.save()
+
+        self.assertFalse(Reminder.objects.filter(appointment=appointment).exists())
+
+    def test_reminders_follow_the_visit_time_only(self):
+        appointment = Appointment.objects.create(
+            patient=self.patient_user,
+            clinic=self.clinic,
+            visit_date=self.next_sunday,
+            visit_time=time(8, 30),
+            status=Appointment.Status.WAITING,
+        )
+        reminder_ids = set(
+            Reminder.objects.filter(appointment=appointment).values_list(
+                "pk", flat=True
+            )
+        )
+
+        appointment.notes = "Bring the previous tests"
+        appointment.save()
+        self.assertEqual(
+            set(
+                Reminder.objects.filter(appointment=appointment).values_list(
+                    "pk", flat=True
+                )
+            ),
+            reminder_ids,
+        )
+
+        appointment.visit_time = time(9, 0)
+        appointment.save()
+        self.assertTrue(
+            reminder_ids.isdisjoint(
+                Reminder.objects.filter(appointment=appointment).values_list(
+                    "pk", flat=True
+                )
+            )
+        )
+        self.assertEqual(Reminder.objects.filter(appointment=appointment).count(), 3)
+
+    @patch("appointments.tasks.send_bulk_sms.delay")
+    def test_due_reminders_are_sent_once(self, send_bulk_sms):
+        appointment = Appointment.objects.create(
+            patient=self.patient_user,
+            clinic=self.clinic,
+            visit_date=self.next_sunday,
+            visit_time=time(8, 30),
+            status=Appointment.Status.WAITING,
+        )
+        Reminder.objects.filter(appointment=appointment).update(
+            remind_at=F("remind_at") - timedelta(days=30)
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            send_due_reminders()
+        with self.captureOnCommitCallbacks(execute=True):
+            send_due_reminders()
+
+        self.assertEqual(send_bulk_sms.call_count, 1)
+        self.assertEqual(send_bulk_sms.call_args.args[0], [self.patient_user.phone])
+        self.assertFalse(Reminder.objects.filter(appointment=appointment).exists())
@@ -0,0 +1,74 @@
+from datetime import datetime, time, timedelta
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+from appointments.models import Appointment
+from appointments.services import get_next_available_slot
+from appointments.slots import first_free_slots, split_visit_minutes, to_time
+from schedules.models import AvailableHour, ClinicSchedule
+
+from .test_appointments_base import AppointmentBaseTest
+
+
+class SlotEngineTests(SimpleTestCase):
+    def test_split_visit_minutes_drops_partial_slots(self):
+        hours = [
+            AvailableHour(start_hour=time(8, 0), end_hour=time(9, 10)),
+            AvailableHour(start_hour=time(14, 0), end_hour=time(14, 20)),
+        ]
+
+        visit_times = [to_time(m) for m in split_visit_minutes(hours, 15)]
+
+        self.assertEqual(
+            visit_times,
+            [time(8, 0), time(8, 15), time(8, 30), time(8, 45), time(14, 0)],
+        )
+
+    def test_first_free_slots_skips_booked_and_past_slots(self):
+        ranges = [
+            (1, 0, 480, 540, 15),
+            (2, 0, 480, 500, 15),
+            (2, 1, 600, 660, 30),
+            (3, 0, 100, 110, 15),
+        ]
+        booked = [(1, 0, 480), (2, 0, 480)]
+
+        result = first_free_slots(ranges, booked, not_before=485)
+
+        self.assertEqual(result, {1: (0, 495), 2: (1, 600)})
+
+
+class NextAvailableSlotTests(AppointmentBaseTest):
+    def setUp(self):
+        super().setUp()
+        today = timezone.now().date()
+        self.next_sunday = today + timedelta(
+            days=(15 - (timezone.now().weekday() + 2) % 7 or 7)
+        )
+        self.start = timezone.make_aware(
+            datetime.combine(self.next_sunday, time(8, 20))
+        )
+
+    def test_first_free_slot_after_now_is_returned(self):
+        Appointment.objects.create(
+            patient=self.patient_user,
+            clinic=self.clinic,
+            visit_date=self.next_sunday,
+            visit_time=time(8, 30),
+            status=Appointment.Status.WAITING,
+        )
+
+        visit_date, visit_time = get_next_available_slot(self.clinic, self.start)
+
+        self.assertEqual(visit_date, self.next_sunday)
+        self.assertEqual(visit_time, time(8, 45))
+
+    def test_unavailable_special_date_overrides_weekday(self):
+        ClinicSchedule.objects.create(
+            clinic=self.clinic, special_date=self.next_sunday, is_available=False
+        )
+
+        visit_date, _ = get_next_available_slot(self.clinic, self.start)
+
+        self.assertNotEqual(visit_date, self.next_sunday)
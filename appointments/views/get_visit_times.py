@@ -9,8 +9,7 @@ from rest_framework import status, permissions
 
 from appointments.models import Appointment
 from clinics.models import Clinic
-from schedules.models import AvailableHour, ClinicSchedule
-from appointments.services import get_split_visit_times
+from appointments.services import ClinicDayResolver, get_clinic_day_slots
 
 from drf_spectacular.utils import extend_schema, OpenApiExample, extend_schema_view, inline_serializer
 
@@ -81,46 +80,32 @@ class ClinicVisitTimesForMultipleDaysView(APIView):
         clinic = get_object_or_404(Clinic, doctor=clinic_id)
         start_date_str = request.query_params.get("start-date")
         end_date_str = request.query_params.get("end-date")
-        
+
         if not start_date_str or not end_date_str:
             return Response({"detail": "start_date and end_date are required."}, status=400)
 
         start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
         end_date = datetime.strptime(end_date_str, "%Y-%m-%d").date()
-        
-        visit_date = start_date
-        data = []
-        
-        while visit_date <= end_date:
-            try:
-                schedule = ClinicSchedule.objects.get(clinic=clinic, special_date=visit_date)
-            except ClinicSchedule.DoesNotExist:
-                weekday = visit_date.strftime('%A').lower() 
-                schedule = ClinicSchedule.objects.get(clinic=clinic, day_name=weekday)
-
-            available_hours = AvailableHour.objects.filter(schedule=schedule).order_by("start_hour")
 
-            time_slot = clinic.time_slot_per_patient
-            start_times = get_split_visit_times(available_hours, time_slot)
+        resolver = ClinicDayResolver([clinic], start_date, end_date)
 
+        data = []
+        for day_slots in get_clinic_day_slots(clinic, start_date, end_date):
             # Check which are booked
-            booked_times = Appointment.objects.filter(
-                clinic=clinic,
-                visit_date=visit_date,
-                status=Appointment.Status.WAITING
-            ).values_list('visit_time', flat=True)
-
+            booked_times = resolver.booked_times(
+                clinic.pk, day_slots.date, status=Appointment.Status.WAITING
+            )
             day = {}
-            day["visit_date"] =  str(visit_date)
-            day["visit_times"] = [{"visit_time": str(t), "is_booked": t in booked_times} for t in start_times] 
+            day["visit_date"] = str(day_slots.date)
+            day["visit_times"] = [
+                {"visit_time": str(t), "is_booked": t in booked_times}
+                for t in day_slots.visit_times
+            ]
             data.append(day)
 
-            visit_date += timedelta(days=1)
-
         return Response(data, status=200)
 
 
-
 @extend_schema(
     summary="List Clinic Visit Times",
     description="list all visit time of a clinic for specific date and wheather they are booked or not",
@@ -185,25 +170,14 @@ class ClinicVisitTimesView(APIView):
 
         clinic = get_object_or_404(Clinic, doctor=clinic_id)
 
-        try:
-            schedule = ClinicSchedule.objects.get(clinic=clinic, special_date=visit_date)
-        except ClinicSchedule.DoesNotExist:
-            weekday = visit_date.strftime('%A').lower() 
-            schedule = ClinicSchedule.objects.get(clinic=clinic, day_name=weekday)
-
-        available_hours = AvailableHour.objects.filter(schedule=schedule).order_by("start_hour")
-        if not available_hours.exists():
+        start_times = get_clinic_day_slots(clinic, visit_date)[0].visit_times
+        if not start_times:
             return Response([], status=200)
 
-        time_slot = clinic.time_slot_per_patient
-        start_times = get_split_visit_times(available_hours, time_slot)
-
         # Check which are booked
-        booked_times = Appointment.objects.filter(
-            clinic=clinic,
-            visit_date=visit_date,
-            status=Appointment.Status.WAITING
-        ).values_list('visit_time', flat=True)
+        booked_times = ClinicDayResolver([clinic], visit_date, visit_date).booked_times(
+            clinic.pk, visit_date, status=Appointment.Status.WAITING
+        )
 
         response_data = [
             {"visit_time": str(t), "is_booked": t in booked_times}
@@ -8,7 +8,7 @@ from rest_framework.response import Response
 
 from drf_spectacular.utils import extend_schema, OpenApiExample, extend_schema_view
 from django.utils.timezone import datetime, timedelta
-from appointments.services import get_split_visit_times
+from appointments.services import get_clinic_day_slots
 
 
 from doctors.permissions import IsDoctorWithClinic
@@ -17,7 +17,6 @@ from users.models import CustomUser as User
 from clinics.models import Clinic
 from doctors.models import Doctor
 from assistants.models import Assistant
-from schedules.models import AvailableHour, ClinicSchedule
 from appointments.serializers import DateDetailsSerializer, AppointmentDetailSerializer
 from appointments.models import Appointment
 from rest_framework.exceptions import PermissionDenied
@@ -118,50 +117,42 @@ from rest_framework.exceptions import PermissionDenied
 )
 class MyClinicAppointmentsView(APIView):
     permission_classes = [IsAuthenticated & (IsDoctorWithClinic | IsAssistantWithClinic)]
-    
+
     def get(self, request):
         start_date_str = request.query_params.get("start-date")
         end_date_str = request.query_params.get("end-date")
-        
+
         if not start_date_str or not end_date_str:
             return Response({"detail": "start_date and end_date are required."}, status=400)
 
         start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
         end_date = datetime.strptime(end_date_str, "%Y-%m-%d").date()
         user = request.user
-        
+
         if user.role == User.Role.DOCTOR:
             clinic = getattr(user.doctor, "clinic", None)
         else:
             clinic = getattr(user.assistant, "clinic", None)
-            
+
         appointments = Appointment.objects.filter(
             clinic=clinic,
             visit_date__range=(start_date, end_date)
         ).select_related('patient')
-        
+
         appointment_lookup = {
             (a.visit_date, a.visit_time): a for a in appointments
         }
-        
+
         output = []
-        current_date = start_date
-        while current_date <= end_date:
-            is_special_date = False
-            try:
-                schedule = ClinicSchedule.objects.get(clinic=clinic, special_date=current_date)
-                is_special_date = True
-            except ClinicSchedule.DoesNotExist:
-                weekday = current_date.strftime('%A').lower()
-                schedule = ClinicSchedule.objects.get(clinic=clinic, day_name=weekday)
-                
-            day_data = {"date": current_date, "is_special": is_special_date, "visit_times": []}
-            
-            available_hours = AvailableHour.objects.filter(schedule=schedule).order_by("start_hour")
-            start_times = get_split_visit_times(available_hours, clinic.time_slot_per_patient)
-            
-            for time_slot in start_times:
-                appointment = appointment_lookup.get((current_date, time_slot))
+        for day_slots in get_clinic_day_slots(clinic, start_date, end_date):
+            day_data = {
+                "date": day_slots.date,
+                "is_special": day_slots.is_special,
+                "visit_times": [],
+            }
+
+            for time_slot in day_slots.visit_times:
+                appointment = appointment_lookup.get((day_slots.date, time_slot))
 
                 visit_time_data = {
                     "visit_time": time_slot,
@@ -169,10 +160,9 @@ class MyClinicAppointmentsView(APIView):
                     "appointment": appointment if appointment else None
                 }
                 day_data["visit_times"].append(visit_time_data)
-            
+
             output.append(day_data)
-            current_date += timedelta(days=1)
-        
+
         serializer = DateDetailsSerializer(output, many=True)
         return Response(serializer.data)
 
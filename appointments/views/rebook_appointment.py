@@ -10,8 +10,7 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from appointments.models import Appointment
-from schedules.models import ClinicSchedule, AvailableHour
-from appointments.services import get_split_visit_times
+from appointments.services import get_clinic_day_slots
 
 from users.permissions import HasRole
 from users.models import CustomUser as User
@@ -55,7 +54,7 @@ class RebookAppointmentView(APIView):
         if appointment_datetime < now():
             return Response({"detail": _("Cannot rebook this appointment because its time is passed")},
                             status=status.HTTP_400_BAD_REQUEST)
-            
+
         if Appointment.objects.filter(
             clinic=appointment.clinic,
             visit_date=appointment.visit_date,
@@ -64,15 +63,9 @@ class RebookAppointmentView(APIView):
         ).exists():
             return Response({"detail": _("You can not rebook this appointment because its booked by another patient")},
                             status=status.HTTP_400_BAD_REQUEST)
-        
-        try:
-            schedule = ClinicSchedule.objects.get(clinic=appointment.clinic, special_date=appointment.visit_date)
-        except ClinicSchedule.DoesNotExist:
-            weekday = appointment.visit_date.strftime('%A').lower()
-            schedule = ClinicSchedule.objects.get(clinic=appointment.clinic, day_name=weekday)
-           
-        available_hours = AvailableHour.objects.filter(schedule=schedule)
-        start_times = get_split_visit_times(available_hours, appointment.clinic.time_slot_per_patient)
+
+        day_slots = get_clinic_day_slots(appointment.clinic, appointment.visit_date)[0]
+        start_times = day_slots.visit_times
 
         if appointment.visit_time not in start_times:   
             return Response({"detail": _("You can not rebook this appointment because its time slot is not available anymore")},
@@ -6,3 +6,6 @@ class ClinicStatisticsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "clinic_statistics"
     verbose_name = _("Clinic Statistics")
+
+    def ready(self):
+        import clinic_statistics.signals
@@ -0,0 +1,87 @@
+# Generated by Django 5.2.1 on 2025-09-04 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_clinic_daily_stats(apps, schema_editor):
+    Appointment = apps.get_model("appointments", "Appointment")
+    ClinicDailyStats = apps.get_model("clinic_statistics", "ClinicDailyStats")
+
+    rows = (
+        Appointment.objects.exclude(status="cancelled")
+        .values("clinic_id", "visit_date")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    ClinicDailyStats.objects.bulk_create(
+        [
+            ClinicDailyStats(
+                clinic_id=row["clinic_id"],
+                date=row["visit_date"],
+                num_of_appointments=row["count"],
+            )
+            for row in rows.iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("appointments", "0004_reminder"),
+        ("clinics", "0003_trigram_ext"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ClinicDailyStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(verbose_name="Date")),
+                (
+                    "num_of_appointments",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Non-cancelled appointments with this visit date",
+                        verbose_name="Number Of Appointments",
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Updated At"),
+                ),
+                (
+                    "clinic",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_stats",
+                        to="clinics.clinic",
+                        verbose_name="Clinic",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Clinic Daily Stats",
+                "verbose_name_plural": "Clinic Daily Stats",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("clinic", "date"), name="unique_clinic_daily_stats"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_clinic_daily_stats, migrations.RunPython.noop),
+    ]
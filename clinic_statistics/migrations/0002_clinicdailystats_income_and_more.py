@@ -0,0 +1,218 @@
+# Generated by Django 5.2.1 on 2025-09-05 12:00
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+STATUS_FIELDS = {
+    "waiting": "num_of_waiting",
+    "in_consultation": "num_of_in_consultation",
+    "completed": "num_of_completed",
+    "absent": "num_of_absent",
+    "cancelled": "num_of_cancelled",
+}
+
+STAR_FIELDS = {
+    1: "num_of_one_stars",
+    2: "num_of_two_stars",
+    3: "num_of_three_stars",
+    4: "num_of_four_stars",
+    5: "num_of_five_stars",
+}
+
+
+def backfill_clinic_daily_stats(apps, schema_editor):
+    Appointment = apps.get_model("appointments", "Appointment")
+    Evaluation = apps.get_model("evaluations", "Evaluation")
+    Financial = apps.get_model("financials", "Financial")
+    Payment = apps.get_model("financials", "Payment")
+    ClinicDailyStats = apps.get_model("clinic_statistics", "ClinicDailyStats")
+
+    stats = {}
+
+    def day(clinic_id, date):
+        return stats.setdefault((clinic_id, date), {"visit_times": {}})
+
+    rows = (
+        Appointment.objects.values("clinic_id", "visit_date", "status", "visit_time")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    for row in rows.iterator():
+        values = day(row["clinic_id"], row["visit_date"])
+        field = STATUS_FIELDS[row["status"]]
+        values[field] = values.get(field, 0) + row["count"]
+        if row["status"] != "cancelled":
+            visit_time = row["visit_time"].isoformat()
+            values["visit_times"][visit_time] = (
+                values["visit_times"].get(visit_time, 0) + row["count"]
+            )
+
+    rows = (
+        Payment.objects.annotate(day=TruncDate("created_at"))
+        .values("clinic_id", "day")
+        .annotate(income=Sum("cost"))
+        .order_by()
+    )
+    for row in rows.iterator():
+        day(row["clinic_id"], row["day"])["income"] = row["income"] or 0.0
+
+    rows = (
+        Evaluation.objects.annotate(day=TruncDate("updated_at"))
+        .values("appointment__clinic_id", "day", "rate")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    for row in rows.iterator():
+        if row["rate"] in STAR_FIELDS:
+            day(row["appointment__clinic_id"], row["day"])[STAR_FIELDS[row["rate"]]] = (
+                row["count"]
+            )
+
+    rows = (
+        Financial.objects.annotate(day=TruncDate("created_at"))
+        .values("clinic_id", "day")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    for row in rows.iterator():
+        day(row["clinic_id"], row["day"])["num_of_new_patients"] = row["count"]
+
+    fields = [
+        "visit_times",
+        "income",
+        "num_of_new_patients",
+        *STATUS_FIELDS.values(),
+        *STAR_FIELDS.values(),
+    ]
+    ClinicDailyStats.objects.bulk_create(
+        [
+            ClinicDailyStats(clinic_id=clinic_id, date=date, **values)
+            for (clinic_id, date), values in stats.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["clinic", "date"],
+        update_fields=fields,
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clinic_statistics", "0001_initial"),
+        ("evaluations", "0002_initial"),
+        ("financials", "0004_payment"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="clinicdailystats",
+            name="income",
+            field=models.FloatField(
+                default=0.0,
+                help_text="Sum of payments created this day",
+                verbose_name="Income",
+            ),
+        ),
+        migrations.AddField(
+            model_name="clinicdailystats",
+            name="num_of_absent",
+            field=models.PositiveIntegerField(
+                default=0,
+                verbose_name="Number Of Absent",
+            ),
+        ),
+        migrations.AddField(
+            model_name="clinicdailystats",
+            name="num_of_cancelled",
+            field=models.PositiveIntegerField(
+                default=0,
+                verbose_name="Number Of Cancelled",
+            ),
+        ),
+        migrations.AddField(
+            model_name="clinicdailystats",
+            name="num_of_completed",
+            field=models.PositiveIntegerField(
+                default=0,
+                verbose_name="Number Of Completed",
+            ),
+        ),
+        migrations.AddField(
+            model_name="clinicdailystats",
+            name="num_of_five_stars",
+            field=models.PositiveIntegerField(
+                default=0,
+                verbose_name="Number Of Five Stars",
+            ),
+        ),
+        migrations.AddField(
+            model_name="clinicdailystats",
+            name="num_of_four_stars",
+            field=models.PositiveIntegerField(
+                default=0,
+                verbose_name="Number Of Four Stars",
+            ),
+        ),
+        migrations.AddField(
+            model_name="clinicdailystats",
+            name="num_of_in_consultation",
+            field=models.PositiveIntegerField(
+                default=0,
+                verbose_name="Number Of In Consultation",
+            ),
+        ),
+        migrations.AddField(
+            model_name="clinicdailystats",
+            name="num_of_new_patients",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="Patients whose financial record was created this day",
+                verbose_name="Number Of New Patients",
+            ),
+        ),
+        migrations.AddField(
+            model_name="clinicdailystats",
+            name="num_of_one_stars",
+            field=models.PositiveIntegerField(
+                default=0,
+                verbose_name="Number Of One Stars",
+            ),
+        ),
+        migrations.AddField(
+            model_name="clinicdailystats",
+            name="num_of_three_stars",
+            field=models.PositiveIntegerField(
+                default=0,
+                verbose_name="Number Of Three Stars",
+            ),
+        ),
+        migrations.AddField(
+            model_name="clinicdailystats",
+            name="num_of_two_stars",
+            field=models.PositiveIntegerField(
+                default=0,
+                verbose_name="Number Of Two Stars",
+            ),
+        ),
+        migrations.AddField(
+            model_name="clinicdailystats",
+            name="num_of_waiting",
+            field=models.PositiveIntegerField(
+                default=0,
+                verbose_name="Number Of Waiting",
+            ),
+        ),
+        migrations.AddField(
+            model_name="clinicdailystats",
+            name="visit_times",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text="Number of non-cancelled appointments per visit time",
+                verbose_name="Visit Times",
+            ),
+        ),
+        migrations.RunPython(backfill_clinic_daily_stats, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,86 @@
 from django.db import models
+from django.utils.translation import gettext_lazy as _
 
-# Create your models here.
+from clinics.models import Clinic
+
+
+class ClinicDailyStats(models.Model):
+    """
+    Per-clinic, per-day rollup of dashboard statistics, kept up to date by
+    signals and reconciled nightly, so dashboard ranges cost one row per day.
+
+    Appointment counts are keyed by visit date, income and new patients by
+    creation date and stars by the evaluation's last update date.
+    """
+
+    clinic = models.ForeignKey(
+        Clinic,
+        on_delete=models.CASCADE,
+        related_name="daily_stats",
+        verbose_name=_("Clinic"),
+    )
+    date = models.DateField(verbose_name=_("Date"))
+    num_of_appointments = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Number Of Appointments"),
+        help_text=_("Non-cancelled appointments with this visit date"),
+    )
+    num_of_waiting = models.PositiveIntegerField(
+        default=0, verbose_name=_("Number Of Waiting")
+    )
+    num_of_in_consultation = models.PositiveIntegerField(
+        default=0, verbose_name=_("Number Of In Consultation")
+    )
+    num_of_completed = models.PositiveIntegerField(
+        default=0, verbose_name=_("Number Of Completed")
+    )
+    num_of_absent = models.PositiveIntegerField(
+        default=0, verbose_name=_("Number Of Absent")
+    )
+    num_of_cancelled = models.PositiveIntegerField(
+        default=0, verbose_name=_("Number Of Cancelled")
+    )
+    visit_times = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name=_("Visit Times"),
+        help_text=_("Number of non-cancelled appointments per visit time"),
+    )
+    income = models.FloatField(
+        default=0.0,
+        verbose_name=_("Income"),
+        help_text=_("Sum of payments created this day"),
+    )
+    num_of_one_stars = models.PositiveIntegerField(
+        default=0, verbose_name=_("Number Of One Stars")
+    )
+    num_of_two_stars = models.PositiveIntegerField(
+        default=0, verbose_name=_("Number Of Two Stars")
+    )
+    num_of_three_stars = models.PositiveIntegerField(
+        default=0, verbose_name=_("Number Of Three Stars")
+    )
+    num_of_four_stars = models.PositiveIntegerField(
+        default=0, verbose_name=_("Number Of Four Stars")
+    )
+    num_of_five_stars = models.PositiveIntegerField(
+        default=0, verbose_name=_("Number Of Five Stars")
+    )
+    num_of_new_patients = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Number Of New Patients"),
+        help_text=_("Patients whose financial record was created this day"),
+    )
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Updated At"))
+
+    class Meta:
+        verbose_name = _("Clinic Daily Stats")
+        verbose_name_plural = _("Clinic Daily Stats")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["clinic", "date"], name="unique_clinic_daily_stats"
+            )
+        ]
+
+    def __str__(self):
+        return f"Stats of {self.clinic} on {self.date}"
@@ -7,13 +7,15 @@ class NumOfStarsSerializer(serializers.Serializer):
     num_of_three_stars = serializers.IntegerField()
     num_of_four_stars = serializers.IntegerField()
     num_of_five_stars = serializers.IntegerField()
-    
+    num_of_rates = serializers.IntegerField()
+    average_rate = serializers.FloatField(allow_null=True)
+
 
 class IncomesDetailSerializer(serializers.Serializer):
     date = serializers.DateField()
     income_value = serializers.FloatField()
-    
-    
+
+
 class PatientAgesRanges(serializers.Serializer):
     baby = serializers.IntegerField()
     child = serializers.IntegerField()
@@ -21,12 +23,12 @@ class PatientAgesRanges(serializers.Serializer):
     young_adult = serializers.IntegerField()
     adult = serializers.IntegerField()
     elderly = serializers.IntegerField()
-    
-    
+
+
 class StatisticsSerializer(serializers.Serializer):
     age_groups = PatientAgesRanges()
     
     most_common_visit_time_this_month = serializers.TimeField()
     num_of_new_patients_this_month = serializers.IntegerField()
     num_of_indebted_patients = serializers.IntegerField()
-    total_dept = serializers.FloatField()
\ No newline at end of file
+    total_dept = serializers.FloatField()
@@ -0,0 +1,285 @@
+from collections import Counter
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db.models import Avg, Count, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils.timezone import localdate, make_aware
+
+from appointments.models import Appointment
+from evaluations.models import Evaluation
+from financials.models import Financial, Payment
+from .models import ClinicDailyStats
+
+STATUS_FIELDS = {
+    Appointment.Status.WAITING: "num_of_waiting",
+    Appointment.Status.IN_CONSULTATION: "num_of_in_consultation",
+    Appointment.Status.COMPLETED: "num_of_completed",
+    Appointment.Status.ABSENT: "num_of_absent",
+    Appointment.Status.CANCELLED: "num_of_cancelled",
+}
+
+STAR_FIELDS = {
+    1: "num_of_one_stars",
+    2: "num_of_two_stars",
+    3: "num_of_three_stars",
+    4: "num_of_four_stars",
+    5: "num_of_five_stars",
+}
+
+# Rollup fields maintained together, each from its own source table
+SECTIONS = {
+    "appointments": ["num_of_appointments", *STATUS_FIELDS.values(), "visit_times"],
+    "income": ["income"],
+    "stars": list(STAR_FIELDS.values()),
+    "new_patients": ["num_of_new_patients"],
+}
+
+
+def _empty_stats(sections):
+    stats = {}
+    for section in sections:
+        for field in SECTIONS[section]:
+            stats[field] = {} if field == "visit_times" else 0
+    if "income" in stats:
+        stats["income"] = 0.0
+    return stats
+
+
+def compute_clinic_daily_stats(clinic_ids, dates, sections=tuple(SECTIONS)):
+    """
+    Computes live statistics of the given clinics for the given dates, one
+    grouped query per section.
+
+    Returns {(clinic_id, date): {field: value}} with an entry for every
+    clinic and date.
+    """
+    dates = set(dates)
+    stats = {
+        (clinic_id, date): _empty_stats(sections)
+        for clinic_id in clinic_ids
+        for date in dates
+    }
+    if not stats:
+        return stats
+
+    if "appointments" in sections:
+        rows = (
+            Appointment.objects.filter(clinic_id__in=clinic_ids, visit_date__in=dates)
+            .values("clinic_id", "visit_date", "status", "visit_time")
+            .annotate(count=Count("id"))
+            .order_by()
+        )
+        for row in rows:
+            day = stats[(row["clinic_id"], row["visit_date"])]
+            day[STATUS_FIELDS[row["status"]]] += row["count"]
+            if row["status"] != Appointment.Status.CANCELLED:
+                day["num_of_appointments"] += row["count"]
+                visit_time = row["visit_time"].isoformat()
+                day["visit_times"][visit_time] = (
+                    day["visit_times"].get(visit_time, 0) + row["count"]
+                )
+
+    if "income" in sections:
+        rows = (
+            Payment.objects.filter(clinic_id__in=clinic_ids, created_at__date__in=dates)
+            .annotate(day=TruncDate("created_at"))
+            .values("clinic_id", "day")
+            .annotate(income=Sum("cost"))
+            .order_by()
+        )
+        for row in rows:
+            stats[(row["clinic_id"], row["day"])]["income"] = row["income"] or 0.0
+
+    if "stars" in sections:
+        rows = (
+            Evaluation.objects.filter(
+                clinic_id__in=clinic_ids, updated_at__date__in=dates
+            )
+            .annotate(day=TruncDate("updated_at"))
+            .values("clinic_id", "day", "rate")
+            .annotate(count=Count("id"))
+            .order_by()
+        )
+        for row in rows:
+            field = STAR_FIELDS.get(row["rate"])
+            if field:
+                stats[(row["clinic_id"], row["day"])][field] = row["count"]
+
+    if "new_patients" in sections:
+        rows = (
+            Financial.objects.filter(
+                clinic_id__in=clinic_ids, created_at__date__in=dates
+            )
+            .annotate(day=TruncDate("created_at"))
+            .values("clinic_id", "day")
+            .annotate(count=Count("id"))
+            .order_by()
+        )
+        for row in rows:
+            stats[(row["clinic_id"], row["day"])]["num_of_new_patients"] = row["count"]
+
+    return stats
+
+
+def refresh_clinic_daily_stats(clinic_ids, dates, sections=tuple(SECTIONS)):
+    """
+    Recomputes the given sections of the rollup rows of the clinics for the
+    given dates and upserts them; other sections are left untouched.
+    """
+    if isinstance(clinic_ids, int):
+        clinic_ids = [clinic_ids]
+    stats = compute_clinic_daily_stats(clinic_ids, dates, sections)
+    if not stats:
+        return
+
+    ClinicDailyStats.objects.bulk_create(
+        [
+            ClinicDailyStats(clinic_id=clinic_id, date=date, **values)
+            for (clinic_id, date), values in stats.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["clinic", "date"],
+        update_fields=[field for section in sections for field in SECTIONS[section]]
+        + ["updated_at"],
+        batch_size=1000,
+    )
+
+
+def get_clinic_daily_stats(clinic_id, start_date, end_date, sections):
+    """
+    Returns {date: {field: value}} for every date between start_date and
+    end_date (inclusive).
+
+    Past days are read from the rollup when CLINIC_DAILY_STATS_ENABLED;
+    today and later days, which are still changing, are computed live.
+    """
+    dates = [
+        start_date + timedelta(days=offset)
+        for offset in range((end_date - start_date).days + 1)
+    ]
+    today = localdate()
+
+    if settings.CLINIC_DAILY_STATS_ENABLED:
+        fields = [field for section in sections for field in SECTIONS[section]]
+        rolled_up = {
+            row["date"]: row
+            for row in ClinicDailyStats.objects.filter(
+                clinic_id=clinic_id,
+                date__range=(start_date, min(end_date, today - timedelta(days=1))),
+            ).values("date", *fields)
+        }
+        live_dates = [date for date in dates if date >= today]
+    else:
+        rolled_up = {}
+        live_dates = dates
+
+    live = compute_clinic_daily_stats([clinic_id], live_dates, sections)
+
+    result = {}
+    for date in dates:
+        if date in rolled_up:
+            values = rolled_up[date]
+            values.pop("date")
+        elif (clinic_id, date) in live:
+            values = live[(clinic_id, date)]
+        else:
+            values = _empty_stats(sections)
+        result[date] = values
+    return result
+
+
+def sum_clinic_daily_stats(daily_stats):
+    """
+    Sums per-day statistics into a single dict; visit-time histograms are
+    merged.
+    """
+    totals = {}
+    visit_times = Counter()
+    for values in daily_stats.values():
+        for field, value in values.items():
+            if field == "visit_times":
+                visit_times.update(value)
+            else:
+                totals[field] = totals.get(field, 0) + value
+    if visit_times:
+        totals["visit_times"] = dict(visit_times)
+    return totals
+
+
+def count_appointments_by_day(clinic_id, start_date, end_date):
+    """
+    Returns {date: number of non-cancelled appointments} for every date
+    between start_date and end_date (inclusive), zero-filled.
+    """
+    daily_stats = get_clinic_daily_stats(
+        clinic_id, start_date, end_date, ["appointments"]
+    )
+    return {date: values["num_of_appointments"] for date, values in daily_stats.items()}
+
+
+def histogram(queryset, field, buckets):
+    """
+    Counts the rows of the queryset per value of `field` for every bucket,
+    together with the total and average of the field, in a single
+    conditional-aggregate query.
+
+    Returns {"buckets": {bucket: count}, "total": int, "average": float | None}.
+    """
+    aggregates = {
+        f"bucket_{index}": Count("pk", filter=Q(**{field: bucket}))
+        for index, bucket in enumerate(buckets)
+    }
+    result = queryset.aggregate(total=Count("pk"), average=Avg(field), **aggregates)
+    return {
+        "buckets": {
+            bucket: result[f"bucket_{index}"] for index, bucket in enumerate(buckets)
+        },
+        "total": result["total"],
+        "average": result["average"],
+    }
+
+
+def _day_start(date):
+    return make_aware(datetime.combine(date, time.min))
+
+
+def star_histogram(clinic_id, start_date, end_date):
+    """
+    Returns the rate histogram of the clinic's evaluations last updated
+    between start_date and end_date (inclusive, local days), as produced by
+    `histogram` with the rates 1 to 5 as buckets.
+
+    Past days are summed from the rollup when CLINIC_DAILY_STATS_ENABLED;
+    the remaining days are counted live over the (clinic, updated_at) index.
+    """
+    buckets = dict.fromkeys(STAR_FIELDS, 0)
+    live_start = start_date
+
+    if settings.CLINIC_DAILY_STATS_ENABLED and start_date < localdate():
+        rollup_end = min(end_date, localdate() - timedelta(days=1))
+        rolled_up = ClinicDailyStats.objects.filter(
+            clinic_id=clinic_id, date__range=(start_date, rollup_end)
+        ).aggregate(**{field: Sum(field) for field in STAR_FIELDS.values()})
+        for rate, field in STAR_FIELDS.items():
+            buckets[rate] += rolled_up[field] or 0
+        live_start = rollup_end + timedelta(days=1)
+
+    if live_start <= end_date:
+        live = histogram(
+            Evaluation.objects.filter(
+                clinic_id=clinic_id,
+                updated_at__gte=_day_start(live_start),
+                updated_at__lt=_day_start(end_date + timedelta(days=1)),
+            ),
+            "rate",
+            list(STAR_FIELDS),
+        )
+        for rate, count in live["buckets"].items():
+            buckets[rate] += count
+
+    total = sum(buckets.values())
+    average = (
+        sum(rate * count for rate, count in buckets.items()) / total if total else None
+    )
+    return {"buckets": buckets, "total": total, "average": average}
@@ -0,0 +1,93 @@
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils.timezone import localdate
+
+from appointments.models import Appointment
+from clinics.models import Clinic
+from evaluations.models import Evaluation
+from financials.models import Financial, Payment
+from .services import refresh_clinic_daily_stats
+
+
+def _refresh_after_delete(clinic_id, dates, sections):
+    # Deletions may be part of a cascade deleting the clinic itself, so the
+    # rollup is refreshed after commit and only if the clinic still exists.
+    def refresh():
+        if Clinic.objects.filter(pk=clinic_id).exists():
+            refresh_clinic_daily_stats(clinic_id, dates, sections)
+
+    transaction.on_commit(refresh)
+
+
+@receiver(pre_save, sender=Appointment)
+def remember_previous_visit_date(sender, instance, **kwargs):
+    instance._previous_visit_date = (
+        Appointment.objects.filter(pk=instance.pk)
+        .values_list("visit_date", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=Appointment)
+def appointment_saved(sender, instance, **kwargs):
+    dates = {instance.visit_date, getattr(instance, "_previous_visit_date", None)}
+    refresh_clinic_daily_stats(instance.clinic_id, dates - {None}, ["appointments"])
+
+
+@receiver(pre_delete, sender=Appointment)
+def appointment_deleted(sender, instance, **kwargs):
+    _refresh_after_delete(instance.clinic_id, [instance.visit_date], ["appointments"])
+
+
+@receiver(post_save, sender=Payment)
+def payment_saved(sender, instance, **kwargs):
+    refresh_clinic_daily_stats(
+        instance.clinic_id, [localdate(instance.created_at)], ["income"]
+    )
+
+
+@receiver(pre_delete, sender=Payment)
+def payment_deleted(sender, instance, **kwargs):
+    _refresh_after_delete(
+        instance.clinic_id, [localdate(instance.created_at)], ["income"]
+    )
+
+
+@receiver(post_save, sender=Financial)
+def financial_saved(sender, instance, **kwargs):
+    refresh_clinic_daily_stats(
+        instance.clinic_id, [localdate(instance.created_at)], ["new_patients"]
+    )
+
+
+@receiver(pre_delete, sender=Financial)
+def financial_deleted(sender, instance, **kwargs):
+    _refresh_after_delete(
+        instance.clinic_id, [localdate(instance.created_at)], ["new_patients"]
+    )
+
+
+@receiver(pre_save, sender=Evaluation)
+def remember_previous_updated_at(sender, instance, **kwargs):
+    instance._previous_updated_at = (
+        Evaluation.objects.filter(pk=instance.pk)
+        .values_list("updated_at", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=Evaluation)
+def evaluation_saved(sender, instance, **kwargs):
+    dates = {localdate(instance.updated_at)}
+    previous_updated_at = getattr(instance, "_previous_updated_at", None)
+    if previous_updated_at is not None:
+        dates.add(localdate(previous_updated_at))
+    refresh_clinic_daily_stats(instance.clinic_id, dates, ["stars"])
+
+
+@receiver(pre_delete, sender=Evaluation)
+def evaluation_deleted(sender, instance, **kwargs):
+    _refresh_after_delete(
+        instance.clinic_id, [localdate(instance.updated_at)], ["stars"]
+    )
@@ -0,0 +1,26 @@
+from datetime import timedelta
+
+from celery import shared_task
+from django.utils.timezone import localdate
+
+from clinics.models import Clinic
+from .services import refresh_clinic_daily_stats
+
+RECONCILE_BATCH_SIZE = 500
+
+
+@shared_task
+def reconcile_clinic_daily_stats(days=2):
+    """
+    Recomputes every section of the rollup for the last `days` closed days
+    of all clinics, repairing anything the signals missed (queryset updates,
+    raw SQL, failed transactions).
+    """
+    today = localdate()
+    dates = [today - timedelta(days=offset) for offset in range(1, days + 1)]
+    clinic_ids = list(Clinic.objects.order_by("pk").values_list("pk", flat=True))
+    for start in range(0, len(clinic_ids), RECONCILE_BATCH_SIZE):
+        refresh_clinic_daily_stats(
+            clinic_ids[start : start + RECONCILE_BATCH_SIZE], dates
+        )
+    return f"Reconciled {len(clinic_ids)} clinics for {days} days"
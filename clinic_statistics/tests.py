@@ -1,3 +1,102 @@
-from django.test import TestCase
+from datetime import time, timedelta
 
-# Create your tests here.
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from appointments.models import Appointment
+from appointments.tests.test_appointments_base import AppointmentBaseTest
+from clinic_statistics.models import ClinicDailyStats
+from clinic_statistics.tasks import reconcile_clinic_daily_stats
+from evaluations.models import Evaluation
+from financials.models import Payment
+
+
+class NumOfAppointmentsTests(AppointmentBaseTest):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("num-of-appointment-diagram")
+        self.day = timezone.now().date() + timedelta(days=3)
+        self.appointment = Appointment.objects.create(
+            patient=self.patient_user,
+            clinic=self.clinic,
+            visit_date=self.day,
+            visit_time=time(8, 0),
+            status=Appointment.Status.WAITING,
+        )
+
+    def test_counts_are_zero_filled(self):
+        self.client.force_authenticate(self.user_doctor_clinic)
+
+        response = self.client.get(
+            f"{self.url}?start-date={self.day - timedelta(days=1)}&end-date={self.day + timedelta(days=1)}"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [day["num_of_appointments"] for day in response.data], [0, 1, 0]
+        )
+
+    def test_rollup_follows_cancellation(self):
+        self.appointment.status = Appointment.Status.CANCELLED
+        self.appointment.save()
+
+        stats = ClinicDailyStats.objects.get(clinic=self.clinic, date=self.day)
+        self.assertEqual(stats.num_of_appointments, 0)
+
+
+class ClinicDailyStatsTests(AppointmentBaseTest):
+    def test_incomes_of_today_are_computed_live(self):
+        Payment.objects.create(clinic=self.clinic, patient=self.patient, cost=100.0)
+        ClinicDailyStats.objects.filter(clinic=self.clinic).update(income=0.0)
+        self.client.force_authenticate(self.user_doctor_clinic)
+        today = timezone.localdate()
+
+        response = self.client.get(
+            f"{reverse('income-detail')}?start-date={today}&end-date={today}"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]["income_value"], 100.0)
+
+    def test_reconciliation_repairs_closed_days(self):
+        yesterday = timezone.localdate() - timedelta(days=1)
+        Appointment.objects.create(
+            patient=self.patient_user,
+            clinic=self.clinic,
+            visit_date=yesterday,
+            visit_time=time(8, 0),
+            status=Appointment.Status.ABSENT,
+        )
+        ClinicDailyStats.objects.filter(clinic=self.clinic, date=yesterday).update(
+            num_of_appointments=0, num_of_absent=0
+        )
+
+        reconcile_clinic_daily_stats()
+
+        stats = ClinicDailyStats.objects.get(clinic=self.clinic, date=yesterday)
+        self.assertEqual(stats.num_of_appointments, 1)
+        self.assertEqual(stats.num_of_absent, 1)
+
+
+class NumOfStarsTests(AppointmentBaseTest):
+    def test_evaluations_of_the_end_day_are_counted(self):
+        appointment = Appointment.objects.create(
+            patient=self.patient_user,
+            clinic=self.clinic,
+            visit_date=timezone.localdate(),
+            visit_time=time(8, 0),
+            status=Appointment.Status.COMPLETED,
+        )
+        Evaluation.objects.create(patient=self.patient, appointment=appointment, rate=4)
+        self.client.force_authenticate(self.user_doctor_clinic)
+        today = timezone.localdate()
+
+        response = self.client.get(
+            f"{reverse('num-of-stars')}?start-date={today}&end-date={today}"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["num_of_four_stars"], 1)
+        self.assertEqual(response.data["num_of_rates"], 1)
+        self.assertEqual(response.data["average_rate"], 4.0)
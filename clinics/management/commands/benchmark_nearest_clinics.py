@@ -0,0 +1,105 @@
+import random
+
+from django.contrib.gis.geos import Point
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from clinics.models import Clinic
+from common.benchmark import measure, rolled_back
+from doctors.models import Doctor
+from users.models import CustomUser as User
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks the nearest clinics query, ordering by computed distance "
+        "against the KNN index, on generated clinics. Everything runs in a "
+        "rolled back transaction."
+    )
+
+    # Around Syria
+    LATITUDES = (32.3, 37.3)
+    LONGITUDES = (35.7, 42.4)
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=100_000)
+        parser.add_argument("--repeat", type=int, default=50)
+        parser.add_argument("--k", type=int, default=10)
+        parser.add_argument(
+            "--radius", type=float, help="Optional prefilter radius in meters"
+        )
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            self.run(
+                options["count"], options["repeat"], options["k"], options["radius"]
+            )
+
+    def run(self, count, repeat, k, radius):
+        random.seed(0)
+        users = User.objects.bulk_create(
+            [
+                User(
+                    phone=f"bench{i:010d}",
+                    password="!",
+                    first_name="Benchmark",
+                    last_name=str(i),
+                    role=User.Role.DOCTOR,
+                )
+                for i in range(count)
+            ],
+            batch_size=5000,
+        )
+        Doctor.objects.bulk_create(
+            [
+                Doctor(
+                    user=user,
+                    about="",
+                    education="",
+                    certificate="documents/certificates/benchmark.pdf",
+                )
+                for user in users
+            ],
+            batch_size=5000,
+        )
+        Clinic.objects.bulk_create(
+            [
+                Clinic(
+                    doctor_id=user.pk,
+                    address="Benchmark",
+                    location=Point(
+                        random.uniform(*self.LONGITUDES),
+                        random.uniform(*self.LATITUDES),
+                        srid=4326,
+                    ),
+                    phone=f"bench{i:010d}",
+                )
+                for i, user in enumerate(users)
+            ],
+            batch_size=5000,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE clinics_clinic")
+
+        origins = [
+            (random.uniform(*self.LATITUDES), random.uniform(*self.LONGITUDES))
+            for _ in range(repeat)
+        ]
+
+        full = measure(
+            lambda origin: list(
+                Clinic.objects.with_distance(*origin).order_by("distance")[:k]
+            ),
+            origins,
+        )
+        knn = measure(
+            lambda origin: list(Clinic.objects.nearest(*origin, k=k, radius=radius)),
+            origins,
+        )
+
+        self.stdout.write(f"clinics:           {Clinic.objects.count()}")
+        self.stdout.write(f"distance order:    {full}")
+        self.stdout.write(f"knn index:         {knn}")
+        self.stdout.write(
+            Clinic.objects.nearest(*origins[0], k=k, radius=radius).explain()
+        )
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.1 on 2025-09-10 11:00
+
+import django.contrib.gis.db.models.fields
+import django.contrib.postgres.indexes
+import django.db.models.functions.comparison
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clinics", "0003_trigram_ext"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="clinic",
+            index=django.contrib.postgres.indexes.GistIndex(
+                django.db.models.functions.comparison.Cast(
+                    "location",
+                    django.contrib.gis.db.models.fields.PointField(
+                        geography=True, srid=4326
+                    ),
+                ),
+                name="clinics_location_geography_idx",
+            ),
+        ),
+    ]
@@ -1,8 +1,11 @@
 from django.db import models
+from django.db.models.functions import Cast
 from django.contrib.gis.db import models as gis_models
+from django.contrib.postgres.indexes import GistIndex
 from django.utils import timezone
 from django.contrib.gis.geos import Point
 from django.contrib.gis.db.models.functions import Distance
+from django.contrib.gis.measure import D
 from django.utils.translation import gettext_lazy as _
 from django.contrib import admin
 
@@ -12,6 +15,43 @@ from doctors.models import Doctor, DoctorSpecialty
 from patients.models import Patient
 
 
+def as_geography(expression):
+    return Cast(expression, gis_models.PointField(geography=True, srid=4326))
+
+
+class KNNDistance(models.Func):
+    """
+    Distance in meters between two geographies with the `<->` operator,
+    which an ORDER BY ... LIMIT can answer by walking a GiST index.
+    """
+
+    arg_joiner = " <-> "
+    template = "(%(expressions)s)"
+    output_field = models.FloatField()
+
+
+def knn_distance(field, latitude, longitude):
+    """
+    KNN distance between the location `field` and the coordinate, matching
+    the GiST index on Clinic.location as geography.
+    """
+    location = models.Value(
+        Point(longitude, latitude, srid=4326),
+        output_field=gis_models.PointField(srid=4326),
+    )
+    return KNNDistance(as_geography(field), as_geography(location))
+
+
+def within(queryset, field, latitude, longitude, radius):
+    """
+    Filters the queryset on the location `field` being within radius meters
+    of the coordinate, using the GiST index on Clinic.location as geography.
+    """
+    return queryset.alias(location_geography=as_geography(field)).filter(
+        location_geography__dwithin=(Point(longitude, latitude, srid=4326), D(m=radius))
+    )
+
+
 class ClinicQuerySet(models.QuerySet):
     def not_deleted_doctor(self):
         return self.filter(doctor__user__deleted_at__isnull=True)
@@ -20,23 +60,29 @@ class ClinicQuerySet(models.QuerySet):
         return self.filter(doctor__status=Doctor.Status.APPROVED)
 
     def with_doctor_categorized_specialties(self):
+        from doctors.registry import specialty_registry
+
+        main_specialty_ids = specialty_registry.main_specialty_ids()
         return self.prefetch_related(
             models.Prefetch(
                 "doctor__doctor_specialties",
-                queryset=DoctorSpecialty.objects.select_related("specialty")
-                .filter(specialty__main_specialties__isnull=True)
-                .distinct(),
+                queryset=DoctorSpecialty.objects.select_related("specialty").filter(
+                    specialty_id__in=main_specialty_ids
+                ),
                 to_attr="main_specialties",
             ),
             models.Prefetch(
                 "doctor__doctor_specialties",
-                queryset=DoctorSpecialty.objects.select_related("specialty")
-                .filter(specialty__main_specialties__isnull=False)
-                .distinct(),
+                queryset=DoctorSpecialty.objects.select_related("specialty").exclude(
+                    specialty_id__in=main_specialty_ids
+                ),
                 to_attr="subspecialties",
             ),
         )
 
+    def with_doctor_main_specialty(self):
+        return self.select_related("doctor__main_doctor_specialty__specialty")
+
     def with_doctor(self):
         return self.select_related("doctor")
 
@@ -47,7 +93,7 @@ class ClinicQuerySet(models.QuerySet):
         return (
             self.not_deleted_doctor()
             .approved_doctor_only()
-            .with_doctor_categorized_specialties()
+            .with_doctor_main_specialty()
             .with_doctor_user()
         )
 
@@ -55,6 +101,25 @@ class ClinicQuerySet(models.QuerySet):
         location = Point(longitude, latitude, srid=4326)
         return self.annotate(distance=Distance("location", location))
 
+    def nearest(self, latitude, longitude, k=None, radius=None):
+        """
+        Orders the clinics nearest first, annotated with their `distance` in
+        meters, using the KNN index instead of computing the distance to
+        every clinic.
+
+        Returns only the k nearest clinics when k is given, and only the
+        clinics within radius meters when radius is given.
+        """
+        queryset = self
+        if radius is not None:
+            queryset = within(queryset, "location", latitude, longitude, radius)
+        queryset = queryset.annotate(
+            distance=knn_distance("location", latitude, longitude)
+        ).order_by("distance")
+        if k is not None:
+            queryset = queryset[:k]
+        return queryset
+
 
 class Clinic(models.Model):
     doctor = models.OneToOneField(
@@ -95,6 +160,9 @@ class Clinic(models.Model):
     class Meta:
         verbose_name = _("Clinic")
         verbose_name_plural = _("Clinics")
+        indexes = [
+            GistIndex(as_geography("location"), name="clinics_location_geography_idx"),
+        ]
 
     def __str__(self):
         return f"{self.doctor.user.first_name} {self.doctor.user.last_name} - {self.address} - ({self.phone})"
@@ -7,7 +7,8 @@ from clinics.models import Clinic
 class ClinicNearestSerializer(serializers.ModelSerializer):
     doctor = DoctorSummarySerializer()
     distance = serializers.IntegerField()
+    is_approximate_distance = serializers.BooleanField(default=False)
 
     class Meta:
         model = Clinic
-        fields = ["doctor", "address", "distance"]
+        fields = ["doctor", "address", "distance", "is_approximate_distance"]
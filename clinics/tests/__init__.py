@@ -1,4 +1,5 @@
 from .test_add_assistant_to_clinic import *
 from .test_clinic_image import *
 from .test_clinic import *
-from .test_remove_list_assistants import *
\ No newline at end of file
+from .test_remove_list_assistants import *
+from .test_nearest import *
\ No newline at end of file
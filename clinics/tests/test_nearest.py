@@ -0,0 +1,45 @@
+from django.contrib.gis.geos import Point
+from rest_framework.test import APITestCase
+
+from clinics.models import Clinic
+from common.utils import generate_test_pdf
+from doctors.models import Doctor
+from users.models import CustomUser as User
+
+
+class ClinicNearestQuerySetTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Clinics 1, 3 and 20 km north of the origin, created out of order
+        cls.clinics = {}
+        for index, kilometers in enumerate([20, 1, 3]):
+            user = User.objects.create_user(
+                phone=f"098830000{index}",
+                password="abcX123!",
+                first_name="doctor",
+                last_name=f"user{index}",
+                role=User.Role.DOCTOR.value,
+            )
+            doctor = Doctor.objects.create(
+                user=user,
+                about="About Test",
+                education="Test",
+                certificate=generate_test_pdf(),
+            )
+            cls.clinics[kilometers] = Clinic.objects.create(
+                doctor=doctor,
+                address="Test Street",
+                location=Point(36.3, 33.5 + kilometers / 111.2, srid=4326),
+                phone=f"011 223 333{index}",
+            )
+
+    def test_clinics_are_ordered_nearest_first(self):
+        clinics = list(Clinic.objects.nearest(33.5, 36.3, k=2))
+
+        self.assertEqual(clinics, [self.clinics[1], self.clinics[3]])
+        self.assertAlmostEqual(clinics[0].distance, 1000, delta=20)
+
+    def test_radius_excludes_farther_clinics(self):
+        clinics = list(Clinic.objects.nearest(33.5, 36.3, radius=5000))
+
+        self.assertEqual(clinics, [self.clinics[1], self.clinics[3]])
@@ -2,7 +2,7 @@ from rest_framework import generics
 from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiTypes
-from services.googlemaps import X_GOOG_FIELDMASK
+from services.googlemaps import X_GOOG_FIELDMASK, is_approximate
 from services import get_route_matrix_elements
 
 from clinics.models import Clinic
@@ -36,12 +36,8 @@ class ClinicNearestListView(generics.GenericAPIView):
     def get(self, request, *args, **kwargs):
         latitude, longitude = self.get_lat_lng()
         origins = [{"longitude": longitude, "latitude": latitude}]
-        clinics = (
-            Clinic.objects.with_doctor_user()
-            .not_deleted_doctor()
-            .approved_doctor_only()
-            .with_distance(origins[0]["latitude"], origins[0]["longitude"])
-            .order_by("distance")[:10]
+        clinics = Clinic.objects.with_active_doctor_details().nearest(
+            origins[0]["latitude"], origins[0]["longitude"], k=10
         )
         destinations = [
             {"longitude": clinic.longitude, "latitude": clinic.latitude}
@@ -56,6 +52,7 @@ class ClinicNearestListView(generics.GenericAPIView):
         for route_matrix_element in route_matrix_elements[:7]:
             clinic = clinics[route_matrix_element.destination_index]
             clinic.distance = route_matrix_element.distance_meters
+            clinic.is_approximate_distance = is_approximate(route_matrix_element)
             data.append(clinic)
         serializer = self.get_serializer(data, many=True)
         return Response(serializer.data)
@@ -0,0 +1,53 @@
+import math
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.db import transaction
+
+
+class Rollback(Exception):
+    pass
+
+
+@contextmanager
+def rolled_back():
+    """
+    Runs the block in a transaction that is always rolled back, so the data
+    generated by a benchmark never reaches the database.
+    """
+    try:
+        with transaction.atomic():
+            yield
+            raise Rollback
+    except Rollback:
+        pass
+
+
+class Timings:
+    """
+    Median and 95th percentile (nearest rank) of a set of durations in
+    seconds.
+    """
+
+    def __init__(self, durations):
+        durations = sorted(durations)
+        self.count = len(durations)
+        self.p50 = statistics.median(durations)
+        self.p95 = durations[math.ceil(len(durations) * 0.95) - 1]
+
+    def __str__(self):
+        return f"p50 {self.p50 * 1000:.2f} ms, p95 {self.p95 * 1000:.2f} ms"
+
+
+def measure(call, arguments) -> Timings:
+    """
+    Calls `call` once with each of the arguments and returns the timings of
+    the calls.
+    """
+    durations = []
+    for argument in arguments:
+        started = time.perf_counter()
+        call(argument)
+        durations.append(time.perf_counter() - started)
+    return Timings(durations)
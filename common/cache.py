@@ -0,0 +1,63 @@
+import time
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+LOCK_SUFFIX = ":lock"
+
+
+def get_or_compute_once(
+    cache, key, compute, timeout=DEFAULT_TIMEOUT, lock_timeout=5, poll_interval=0.05
+):
+    """
+    Returns the cached value of key, computing and caching it on a miss.
+
+    Concurrent misses on the same key, in any process, are single-flighted:
+    the caller that takes the lock (an atomic cache.add) computes the value
+    while the others poll the cache for it. Should the value not appear
+    within lock_timeout seconds, or the lock be released without it, the
+    waiting caller computes it itself.
+
+    compute must not return None, which marks a miss.
+    """
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    lock_key = key + LOCK_SUFFIX
+    if cache.add(lock_key, True, timeout=lock_timeout):
+        try:
+            value = compute()
+            cache.set(key, value, timeout=timeout)
+        finally:
+            cache.delete(lock_key)
+        return value
+
+    deadline = time.monotonic() + lock_timeout
+    while time.monotonic() < deadline:
+        time.sleep(poll_interval)
+        # The value is set before the lock is released
+        released = cache.get(lock_key) is None
+        value = cache.get(key)
+        if value is not None:
+            return value
+        if released:
+            break
+    return compute()
+
+
+def take_rate_limit_slot(cache, key, limit, period):
+    """
+    Takes one of the limit slots of the current period-second window of key.
+    The count is incremented atomically in the cache, so the limit is shared
+    by every process and worker using it.
+
+    Returns 0 when a slot was taken, otherwise the seconds until the next
+    window opens.
+    """
+    now = time.time()
+    window = int(now // period)
+    window_key = f"{key}:{window}"
+    cache.add(window_key, 0, timeout=period + 1)
+    if cache.incr(window_key) <= limit:
+        return 0
+    return (window + 1) * period - now
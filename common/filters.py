@@ -1,15 +1,42 @@
+from functools import reduce
+from operator import or_
+
+from django.db import connections
+from django.db.models import F, Q, Value
 from django.db.models.functions import Greatest
-from django.contrib.postgres.search import TrigramSimilarity
+from django.contrib.postgres.lookups import TrigramWordSimilar
+from django.contrib.postgres.search import TrigramWordSimilarity
 
 from rest_framework.filters import SearchFilter
 
+from .normalization import normalize_search_text
+
 
 class TrigramSearchFilter(SearchFilter):
+    """
+    Matches the search term against the words of the search fields with the
+    pg_trgm `%>` operator, which GIN `gin_trgm_ops` indexes on the fields
+    can serve, and orders the matches by their word similarity.
+
+    The search term is normalized like the indexed documents, see
+    `normalize_search_text`. The threshold is set on the database session
+    before the query runs.
+    """
+
     search_param = "query"
-    similarity_threshold = 0.2
+    similarity_threshold = 0.4
+
+    def set_similarity_threshold(self, using):
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                "SELECT set_config('pg_trgm.word_similarity_threshold', %s, false)",
+                [str(self.similarity_threshold)],
+            )
 
     def filter_queryset(self, request, queryset, view):
-        search_term = request.query_params.get(self.search_param)
+        search_term = normalize_search_text(
+            request.query_params.get(self.search_param, "")
+        )
         if not search_term or len(search_term) < 3:
             return queryset
 
@@ -17,12 +44,20 @@ class TrigramSearchFilter(SearchFilter):
         if not search_fields:
             return queryset
 
+        self.set_similarity_threshold(queryset.db)
+        matches = [
+            Q(TrigramWordSimilar(F(field), Value(search_term)))
+            for field in search_fields
+        ]
         similarities = [
-            TrigramSimilarity(field, search_term) for field in search_fields
+            TrigramWordSimilarity(search_term, field) for field in search_fields
         ]
+        similarity = (
+            similarities[0] if len(similarities) == 1 else Greatest(*similarities)
+        )
         queryset = (
-            queryset.annotate(similarity=Greatest(*similarities))
-            .filter(similarity__gt=self.similarity_threshold)
+            queryset.filter(reduce(or_, matches))
+            .annotate(similarity=similarity)
             .order_by("-similarity")
         )
         return queryset
@@ -0,0 +1,37 @@
+import os
+import threading
+
+
+class process_local:
+    """
+    Like functools.cached_property, but the value is rebuilt in every
+    process: clients holding sockets or gRPC channels are created on first
+    use instead of at import time, and are never shared with forked
+    workers.
+
+    Assigning the attribute replaces the value for the current process.
+    """
+
+    def __init__(self, function):
+        self.function = function
+        self.lock = threading.Lock()
+        self.__doc__ = function.__doc__
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        pid = os.getpid()
+        cached = instance.__dict__.get(self.name)
+        if cached is None or cached[0] != pid:
+            with self.lock:
+                cached = instance.__dict__.get(self.name)
+                if cached is None or cached[0] != pid:
+                    cached = (pid, self.function(instance))
+                    instance.__dict__[self.name] = cached
+        return cached[1]
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.name] = (os.getpid(), value)
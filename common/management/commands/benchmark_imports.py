@@ -0,0 +1,76 @@
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Reports the cold-start import time of the project in a fresh "
+        "interpreter with python -X importtime, slowest modules first, so "
+        "import time regressions are visible."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top", type=int, default=25)
+        parser.add_argument(
+            "--module",
+            action="append",
+            dest="modules",
+            help="Module imported after django.setup(), may be repeated; defaults to the URLconf and the Celery app",
+        )
+        parser.add_argument(
+            "--budget",
+            type=float,
+            help="Fail when the total import time exceeds this many milliseconds",
+        )
+
+    def handle(self, *args, **options):
+        modules = options["modules"] or [settings.ROOT_URLCONF, "django_project.celery"]
+        code = "import django; django.setup(); " + "; ".join(
+            f"import {module}" for module in modules
+        )
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            env={
+                **os.environ,
+                "DJANGO_SETTINGS_MODULE": os.environ.get(
+                    "DJANGO_SETTINGS_MODULE", "django_project.settings"
+                ),
+            },
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode:
+            raise CommandError(result.stderr.strip().splitlines()[-1])
+
+        rows = []
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "imported package" in line:
+                continue
+            self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+            depth = (len(name) - len(name.lstrip()) - 1) // 2
+            rows.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+
+        total = sum(self_us for _, _, self_us, _ in rows) / 1000
+        self.stdout.write(f"modules imported: {len(rows)}")
+        self.stdout.write(f"total:            {total:.1f} ms")
+
+        self.stdout.write("\nslowest top-level imports (cumulative ms):")
+        top_level = sorted(
+            (row for row in rows if row[1] == 0), key=lambda row: row[3], reverse=True
+        )
+        for name, _, _, cumulative_us in top_level[: options["top"]]:
+            self.stdout.write(f"{cumulative_us / 1000:10.1f}  {name}")
+
+        self.stdout.write("\nslowest modules (self ms):")
+        slowest = sorted(rows, key=lambda row: row[2], reverse=True)
+        for name, _, self_us, _ in slowest[: options["top"]]:
+            self.stdout.write(f"{self_us / 1000:10.1f}  {name}")
+
+        if options["budget"] is not None and total > options["budget"]:
+            raise CommandError(
+                f"Import time {total:.1f} ms exceeds the budget of {options['budget']:.1f} ms."
+            )
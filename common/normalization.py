@@ -0,0 +1,38 @@
+import re
+import unicodedata
+
+# Harakat, superscript alef and Quranic annotation marks
+ARABIC_DIACRITICS = re.compile(
+    "[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06dc\u06df-\u06e8\u06ea-\u06ed]"
+)
+TATWEEL = "\u0640"
+WHITESPACE = re.compile(r"\s+")
+
+ARABIC_LETTER_VARIANTS = str.maketrans(
+    {
+        "أ": "ا",
+        "إ": "ا",
+        "آ": "ا",
+        "ٱ": "ا",
+        "ى": "ي",
+        "ی": "ي",
+        "ة": "ه",
+        "ک": "ك",
+    }
+)
+
+
+def normalize_search_text(text: str) -> str:
+    """
+    Normalizes text for trigram search: folds compatibility forms (such as
+    Arabic presentation forms) and case, drops Arabic diacritics and
+    tatweel, unifies alef, yaa and taa marbuta variants and collapses
+    whitespace.
+
+    Indexed search documents and search terms must go through the same
+    normalization for their trigrams to match.
+    """
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = ARABIC_DIACRITICS.sub("", text).replace(TATWEEL, "")
+    text = text.translate(ARABIC_LETTER_VARIANTS)
+    return WHITESPACE.sub(" ", text).strip()
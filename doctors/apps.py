@@ -6,3 +6,6 @@ class DoctorsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "doctors"
     verbose_name = _("Doctors")
+
+    def ready(self):
+        import doctors.signals
@@ -0,0 +1,142 @@
+from django.contrib.auth.models import AnonymousUser
+from django.db import transaction
+
+from common.utils import years_since
+
+from .models import Doctor, DoctorDocument
+from .serializers import DoctorDetailSerializer, DoctorSummarySerializer
+from .services import doctor_id_batches
+
+
+def build_doctor_document(doctor: Doctor) -> DoctorDocument:
+    """
+    Renders the card and the detailed profile of a doctor loaded with its
+    user, clinic and categorized specialties, without a request so that the
+    image URLs stay relative.
+    """
+    return DoctorDocument(
+        doctor=doctor,
+        card=DoctorSummarySerializer(doctor).data,
+        detail=DoctorDetailSerializer(doctor).data,
+    )
+
+
+def refresh_doctor_documents(doctor_ids=None, batch_size=500):
+    """
+    Renders again the documents of the given doctors, or of all doctors when
+    doctor_ids is None. Doctors without a clinic have no document.
+
+    Returns the number of rendered documents.
+    """
+    refreshed = 0
+    for pks in doctor_id_batches(doctor_ids, batch_size):
+        doctors = (
+            Doctor.objects.filter(pk__in=pks, clinic__isnull=False)
+            .with_user()
+            .with_clinic()
+            .with_categorized_specialties()
+        )
+        documents = [build_doctor_document(doctor) for doctor in doctors]
+        with transaction.atomic():
+            DoctorDocument.objects.filter(doctor_id__in=pks).exclude(
+                doctor_id__in=[document.doctor_id for document in documents]
+            ).delete()
+            DoctorDocument.objects.bulk_create(
+                documents,
+                update_conflicts=True,
+                unique_fields=["doctor"],
+                update_fields=["card", "detail", "updated_at"],
+            )
+        refreshed += len(documents)
+    return refreshed
+
+
+def set_is_favorite(user, documents):
+    """
+    Sets `is_favorite` on the given doctor cards or details from the user's
+    cached favorites; anonymous users get no `is_favorite`.
+    """
+    if isinstance(user, AnonymousUser):
+        return
+
+    from favorites.services import get_favorite_doctor_ids
+
+    favorite_ids = get_favorite_doctor_ids(user.pk)
+    for document in documents:
+        document["is_favorite"] = document["user"]["id"] in favorite_ids
+
+
+def absolutize_image(request, document):
+    if document.get("image"):
+        document["image"] = request.build_absolute_uri(document["image"])
+
+
+def absolutize_specialty_images(request, doctor_specialty):
+    if doctor_specialty:
+        absolutize_image(request, doctor_specialty["specialty"])
+
+
+def get_doctor_cards(request, doctor_ids, with_favorites=True) -> list[dict]:
+    """
+    Returns the cards of the given doctors, in their order, as
+    `DoctorSummarySerializer` renders them for the request, with a single
+    fetch of the documents. Doctors whose document is missing are rendered
+    on the spot.
+    """
+    doctor_ids = list(doctor_ids)
+    cards = dict(
+        DoctorDocument.objects.filter(pk__in=doctor_ids).values_list("pk", "card")
+    )
+
+    missing = [pk for pk in doctor_ids if pk not in cards]
+    if missing:
+        doctors = (
+            Doctor.objects.with_user()
+            .with_clinic()
+            .with_main_specialty()
+            .filter(pk__in=missing)
+        )
+        cards.update(
+            {doctor.pk: DoctorSummarySerializer(doctor).data for doctor in doctors}
+        )
+
+    result = []
+    for pk in doctor_ids:
+        if pk not in cards:
+            continue
+        card = dict(cards[pk])
+        absolutize_image(request, card["user"])
+        absolutize_specialty_images(request, card["main_specialty"])
+        result.append(card)
+    if with_favorites:
+        set_is_favorite(request.user, result)
+    return result
+
+
+def get_doctor_detail(request, doctor_id) -> dict | None:
+    """
+    Returns the detailed profile of an approved, not deleted doctor as
+    `DoctorDetailSerializer` renders it for the request, or None when the
+    doctor has no document.
+    """
+    row = (
+        Doctor.objects.not_deleted()
+        .approved()
+        .filter(pk=doctor_id, document__isnull=False)
+        .values_list("document__detail", "start_work_date", "user__birth_date")
+        .first()
+    )
+    if row is None:
+        return None
+
+    detail, start_work_date, birth_date = row
+    # Both change with the date, not with the doctor
+    detail["experience"] = years_since(start_work_date)
+    detail["user"]["age"] = years_since(birth_date)
+    absolutize_image(request, detail["user"])
+    absolutize_specialty_images(request, detail["main_specialty"])
+    for subspecialty in detail["subspecialties"]:
+        absolutize_specialty_images(request, subspecialty)
+
+    set_is_favorite(request.user, [detail])
+    return detail
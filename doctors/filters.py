@@ -1,29 +1,22 @@
+import heapq
 from datetime import date
 from functools import total_ordering
 
 from django.utils.translation import gettext_lazy as _
-from django.contrib.gis.measure import D
 from django.contrib.gis.geos import Point
 from django.contrib.gis.db.models.functions import Distance
 
-from google.maps.routing_v2.types import (
-    RouteTravelMode,
-    Units,
-    RouteMatrixElementCondition,
-)
-
 from rest_framework.filters import OrderingFilter, BaseFilterBackend
 from rest_framework.exceptions import ValidationError
 
-from services.googlemaps import GoogleMapsService, X_GOOG_FIELDMASK
+from services.googlemaps import X_GOOG_FIELDMASK
+from services import get_route_matrix_elements
 
+from clinics.models import knn_distance, within
 from doctors.serializers import DoctorFilterQuerySerializer
 from patients.serializers import LocationQuerySerializer
 
 
-googlemaps_service = GoogleMapsService()
-
-
 @total_ordering
 class DescStr(str):
     def __lt__(self, other):
@@ -37,7 +30,11 @@ class DoctorSpecialtyFilter(BaseFilterBackend):
         filter = filter_serializer.validated_data
 
         if "specialties" in filter:
-            queryset = queryset.filter(specialties__pk__in=filter["specialties"])
+            queryset = queryset.filter(
+                specialty_ids__overlap=list(
+                    filter["specialties"].values_list("pk", flat=True)
+                )
+            )
         return queryset
 
 
@@ -71,6 +68,8 @@ class DoctorOrdering(OrderingFilter):
     }
     ordering_param = "ordering"
     ordering_fields = ORDERING_MAP.keys()
+    # Places a doctor may move ahead of its straight-line rank by road distance
+    distance_margin = 10
 
     def filter_queryset(self, request, queryset, view):
         ordering = self.get_ordering(request, queryset, view)
@@ -79,7 +78,14 @@ class DoctorOrdering(OrderingFilter):
                 f"{'-' if item.startswith('-') else ''}{self.ORDERING_MAP.get(item.lstrip('-'))}"
                 for item in ordering
             ]
-            if any(item.lstrip("-") == "distance" for item in ordering):
+            if ordering[0].lstrip("-") == "distance":
+                queryset = DistanceRankedDoctors(
+                    queryset,
+                    get_origin(request),
+                    descending=ordering[0].startswith("-"),
+                    margin=self.distance_margin,
+                )
+            elif any(item.lstrip("-") == "distance" for item in ordering):
                 queryset, clinic_distances_by_pk = annotate_and_filter_by_distance(
                     request, queryset
                 )
@@ -109,19 +115,123 @@ class DoctorOrdering(OrderingFilter):
         return queryset
 
 
-def annotate_and_filter_by_distance(request, queryset, filter=None):
+class DistanceRankedDoctors:
+    """
+    Doctors of a queryset ranked by road distance from an origin, computed
+    lazily for the slices that are read, so that pagination only refines
+    the requested page.
+
+    Candidates come from PostGIS in straight-line distance order, and each
+    position takes the nearest by road among the next `margin` + 1
+    candidates; doctors without a route come last. The rank of a doctor
+    only depends on the candidates before it, which keeps pages stable.
+    """
+
+    def __init__(self, queryset, origin, descending=False, margin=10):
+        self.queryset = queryset
+        self.origin = origin
+        self.descending = descending
+        self.margin = margin
+        self._ranked = []
+        self._count = None
+
+    def count(self):
+        if self._count is None:
+            self._count = self.queryset.count()
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __iter__(self):
+        return iter(self[:])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            stop = self.count() if index.stop is None else index.stop
+            return self.rank(stop)[index]
+        return self.rank(index + 1)[index]
+
+    def rank(self, stop):
+        if stop <= len(self._ranked):
+            return self._ranked
+
+        distance = knn_distance(
+            "clinic__location", self.origin["latitude"], self.origin["longitude"]
+        )
+        candidates = list(
+            self.queryset.annotate(distance=distance).order_by(
+                "-distance" if self.descending else "distance", "pk"
+            )[: stop + self.margin]
+        )
+        road_distances = get_road_distances(self.origin, candidates)
+
+        def key(rank):
+            distance = road_distances.get(candidates[rank].pk)
+            if distance is None:
+                return (1, 0, rank)
+            return (0, -distance if self.descending else distance, rank)
+
+        window = [key(rank) for rank in range(min(self.margin + 1, len(candidates)))]
+        heapq.heapify(window)
+        ranked = []
+        next_rank = len(window)
+        while window and len(ranked) < stop:
+            *_, rank = heapq.heappop(window)
+            doctor = candidates[rank]
+            doctor.distance = road_distances.get(doctor.pk)
+            ranked.append(doctor)
+            if next_rank < len(candidates):
+                heapq.heappush(window, key(next_rank))
+                next_rank += 1
+
+        self._ranked = ranked
+        return ranked
+
+
+def get_origin(request):
     location_serializer = LocationQuerySerializer(data=request.query_params)
     try:
         location_serializer.is_valid(raise_exception=True)
-        origins = [location_serializer.validated_data]
+        return location_serializer.validated_data
     except ValidationError as e:
         if hasattr(request.user, "patient"):
             patient = request.user.patient
-            origins = [{"longitude": patient.longitude, "latitude": patient.latitude}]
-        else:
-            raise e
+            return {"longitude": patient.longitude, "latitude": patient.latitude}
+        raise e
+
 
-    location = Point(origins[0]["longitude"], origins[0]["latitude"], srid=4326)
+def get_road_distances(origin, doctors):
+    """
+    Returns {doctor pk: walking distance in meters} for the doctors whose
+    clinic can be reached from the origin.
+    """
+    destinations = [
+        {"longitude": doctor.clinic.longitude, "latitude": doctor.clinic.latitude}
+        for doctor in doctors
+    ]
+    route_matrix_elements = get_route_matrix_elements(
+        [origin],
+        destinations,
+        [
+            X_GOOG_FIELDMASK.ORIGIN_INDEX,
+            X_GOOG_FIELDMASK.DESTINATION_INDEX,
+            X_GOOG_FIELDMASK.DISTANCE_METERS,
+            X_GOOG_FIELDMASK.STATUS,
+            X_GOOG_FIELDMASK.CONDITION,
+        ],
+    )
+    return {
+        doctors[
+            route_matrix_element.destination_index
+        ].pk: route_matrix_element.distance_meters
+        for route_matrix_element in route_matrix_elements
+    }
+
+
+def annotate_and_filter_by_distance(request, queryset, filter=None):
+    origin = get_origin(request)
+    location = Point(origin["longitude"], origin["latitude"], srid=4326)
     queryset = queryset.annotate(distance=Distance("clinic__location", location))
 
     distance_limit_meters = None
@@ -132,37 +242,15 @@ def annotate_and_filter_by_distance(request, queryset, filter=None):
             "mi": 1609.34,
             "ft": 0.3048,
         }.get(filter.get("unit", "m"), 1)
-        queryset = queryset.filter(
-            clinic__location__distance_lte=(location, D(m=distance_limit_meters))
+        queryset = within(
+            queryset,
+            "clinic__location",
+            origin["latitude"],
+            origin["longitude"],
+            distance_limit_meters,
         )
 
-    destinations = [
-        {"longitude": doctor.clinic.longitude, "latitude": doctor.clinic.latitude}
-        for doctor in queryset
-    ]
-
-    clinic_distances_by_pk = {}
-    if destinations:
-        route_matrix_elements = googlemaps_service.route_matrix(
-            origins,
-            destinations,
-            field_mask_list=[
-                X_GOOG_FIELDMASK.ORIGIN_INDEX,
-                X_GOOG_FIELDMASK.DESTINATION_INDEX,
-                X_GOOG_FIELDMASK.DISTANCE_METERS,
-                X_GOOG_FIELDMASK.STATUS,
-                X_GOOG_FIELDMASK.CONDITION,
-            ],
-            travel_mode=RouteTravelMode.WALK,
-            units=Units.METRIC,
-        )
-        for route_matrix_element in route_matrix_elements:
-            if (
-                route_matrix_element.condition
-                == RouteMatrixElementCondition.ROUTE_EXISTS
-            ):
-                clinic = queryset[route_matrix_element.destination_index]
-                clinic_distances_by_pk[clinic.pk] = route_matrix_element.distance_meters
+    clinic_distances_by_pk = get_road_distances(origin, list(queryset))
 
     if distance_limit_meters is not None:
         clinic_distances_by_pk = {
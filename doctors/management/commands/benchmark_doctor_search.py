@@ -0,0 +1,163 @@
+import random
+import time as timer
+
+from django.contrib.postgres.search import TrigramSimilarity
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models.functions import Greatest
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from common.benchmark import measure, rolled_back
+from common.filters import TrigramSearchFilter
+from doctors.models import Doctor, DoctorSpecialty, Specialty
+from doctors.services import refresh_doctor_search_documents
+from doctors.views.search import DoctorSearchListView
+from users.models import CustomUser as User
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks doctor search on generated doctors, comparing similarity "
+        "over every row with the indexed trigram search document. Everything "
+        "runs in a rolled back transaction."
+    )
+
+    SYLLABLES = [
+        "ah",
+        "mad",
+        "sa",
+        "mir",
+        "ka",
+        "lid",
+        "ra",
+        "na",
+        "ya",
+        "sin",
+        "ha",
+        "di",
+        "lu",
+        "bna",
+        "zai",
+        "tar",
+    ]
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=50_000)
+        parser.add_argument("--repeat", type=int, default=100)
+        parser.add_argument(
+            "--limit", type=int, default=30, help="Page size of each search"
+        )
+
+    def handle(self, *args, **options):
+        specialties = list(Specialty.objects.values_list("pk", "name_en"))
+        if not specialties:
+            raise CommandError("At least one specialty is required.")
+
+        with rolled_back():
+            self.run(specialties, options["count"], options["repeat"], options["limit"])
+
+    def name(self):
+        return "".join(
+            random.choices(self.SYLLABLES, k=random.randint(2, 3))
+        ).capitalize()
+
+    def typo(self, word):
+        index = random.randrange(len(word))
+        return word[:index] + word[index + 1 :]
+
+    def run(self, specialties, count, repeat, limit):
+        random.seed(0)
+        users = User.objects.bulk_create(
+            [
+                User(
+                    phone=f"bench{i:010d}",
+                    password="!",
+                    first_name=self.name(),
+                    last_name=self.name(),
+                    role=User.Role.DOCTOR,
+                )
+                for i in range(count)
+            ],
+            batch_size=5000,
+        )
+        Doctor.objects.bulk_create(
+            [
+                Doctor(
+                    user=user,
+                    about="",
+                    education="",
+                    certificate="documents/certificates/benchmark.pdf",
+                )
+                for user in users
+            ],
+            batch_size=5000,
+        )
+        DoctorSpecialty.objects.bulk_create(
+            [
+                DoctorSpecialty(
+                    doctor_id=user.pk,
+                    specialty_id=random.choice(specialties)[0],
+                    university="Benchmark",
+                )
+                for user in users
+            ],
+            batch_size=5000,
+        )
+
+        started = timer.perf_counter()
+        refresh_doctor_search_documents([user.pk for user in users])
+        rebuild = timer.perf_counter() - started
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE users_customuser")
+            cursor.execute("ANALYZE doctors_doctor")
+
+        terms = []
+        for _ in range(repeat):
+            user = random.choice(users)
+            word = random.choice(
+                [user.first_name, user.last_name, random.choice(specialties)[1]]
+            )
+            terms.append(self.typo(word) if len(word) > 4 else word)
+
+        view = DoctorSearchListView()
+        search = TrigramSearchFilter()
+        factory = APIRequestFactory()
+
+        def similarity_scan(term):
+            return (
+                Doctor.objects.annotate(
+                    similarity=Greatest(
+                        TrigramSimilarity("user__first_name", term),
+                        TrigramSimilarity("user__last_name", term),
+                    )
+                )
+                .filter(similarity__gt=0.2)
+                .order_by("-similarity")
+            )
+
+        def indexed_search(term):
+            request = Request(factory.get("/", {search.search_param: term}))
+            return search.filter_queryset(request, Doctor.objects.all(), view)
+
+        scan = measure(
+            lambda term: list(
+                similarity_scan(term).values_list("pk", flat=True)[:limit]
+            ),
+            terms,
+        )
+        indexed = measure(
+            lambda term: list(
+                indexed_search(term).values_list("pk", flat=True)[:limit]
+            ),
+            terms,
+        )
+
+        self.stdout.write(f"doctors:           {Doctor.objects.count()}")
+        self.stdout.write(f"rebuild:           {rebuild * 1000:.1f} ms")
+        self.stdout.write(f"similarity scan:   {scan}")
+        self.stdout.write(f"trigram index:     {indexed}")
+        self.stdout.write(
+            indexed_search(terms[0]).values_list("pk", flat=True)[:limit].explain()
+        )
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from doctors.documents import refresh_doctor_documents
+
+
+class Command(BaseCommand):
+    help = (
+        "Renders again the card and detail documents of the doctors, e.g. "
+        "after loading fixtures or changing the doctor serializers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--doctor",
+            type=int,
+            action="append",
+            dest="doctors",
+            help="Doctor id to render, may be repeated; defaults to every doctor",
+        )
+
+    def handle(self, *args, **options):
+        documents = refresh_doctor_documents(options["doctors"])
+        self.stdout.write(self.style.SUCCESS(f"Rendered {documents} doctor documents."))
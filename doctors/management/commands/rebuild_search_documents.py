@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from doctors.services import (
+    refresh_doctor_search_documents,
+    refresh_specialty_search_documents,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the trigram search documents of the specialties and the "
+        "doctors, e.g. after loading fixtures."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--doctor",
+            type=int,
+            action="append",
+            dest="doctors",
+            help="Doctor id to rebuild, may be repeated; defaults to every specialty and doctor",
+        )
+
+    def handle(self, *args, **options):
+        if options["doctors"] is None:
+            specialties = refresh_specialty_search_documents()
+            self.stdout.write(f"Rebuilt {specialties} specialty search documents.")
+        doctors = refresh_doctor_search_documents(options["doctors"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {doctors} doctor search documents.")
+        )
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.1 on 2025-09-08 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("doctors", "0004_alter_doctor_rate_alter_historicaldoctor_rate"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="doctor",
+            name="rates_count",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                help_text="Number of patients who evaluated the doctor",
+                verbose_name="Number of Rates",
+            ),
+        ),
+        migrations.AddField(
+            model_name="doctor",
+            name="rates_sum",
+            field=models.FloatField(
+                default=0.0,
+                editable=False,
+                help_text="Sum of the average rates given by each patient",
+                verbose_name="Sum of Rates",
+            ),
+        ),
+        migrations.AddField(
+            model_name="historicaldoctor",
+            name="rates_count",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                help_text="Number of patients who evaluated the doctor",
+                verbose_name="Number of Rates",
+            ),
+        ),
+        migrations.AddField(
+            model_name="historicaldoctor",
+            name="rates_sum",
+            field=models.FloatField(
+                default=0.0,
+                editable=False,
+                help_text="Sum of the average rates given by each patient",
+                verbose_name="Sum of Rates",
+            ),
+        ),
+    ]
@@ -0,0 +1,107 @@
+# Generated by Django 5.2.1 on 2025-09-15 10:00
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+def join_names(*names):
+    return " ".join(name for name in names if name)
+
+
+def populate_search_documents(apps, schema_editor):
+    Doctor = apps.get_model("doctors", "Doctor")
+    DoctorSpecialty = apps.get_model("doctors", "DoctorSpecialty")
+    Specialty = apps.get_model("doctors", "Specialty")
+
+    specialties = list(Specialty.objects.only("name_en", "name_ar"))
+    for specialty in specialties:
+        specialty.search_document = join_names(specialty.name_en, specialty.name_ar)
+    Specialty.objects.bulk_update(specialties, ["search_document"], batch_size=1000)
+
+    names = {
+        pk: [first_name, last_name]
+        for pk, first_name, last_name in Doctor.objects.values_list(
+            "pk", "user__first_name", "user__last_name"
+        )
+    }
+    specialty_names = DoctorSpecialty.objects.order_by(
+        "doctor_id", "specialty_id"
+    ).values_list("doctor_id", "specialty__name_en", "specialty__name_ar")
+    for doctor_id, name_en, name_ar in specialty_names:
+        names[doctor_id] += [name_en, name_ar]
+    Doctor.objects.bulk_update(
+        [
+            Doctor(pk=pk, search_document=join_names(*doctor_names))
+            for pk, doctor_names in names.items()
+        ],
+        ["search_document"],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clinics", "0003_trigram_ext"),
+        ("doctors", "0005_doctor_rates_count_doctor_rates_sum_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="doctor",
+            name="search_document",
+            field=models.TextField(
+                default="",
+                editable=False,
+                help_text="Names and specialty names the doctor is searched by",
+                verbose_name="Search Document",
+            ),
+        ),
+        migrations.AddField(
+            model_name="historicaldoctor",
+            name="search_document",
+            field=models.TextField(
+                default="",
+                editable=False,
+                help_text="Names and specialty names the doctor is searched by",
+                verbose_name="Search Document",
+            ),
+        ),
+        migrations.AddField(
+            model_name="specialty",
+            name="search_document",
+            field=models.TextField(
+                default="",
+                editable=False,
+                help_text="Names the specialty is searched by",
+                verbose_name="Search Document",
+            ),
+        ),
+        migrations.AddField(
+            model_name="historicalspecialty",
+            name="search_document",
+            field=models.TextField(
+                default="",
+                editable=False,
+                help_text="Names the specialty is searched by",
+                verbose_name="Search Document",
+            ),
+        ),
+        migrations.RunPython(populate_search_documents, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="doctor",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_document"],
+                name="doctor_search_document_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="specialty",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_document"],
+                name="specialty_search_document_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
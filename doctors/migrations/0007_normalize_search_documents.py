@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2025-09-16 10:00
+
+from django.db import migrations
+
+from common.normalization import normalize_search_text
+
+
+def normalize_search_documents(apps, schema_editor):
+    for model_name in ["Doctor", "Specialty"]:
+        Model = apps.get_model("doctors", model_name)
+        rows = list(Model.objects.only("search_document"))
+        for row in rows:
+            row.search_document = normalize_search_text(row.search_document)
+        Model.objects.bulk_update(rows, ["search_document"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("doctors", "0006_doctor_search_document_specialty_search_document_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_search_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,106 @@
+# Generated by Django 5.2.1 on 2025-09-18 10:00
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_doctor_specialties(apps, schema_editor):
+    Doctor = apps.get_model("doctors", "Doctor")
+    DoctorSpecialty = apps.get_model("doctors", "DoctorSpecialty")
+    MainSpecialtySubspecialty = apps.get_model("doctors", "MainSpecialtySubspecialty")
+
+    subspecialty_ids = set(
+        MainSpecialtySubspecialty.objects.values_list("subspecialty_id", flat=True)
+    )
+    doctors = {
+        pk: Doctor(pk=pk, main_doctor_specialty=None, specialty_ids=[])
+        for pk in Doctor.objects.values_list("pk", flat=True)
+    }
+    doctor_specialties = DoctorSpecialty.objects.order_by(
+        "doctor_id", "-created_at"
+    ).values_list("pk", "doctor_id", "specialty_id")
+    for pk, doctor_id, specialty_id in doctor_specialties:
+        doctor = doctors[doctor_id]
+        doctor.specialty_ids.append(specialty_id)
+        if (
+            doctor.main_doctor_specialty_id is None
+            and specialty_id not in subspecialty_ids
+        ):
+            doctor.main_doctor_specialty_id = pk
+    for doctor in doctors.values():
+        doctor.specialty_ids.sort()
+    Doctor.objects.bulk_update(
+        doctors.values(), ["main_doctor_specialty", "specialty_ids"], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("doctors", "0007_normalize_search_documents"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="doctor",
+            name="main_doctor_specialty",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="doctors.doctorspecialty",
+                verbose_name="Main Specialty",
+            ),
+        ),
+        migrations.AddField(
+            model_name="doctor",
+            name="specialty_ids",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.BigIntegerField(),
+                blank=True,
+                default=list,
+                editable=False,
+                help_text="IDs of the main specialty and the subspecialties of the doctor",
+                size=None,
+                verbose_name="Specialty IDs",
+            ),
+        ),
+        migrations.AddField(
+            model_name="historicaldoctor",
+            name="main_doctor_specialty",
+            field=models.ForeignKey(
+                blank=True,
+                db_constraint=False,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="+",
+                to="doctors.doctorspecialty",
+                verbose_name="Main Specialty",
+            ),
+        ),
+        migrations.AddField(
+            model_name="historicaldoctor",
+            name="specialty_ids",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.BigIntegerField(),
+                blank=True,
+                default=list,
+                editable=False,
+                help_text="IDs of the main specialty and the subspecialties of the doctor",
+                size=None,
+                verbose_name="Specialty IDs",
+            ),
+        ),
+        migrations.RunPython(populate_doctor_specialties, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="doctor",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["specialty_ids"], name="doctor_specialty_ids_gin"
+            ),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.1 on 2025-09-20 10:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("doctors", "0008_doctor_main_doctor_specialty_doctor_specialty_ids_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DoctorDocument",
+            fields=[
+                (
+                    "doctor",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="document",
+                        serialize=False,
+                        to="doctors.doctor",
+                        verbose_name="Doctor",
+                    ),
+                ),
+                ("card", models.JSONField(verbose_name="Card")),
+                ("detail", models.JSONField(verbose_name="Detail")),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Updated At"),
+                ),
+            ],
+            options={
+                "verbose_name": "Doctor Document",
+                "verbose_name_plural": "Doctor Documents",
+            },
+        ),
+    ]
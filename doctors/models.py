@@ -1,10 +1,11 @@
 from django.db import models
-from django.db.models import BooleanField, Exists, OuterRef, Value
 from django.conf import settings
 from django.contrib.gis.geos import Point
 from django.contrib.gis.db.models.functions import Distance
 from django.utils.translation import gettext_lazy as _
 from django.contrib import admin
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 
 from simple_history.models import HistoricalRecords
 
@@ -33,26 +34,36 @@ class DoctorQuerySet(models.QuerySet):
         )
 
     def with_categorized_specialties(self):
+        from .registry import specialty_registry
+
+        main_specialty_ids = specialty_registry.main_specialty_ids()
         return self.prefetch_related(
             models.Prefetch(
                 "doctor_specialties",
-                queryset=DoctorSpecialty.objects.select_related("specialty")
-                .filter(specialty__main_specialties__isnull=True)
-                .distinct(),
+                queryset=DoctorSpecialty.objects.select_related("specialty").filter(
+                    specialty_id__in=main_specialty_ids
+                ),
                 to_attr="main_specialties",
             ),
             models.Prefetch(
                 "doctor_specialties",
-                queryset=DoctorSpecialty.objects.select_related("specialty")
-                .filter(specialty__main_specialties__isnull=False)
-                .distinct(),
+                queryset=DoctorSpecialty.objects.select_related("specialty").exclude(
+                    specialty_id__in=main_specialty_ids
+                ),
                 to_attr="subspecialties",
             ),
         )
 
+    def with_main_specialty(self):
+        return self.select_related("main_doctor_specialty__specialty")
+
     def with_full_profile(self):
         return (
-            self.with_clinic().not_deleted().approved().with_categorized_specialties()
+            self.with_user()
+            .with_clinic()
+            .not_deleted()
+            .approved()
+            .with_main_specialty()
         )
 
     def with_clinic_appointments(self):
@@ -63,18 +74,6 @@ class DoctorQuerySet(models.QuerySet):
     def with_archives(self):
         return self.prefetch_related(models.Prefetch("archives"))
 
-    def with_is_favorite_for_patient(self, patient_id: int | None):
-        if not patient_id:
-            return self.annotate(is_favorite=Value(False, output_field=BooleanField()))
-
-        from favorites.models import Favorite
-
-        favorite_exists = Favorite.objects.filter(
-            doctor_id=OuterRef("pk"),
-            patient_id=patient_id,
-        )
-        return self.annotate(is_favorite=Exists(favorite_exists))
-
     def with_clinic_distance(self, latitude, longitude):
         location = Point(longitude, latitude, srid=4326)
         return self.annotate(clinic_distance=Distance("clinic__location", location))
@@ -118,6 +117,41 @@ class Doctor(models.Model):
         verbose_name=_("Specialties"),
     )
     rate = models.DecimalField(max_digits=2, decimal_places=1, default=0.0, verbose_name=_("Rate"))
+    rates_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_("Number of Rates"),
+        help_text=_("Number of patients who evaluated the doctor"),
+    )
+    rates_sum = models.FloatField(
+        default=0.0,
+        editable=False,
+        verbose_name=_("Sum of Rates"),
+        help_text=_("Sum of the average rates given by each patient"),
+    )
+    search_document = models.TextField(
+        default="",
+        editable=False,
+        verbose_name=_("Search Document"),
+        help_text=_("Names and specialty names the doctor is searched by"),
+    )
+    main_doctor_specialty = models.ForeignKey(
+        "doctors.DoctorSpecialty",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+",
+        verbose_name=_("Main Specialty"),
+    )
+    specialty_ids = ArrayField(
+        models.BigIntegerField(),
+        default=list,
+        blank=True,
+        editable=False,
+        verbose_name=_("Specialty IDs"),
+        help_text=_("IDs of the main specialty and the subspecialties of the doctor"),
+    )
 
     history = HistoricalRecords(cascade_delete_history=True)
 
@@ -136,38 +170,31 @@ class Doctor(models.Model):
     @property
     def main_specialty(self) -> "DoctorSpecialty|None":
         if hasattr(self, "main_specialties"):
-            return self.main_specialties[0]
+            return next(iter(self.main_specialties), None)
 
-        if hasattr(self, "_main_specialty"):
-            return self._main_specialty
-
-        self._main_specialty = (
-            DoctorSpecialty.objects.with_specialty()
-            .main_specialties_only()
-            .filter(doctor_id=self.pk)
-            .first()
-        )
-        return self._main_specialty
+        # Kept current by `refresh_doctor_specialties`
+        return self.main_doctor_specialty
 
     @property
     def rates(self):
-        if hasattr(self, "_rates"):
-            return self._rates
-
-        from evaluations.models import Evaluation
-
-        self._rates = (
-            Evaluation.objects.by_clinic(self.pk)
-            .values("patient_id")
-            .distinct()
-            .count()
-        )
-        return self._rates
+        """
+        Number of patients who evaluated the doctor, kept up to date together
+        with the rate so listings need no query per doctor.
+        """
+        return self.rates_count
 
     class Meta:
         verbose_name = _("Doctor")
         verbose_name_plural = _("Doctors")
-        indexes = [models.Index(fields=["start_work_date"])]
+        indexes = [
+            models.Index(fields=["start_work_date"]),
+            GinIndex(
+                fields=["search_document"],
+                opclasses=["gin_trgm_ops"],
+                name="doctor_search_document_trgm",
+            ),
+            GinIndex(fields=["specialty_ids"], name="doctor_specialty_ids_gin"),
+        ]
         ordering = ["start_work_date"]
 
     def __str__(self):
@@ -179,10 +206,14 @@ class SpecialtyQuerySet(models.QuerySet):
         return self.prefetch_related("main_specialties")
 
     def main_specialties_only(self):
-        return self.filter(main_specialties__isnull=True).distinct()
+        from .registry import specialty_registry
+
+        return self.filter(pk__in=specialty_registry.main_specialty_ids())
 
     def subspecialties_only(self):
-        return self.filter(main_specialties__isnull=False).distinct()
+        from .registry import specialty_registry
+
+        return self.filter(pk__in=specialty_registry.subspecialty_ids())
 
     def main_specialties_with_their_subspecialties(self):
         return self.main_specialties_only().prefetch_related("subspecialties")
@@ -246,6 +277,12 @@ class Specialty(models.Model):
         blank=True,
         verbose_name=_("Subspecialties"),
     )
+    search_document = models.TextField(
+        default="",
+        editable=False,
+        verbose_name=_("Search Document"),
+        help_text=_("Names the specialty is searched by"),
+    )
 
     history = HistoricalRecords(cascade_delete_history=True)
 
@@ -255,6 +292,13 @@ class Specialty(models.Model):
         constraints = [
             models.UniqueConstraint(fields=["name_en", "name_ar"], name="unique_name"),
         ]
+        indexes = [
+            GinIndex(
+                fields=["search_document"],
+                opclasses=["gin_trgm_ops"],
+                name="specialty_search_document_trgm",
+            ),
+        ]
         verbose_name = _("Specialty")
         verbose_name_plural = _("Specialties")
 
@@ -263,14 +307,33 @@ class Specialty(models.Model):
 
 
 class DoctorSpecialtyQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        # bulk_create sends no post_save, so the doctors' columns are refreshed here
+        from .documents import refresh_doctor_documents
+        from .services import (
+            refresh_doctor_search_documents,
+            refresh_doctor_specialties,
+        )
+
+        doctor_ids = {obj.doctor_id for obj in objs}
+        refresh_doctor_specialties(doctor_ids)
+        refresh_doctor_search_documents(doctor_ids)
+        refresh_doctor_documents(doctor_ids)
+        return objs
+
     def with_specialty(self):
         return self.select_related("specialty")
 
     def main_specialties_only(self):
-        return self.filter(specialty__main_specialties__isnull=True)
+        from .registry import specialty_registry
+
+        return self.filter(specialty_id__in=specialty_registry.main_specialty_ids())
 
     def subspecialties_only(self):
-        return self.filter(specialty__main_specialties__isnull=False)
+        from .registry import specialty_registry
+
+        return self.filter(specialty_id__in=specialty_registry.subspecialty_ids())
 
     def with_doctor(self):
         return self.select_related("doctor")
@@ -342,3 +405,31 @@ class Achievement(models.Model):
 
     def __str__(self):
         return self.title
+
+
+class DoctorDocument(models.Model):
+    """
+    Read model of a doctor: its card, as doctor listings show it, and its
+    detailed profile rendered once per change instead of on every request.
+
+    Kept current by `refresh_doctor_documents`; the rendered image URLs are
+    relative and the per-user fields are left out.
+    """
+
+    doctor = models.OneToOneField(
+        Doctor,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="document",
+        verbose_name=_("Doctor"),
+    )
+    card = models.JSONField(verbose_name=_("Card"))
+    detail = models.JSONField(verbose_name=_("Detail"))
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Updated At"))
+
+    class Meta:
+        verbose_name = _("Doctor Document")
+        verbose_name_plural = _("Doctor Documents")
+
+    def __str__(self):
+        return str(self.doctor_id)
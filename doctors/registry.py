@@ -0,0 +1,108 @@
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .models import Specialty
+
+
+class SpecialtyRegistry:
+    """
+    In-process copy of the specialty tree: every specialty with its
+    subspecialties and main specialties prefetched, and the ids of the main
+    specialties and of the subspecialties.
+
+    The tree is loaded on first use in each process and reloaded when the
+    version key in the cache changes, which `invalidate` does on every
+    specialty change. The version is checked at most once every
+    SPECIALTY_REGISTRY_CHECK_INTERVAL seconds.
+
+    The instances are shared between requests and must not be modified.
+    """
+
+    version_key = "doctors:specialties:version"
+
+    def __init__(self, cache_alias="default"):
+        self.cache_alias = cache_alias
+        self.lock = threading.Lock()
+        self.state = None
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def get_version(self):
+        version = self.cache.get(self.version_key)
+        if version is None:
+            self.cache.add(self.version_key, uuid.uuid4().hex, timeout=None)
+            version = self.cache.get(self.version_key)
+        return version
+
+    def load(self):
+        specialties = {
+            specialty.pk: specialty
+            for specialty in Specialty.objects.prefetch_related(
+                "subspecialties", "main_specialties"
+            ).order_by("pk")
+        }
+        main_specialty_ids = frozenset(
+            pk
+            for pk, specialty in specialties.items()
+            if not specialty.main_specialties.all()
+        )
+        return {
+            "specialties": specialties,
+            "main_specialty_ids": main_specialty_ids,
+            "subspecialty_ids": frozenset(specialties.keys() - main_specialty_ids),
+        }
+
+    def get_tree(self):
+        state = self.state
+        now = time.monotonic()
+        if (
+            state
+            and now - state["checked_at"] < settings.SPECIALTY_REGISTRY_CHECK_INTERVAL
+        ):
+            return state["tree"]
+
+        with self.lock:
+            state = self.state
+            version = self.get_version()
+            if state and state["version"] == version:
+                state["checked_at"] = now
+                return state["tree"]
+            # Read before loading, so a change during the load reloads again
+            self.state = {"version": version, "checked_at": now, "tree": self.load()}
+            return self.state["tree"]
+
+    def invalidate(self):
+        self.state = None
+        self.cache.set(self.version_key, uuid.uuid4().hex, timeout=None)
+
+    def get(self, pk) -> Specialty | None:
+        return self.get_tree()["specialties"].get(pk)
+
+    def main_specialties(self) -> list[Specialty]:
+        tree = self.get_tree()
+        return [tree["specialties"][pk] for pk in sorted(tree["main_specialty_ids"])]
+
+    def main_specialty_ids(self) -> frozenset[int]:
+        return self.get_tree()["main_specialty_ids"]
+
+    def subspecialty_ids(self) -> frozenset[int]:
+        return self.get_tree()["subspecialty_ids"]
+
+    def is_main_specialty(self, pk) -> bool:
+        return pk in self.main_specialty_ids()
+
+    def is_subspecialty_of(self, pk, main_specialty_pk) -> bool:
+        specialty = self.get(pk)
+        return specialty is not None and any(
+            main_specialty.pk == main_specialty_pk
+            for main_specialty in specialty.main_specialties.all()
+        )
+
+
+specialty_registry = SpecialtyRegistry()
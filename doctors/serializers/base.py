@@ -3,6 +3,7 @@ from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
 from doctors.models import Doctor, Specialty, DoctorSpecialty
+from doctors.registry import specialty_registry
 from users.serializers import UserSerializer
 
 from .specialty import SpecialtySerializer
@@ -47,7 +48,9 @@ class DoctorSerializer(serializers.ModelSerializer):
     def validate_subspecialties(self, value):
         doctor: Doctor = self.instance
         main_specialty = doctor.main_specialty.specialty
-        valid_subspecialties_for_main = set(main_specialty.subspecialties.all())
+        valid_subspecialties_for_main = set(
+            specialty_registry.get(main_specialty.pk).subspecialties.all()
+        )
         if len(value) > len(valid_subspecialties_for_main):
             raise serializers.ValidationError(
                 _(
@@ -60,10 +63,12 @@ class DoctorSerializer(serializers.ModelSerializer):
             if specialty.pk in seen_specialty_pks:
                 raise serializers.ValidationError(_("Duplicate is not allowed."))
             seen_specialty_pks.add(specialty.pk)
-            if not specialty.main_specialties.exists():
+            if specialty.pk not in specialty_registry.subspecialty_ids():
                 msg = _('Specialty "%(value)s" - is not a subspecialty.')
                 raise serializers.ValidationError(_(msg % {"value": specialty.pk}))
-            if not specialty.main_specialties.filter(pk=main_specialty.pk).exists():
+            if not specialty_registry.is_subspecialty_of(
+                specialty.pk, main_specialty.pk
+            ):
                 msg = _(
                     'Subspecialty "%(value)s" - is not a branch of the main specialty.'
                 )
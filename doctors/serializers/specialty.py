@@ -18,3 +18,9 @@ class SpecialtyListSerializer(serializers.ModelSerializer):
     class Meta:
         model = Specialty
         fields = ["id", "name_en", "name_ar", "image", "subspecialties"]
+
+
+class MainSpecialtyPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    # Resolved per request, the main specialties change at runtime
+    def get_queryset(self):
+        return Specialty.objects.main_specialties_only()
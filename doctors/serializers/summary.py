@@ -34,6 +34,7 @@ class DoctorHighestRatedSerializer(serializers.ModelSerializer):
     is_favorite = serializers.BooleanField(read_only=True)
     appointment = serializers.JSONField(read_only=True)
     clinic_distance = serializers.IntegerField(read_only=True)
+    is_approximate_distance = serializers.BooleanField(read_only=True)
 
     class Meta:
         model = Doctor
@@ -46,4 +47,5 @@ class DoctorHighestRatedSerializer(serializers.ModelSerializer):
             "is_favorite",
             "appointment",
             "clinic_distance",
+            "is_approximate_distance",
         ]
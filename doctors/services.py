@@ -0,0 +1,184 @@
+from django.db import transaction
+from django.db.models import FloatField, Value
+
+from common.normalization import normalize_search_text
+
+from .models import Doctor, DoctorSpecialty, Specialty
+from .registry import specialty_registry
+
+
+def build_search_document(*names):
+    """
+    Joins the names a row is searched by into the normalized text indexed
+    for trigram search.
+    """
+    return normalize_search_text(" ".join(name for name in names if name))
+
+
+def doctor_id_batches(doctor_ids=None, batch_size=1000):
+    """
+    Yields the ids of the given doctors, or of all doctors when doctor_ids
+    is None, in ascending batches of at most batch_size.
+    """
+    doctors = Doctor.objects.order_by("pk")
+    if doctor_ids is not None:
+        doctors = doctors.filter(pk__in=doctor_ids)
+
+    last_pk = None
+    while True:
+        batch = doctors if last_pk is None else doctors.filter(pk__gt=last_pk)
+        pks = list(batch.values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            return
+        yield pks
+        last_pk = pks[-1]
+
+
+def refresh_doctor_search_documents(doctor_ids=None, batch_size=1000):
+    """
+    Rebuilds the search documents of the given doctors from their names and
+    the English and Arabic names of their specialties; all doctors are
+    rebuilt when doctor_ids is None.
+
+    Returns the number of rebuilt documents.
+    """
+    refreshed = 0
+    for pks in doctor_id_batches(doctor_ids, batch_size):
+        names = {
+            pk: [first_name, last_name]
+            for pk, first_name, last_name in Doctor.objects.filter(
+                pk__in=pks
+            ).values_list("pk", "user__first_name", "user__last_name")
+        }
+        specialties = (
+            DoctorSpecialty.objects.filter(doctor_id__in=pks)
+            .order_by("doctor_id", "specialty_id")
+            .values_list("doctor_id", "specialty__name_en", "specialty__name_ar")
+        )
+        for doctor_id, name_en, name_ar in specialties:
+            names[doctor_id] += [name_en, name_ar]
+
+        with transaction.atomic():
+            Doctor.objects.bulk_update(
+                [
+                    Doctor(pk=pk, search_document=build_search_document(*doctor_names))
+                    for pk, doctor_names in names.items()
+                ],
+                ["search_document"],
+            )
+        refreshed += len(names)
+    return refreshed
+
+
+def refresh_doctor_specialties(doctor_ids=None, batch_size=1000):
+    """
+    Recomputes the main specialty and the specialty ids stored on the given
+    doctors from their specialties; all doctors are recomputed when
+    doctor_ids is None.
+
+    The main specialty is the most recently added of the doctor's
+    specialties that is a main specialty.
+
+    Returns the number of recomputed doctors.
+    """
+    main_specialty_ids = specialty_registry.main_specialty_ids()
+    refreshed = 0
+    for pks in doctor_id_batches(doctor_ids, batch_size):
+        doctors = {
+            pk: Doctor(pk=pk, main_doctor_specialty=None, specialty_ids=[])
+            for pk in pks
+        }
+        doctor_specialties = (
+            DoctorSpecialty.objects.filter(doctor_id__in=pks)
+            .order_by("doctor_id", "-created_at")
+            .values_list("pk", "doctor_id", "specialty_id")
+        )
+        for pk, doctor_id, specialty_id in doctor_specialties:
+            doctor = doctors[doctor_id]
+            doctor.specialty_ids.append(specialty_id)
+            if (
+                doctor.main_doctor_specialty_id is None
+                and specialty_id in main_specialty_ids
+            ):
+                doctor.main_doctor_specialty_id = pk
+
+        for doctor in doctors.values():
+            doctor.specialty_ids.sort()
+        with transaction.atomic():
+            Doctor.objects.bulk_update(
+                doctors.values(), ["main_doctor_specialty", "specialty_ids"]
+            )
+        refreshed += len(doctors)
+    return refreshed
+
+
+def refresh_specialty_search_documents(specialty_ids=None):
+    """
+    Rebuilds the search documents of the given specialties, or of all of
+    them when specialty_ids is None.
+
+    Returns the number of rebuilt documents.
+    """
+    specialties = Specialty.objects.only("name_en", "name_ar")
+    if specialty_ids is not None:
+        specialties = specialties.filter(pk__in=specialty_ids)
+
+    specialties = list(specialties)
+    for specialty in specialties:
+        specialty.search_document = build_search_document(
+            specialty.name_en, specialty.name_ar
+        )
+    Specialty.objects.bulk_update(specialties, ["search_document"], batch_size=1000)
+    return len(specialties)
+
+
+def balance_multi_search(doctor_count, specialty_count, max_total=10):
+    """
+    Splits max_total results evenly between doctors and specialties, giving
+    the share one side cannot fill to the other, doctors first, without
+    exceeding the number of results of either side.
+
+    Returns (number of doctors, number of specialties).
+    """
+    half = max_total // 2
+    max_doctors = min(doctor_count, half)
+    max_specialties = min(specialty_count, half)
+
+    remaining = max_total - (max_doctors + max_specialties)
+    extra_doctors = min(remaining, doctor_count - max_doctors)
+    max_doctors += extra_doctors
+    max_specialties += min(remaining - extra_doctors, specialty_count - max_specialties)
+    return max_doctors, max_specialties
+
+
+def multi_search(doctors, specialties, max_total=10):
+    """
+    Picks the balanced mix of the best doctors and specialties of the given
+    (filtered) querysets, ordered by their `similarity` annotation when
+    present, with a single UNION ALL of the top max_total of each.
+
+    Returns (doctor ids, specialty ids), best first.
+    """
+
+    def top(queryset, kind):
+        if "similarity" not in queryset.query.annotations:
+            queryset = queryset.annotate(
+                similarity=Value(0.0, output_field=FloatField())
+            )
+        return (
+            queryset.prefetch_related(None)
+            .annotate(kind=Value(kind))
+            .order_by("-similarity", "pk")
+            .values_list("pk", "similarity", "kind")[:max_total]
+        )
+
+    rows = top(doctors, "doctor").union(top(specialties, "specialty"), all=True)
+    ids = {"doctor": [], "specialty": []}
+    # UNION ALL does not guarantee the order of its branches
+    for pk, _, kind in sorted(rows, key=lambda row: (-row[1], row[0])):
+        ids[kind].append(pk)
+
+    max_doctors, max_specialties = balance_multi_search(
+        len(ids["doctor"]), len(ids["specialty"]), max_total
+    )
+    return ids["doctor"][:max_doctors], ids["specialty"][:max_specialties]
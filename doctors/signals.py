@@ -0,0 +1,119 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from clinics.models import Clinic
+from users.models import CustomUser as User
+from .documents import refresh_doctor_documents
+from .models import Doctor, DoctorSpecialty, MainSpecialtySubspecialty, Specialty
+from .registry import specialty_registry
+from .services import (
+    build_search_document,
+    refresh_doctor_search_documents,
+    refresh_doctor_specialties,
+)
+
+# User fields rendered in the doctor documents or indexed for search
+DOCUMENT_USER_FIELDS = {"first_name", "last_name", "phone", "image", "gender"}
+
+
+@receiver(post_save, sender=Doctor)
+def index_saved_doctor(sender, instance, raw, **kwargs):
+    # The saved instance may carry columns older than what they are built from
+    if not raw:
+        refresh_doctor_specialties([instance.pk])
+        refresh_doctor_search_documents([instance.pk])
+
+
+@receiver(post_save, sender=Doctor)
+def render_doctor_document(sender, instance, raw, **kwargs):
+    if not raw:
+        refresh_doctor_documents([instance.pk])
+
+
+@receiver(post_save, sender=User)
+def reindex_renamed_doctor(sender, instance, created, raw, update_fields, **kwargs):
+    # New users have no doctor profile yet; it is indexed when created
+    if created or raw or instance.role != User.Role.DOCTOR:
+        return
+    # Saves of other fields only, like last_login at sign in, change nothing indexed
+    if update_fields is not None and not update_fields & DOCUMENT_USER_FIELDS:
+        return
+    refresh_doctor_search_documents([instance.pk])
+    refresh_doctor_documents([instance.pk])
+
+
+@receiver(post_save, sender=Clinic)
+@receiver(post_delete, sender=Clinic)
+def render_clinic_doctor_document(sender, instance, raw=False, **kwargs):
+    if not raw:
+        refresh_doctor_documents([instance.doctor_id])
+
+
+@receiver(post_save, sender=DoctorSpecialty)
+@receiver(post_delete, sender=DoctorSpecialty)
+def reindex_doctor_specialties(sender, instance, raw=False, **kwargs):
+    if not raw:
+        refresh_doctor_specialties([instance.doctor_id])
+        refresh_doctor_search_documents([instance.doctor_id])
+        refresh_doctor_documents([instance.doctor_id])
+
+
+@receiver(pre_save, sender=Specialty)
+def build_specialty_search_document(sender, instance, raw, **kwargs):
+    instance.search_document = build_search_document(instance.name_en, instance.name_ar)
+
+
+@receiver(post_save, sender=Specialty)
+def reindex_specialty_doctors(sender, instance, created, raw, **kwargs):
+    if not created and not raw:
+        doctor_ids = DoctorSpecialty.objects.filter(specialty=instance).values(
+            "doctor_id"
+        )
+        refresh_doctor_search_documents(doctor_ids)
+        refresh_doctor_documents(doctor_ids)
+
+
+@receiver(post_save, sender=Specialty)
+@receiver(post_delete, sender=Specialty)
+@receiver(post_save, sender=MainSpecialtySubspecialty)
+@receiver(post_delete, sender=MainSpecialtySubspecialty)
+@receiver(m2m_changed, sender=Specialty.subspecialties.through)
+def invalidate_specialty_registry(sender, **kwargs):
+    # Again on commit, as other processes may reload the old tree until then
+    specialty_registry.invalidate()
+    transaction.on_commit(specialty_registry.invalidate)
+
+
+def recategorize_doctors(specialty_ids):
+    # Whether a specialty is a main one may have changed for their doctors
+    doctor_ids = DoctorSpecialty.objects.filter(specialty_id__in=specialty_ids).values(
+        "doctor_id"
+    )
+    refresh_doctor_specialties(doctor_ids)
+    refresh_doctor_documents(doctor_ids)
+
+
+@receiver(post_save, sender=MainSpecialtySubspecialty)
+@receiver(post_delete, sender=MainSpecialtySubspecialty)
+def recategorize_subspecialty_doctors(sender, instance, raw=False, **kwargs):
+    if not raw:
+        recategorize_doctors([instance.subspecialty_id])
+
+
+@receiver(m2m_changed, sender=Specialty.subspecialties.through)
+def recategorize_changed_subspecialty_doctors(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if action == "pre_clear":
+        # The cleared subspecialties are not known after the clear
+        if reverse:
+            instance._cleared_subspecialty_ids = [instance.pk]
+        else:
+            instance._cleared_subspecialty_ids = list(
+                instance.subspecialties.values_list("pk", flat=True)
+            )
+    elif action == "post_clear":
+        recategorize_doctors(getattr(instance, "_cleared_subspecialty_ids", []))
+    elif action in ("post_add", "post_remove"):
+        recategorize_doctors([instance.pk] if reverse else pk_set)
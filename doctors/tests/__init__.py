@@ -2,4 +2,11 @@ from .test_doctor_login import *
 from .test_doctor_create import *
 from .test_doctor_retrieve import *
 from .test_doctor_update import *
-from .test_specialty import *
\ No newline at end of file
+from .test_specialty import *
+from .test_doctor_list_queries import *
+from .test_doctor_search_distance import *
+from .test_doctor_search import *
+from .test_doctor_multi_search import *
+from .test_specialty_registry import *
+from .test_doctor_main_specialty import *
+from .test_doctor_documents import *
\ No newline at end of file
@@ -0,0 +1,158 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth.models import update_last_login
+from django.contrib.gis.geos import Point
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from clinics.models import Clinic
+from common.utils import generate_test_pdf
+from doctors.models import Doctor, DoctorDocument, DoctorSpecialty, Specialty
+from doctors.registry import SpecialtyRegistry
+from favorites.models import Favorite
+from patients.models import Patient
+from users.models import CustomUser as User
+
+
+@override_settings(SPECIALTY_REGISTRY_CHECK_INTERVAL=0)
+class DoctorDocumentTests(APITestCase):
+    def setUp(self):
+        cache_patcher = patch.object(
+            SpecialtyRegistry, "cache", LocMemCache(self.id(), {})
+        )
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+
+        self.main_specialty = Specialty.objects.create(
+            name_en="Cardiology", name_ar="قلبية"
+        )
+        self.subspecialty = Specialty.objects.create(
+            name_en="Pediatric Cardiology", name_ar="قلبية أطفال"
+        )
+        self.subspecialty.main_specialties.add(self.main_specialty)
+
+        self.user = User.objects.create_user(
+            phone="0988200001",
+            password="abcX123!",
+            first_name="doctor",
+            last_name="user",
+            role=User.Role.DOCTOR.value,
+            is_verified_phone=True,
+            gender="female",
+            birth_date="1990-05-01",
+        )
+        self.doctor = Doctor.objects.create(
+            user=self.user,
+            about="About Test",
+            education="Test",
+            certificate=generate_test_pdf(),
+            start_work_date=timezone.now().date() - timedelta(days=400),
+            status=Doctor.Status.APPROVED.value,
+        )
+        DoctorSpecialty.objects.create(
+            doctor=self.doctor, specialty=self.main_specialty, university="Damascus"
+        )
+        DoctorSpecialty.objects.create(
+            doctor=self.doctor, specialty=self.subspecialty, university="Damascus"
+        )
+        Clinic.objects.create(
+            doctor=self.doctor,
+            address="Test Street",
+            location=Point(36.3, 33.5, srid=4326),
+            phone="011 223 3333",
+        )
+
+        self.patient_user = User.objects.create_user(
+            phone="0999200002",
+            password="abcX123!",
+            first_name="patient",
+            last_name="user",
+            role=User.Role.PATIENT.value,
+            is_verified_phone=True,
+            gender="male",
+            birth_date="1995-05-01",
+        )
+        self.patient = Patient.objects.create(
+            user=self.patient_user,
+            address="Damascus",
+            location=Point(36.29, 33.51, srid=4326),
+            job="Engineer",
+            blood_type="A+",
+            medical_history="",
+            surgical_history="",
+            allergies="",
+            medicines="",
+            is_smoker=False,
+            is_drinker=False,
+            is_married=False,
+        )
+        self.detail_path = reverse(
+            "doctor-detail-retrieve", kwargs={"pk": self.doctor.pk}
+        )
+
+    def retrieve_live(self):
+        # The detail as rendered without the document
+        DoctorDocument.objects.all().delete()
+        response = self.client.get(self.detail_path)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_detail_matches_the_live_rendering(self):
+        self.client.force_authenticate(self.patient_user)
+        Favorite.objects.create(patient=self.patient, doctor=self.doctor)
+
+        response = self.client.get(self.detail_path)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["is_favorite"])
+        self.assertEqual(response.data["experience"], 1)
+        self.assertEqual(response.data, self.retrieve_live())
+
+    def test_document_follows_the_doctor_changes(self):
+        self.user.first_name = "renamed"
+        self.user.save()
+        self.subspecialty.name_en = "Heart Surgery"
+        self.subspecialty.save()
+
+        response = self.client.get(self.detail_path)
+
+        self.assertEqual(response.data["user"]["first_name"], "renamed")
+        self.assertEqual(
+            response.data["subspecialties"][0]["specialty"]["name_en"], "Heart Surgery"
+        )
+        self.assertNotIn("is_favorite", response.data)
+
+    def test_sign_in_does_not_render_the_document(self):
+        with patch(
+            "doctors.signals.refresh_doctor_documents"
+        ) as refresh_doctor_documents:
+            update_last_login(None, self.user)
+
+        refresh_doctor_documents.assert_not_called()
+
+    def test_doctor_without_clinic_has_no_document(self):
+        self.assertTrue(DoctorDocument.objects.filter(pk=self.doctor.pk).exists())
+
+        self.doctor.clinic.delete()
+
+        self.assertFalse(DoctorDocument.objects.filter(pk=self.doctor.pk).exists())
+
+    def test_newest_cards_overlay_is_favorite(self):
+        self.client.force_authenticate(self.patient_user)
+        Favorite.objects.create(patient=self.patient, doctor=self.doctor)
+
+        response = self.client.get(reverse("doctor-newest-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]["user"]["id"], self.doctor.pk)
+        self.assertEqual(
+            response.data[0]["main_specialty"]["specialty"]["id"],
+            self.main_specialty.pk,
+        )
+        self.assertEqual(response.data[0]["address"], "Test Street")
+        self.assertTrue(response.data[0]["is_favorite"])
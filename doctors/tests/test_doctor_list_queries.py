@@ -0,0 +1,129 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.gis.geos import Point
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from clinics.models import Clinic
+from common.utils import generate_test_pdf
+from doctors.models import Doctor, DoctorSpecialty, Specialty
+from favorites.models import Favorite
+from patients.models import Patient
+from users.models import CustomUser as User
+
+
+class DoctorListQueriesTests(APITestCase):
+    """
+    Every doctor listing must cost the same number of queries whatever the
+    number of doctors on the page.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.patient_user = User.objects.create_user(
+            phone="0999111122",
+            password="abcX123!",
+            first_name="patient",
+            last_name="user",
+            role=User.Role.PATIENT.value,
+            is_verified_phone=True,
+            gender="male",
+            birth_date="1995-05-01",
+        )
+        cls.patient = Patient.objects.create(
+            user=cls.patient_user,
+            address="Damascus",
+            location=Point(36.29, 33.51, srid=4326),
+            job="Engineer",
+            blood_type="A+",
+            medical_history="",
+            surgical_history="",
+            allergies="",
+            medicines="",
+            is_smoker=False,
+            is_drinker=False,
+            is_married=False,
+        )
+        cls.main_specialty = Specialty.objects.create(
+            name_en="Test1", name_ar="تجريبي1"
+        )
+        cls.doctors_count = 0
+
+    def create_doctors(self, count):
+        for _ in range(count):
+            type(self).doctors_count += 1
+            user = User.objects.create_user(
+                phone=f"09881{self.doctors_count:05d}",
+                password="abcX123!",
+                first_name="doctor",
+                last_name=f"user{self.doctors_count}",
+                role=User.Role.DOCTOR.value,
+                is_verified_phone=True,
+                gender="female",
+                birth_date="1990-05-01",
+            )
+            doctor = Doctor.objects.create(
+                user=user,
+                about="About Test",
+                education="Test",
+                certificate=generate_test_pdf(),
+                start_work_date=timezone.now().date() - timedelta(days=30),
+                status=Doctor.Status.APPROVED.value,
+                rates_count=self.doctors_count,
+            )
+            DoctorSpecialty.objects.create(
+                doctor=doctor, specialty=self.main_specialty, university="Damascus"
+            )
+            Clinic.objects.create(
+                doctor=doctor,
+                address="Test Street",
+                location=Point(36.3, 33.5, srid=4326),
+                phone=f"011 223 {self.doctors_count:04d}",
+            )
+            Favorite.objects.create(patient=self.patient, doctor=doctor)
+
+    def count_queries(self, path):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context.captured_queries), response
+
+    def assertConstantQueries(self, path, results=lambda response: response.data):
+        self.create_doctors(1)
+        few, _ = self.count_queries(path)
+        self.create_doctors(4)
+        many, response = self.count_queries(path)
+
+        self.assertEqual(len(results(response)), 5)
+        self.assertEqual(few, many)
+        return response
+
+    def test_newest_doctors(self):
+        self.client.force_authenticate(self.patient_user)
+        response = self.assertConstantQueries(reverse("doctor-newest-list"))
+
+        self.assertEqual(
+            {doctor["rates"] for doctor in response.data},
+            set(Doctor.objects.values_list("rates_count", flat=True)),
+        )
+
+    def test_search_doctors(self):
+        self.assertConstantQueries(
+            reverse("doctor-search"), lambda response: response.data["results"]
+        )
+
+    @patch("doctors.views.highest_rated.get_route_matrix_elements", return_value=[])
+    def test_highest_rated_doctors(self, get_route_matrix_elements):
+        self.client.force_authenticate(self.patient_user)
+        self.assertConstantQueries(reverse("doctor-highest-rated-list"))
+
+    def test_favorite_doctors(self):
+        self.client.force_authenticate(self.patient_user)
+        self.assertConstantQueries(
+            reverse("favorite-list-create"), lambda response: response.data["results"]
+        )
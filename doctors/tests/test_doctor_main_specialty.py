@@ -0,0 +1,124 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from common.utils import generate_test_pdf
+from doctors.models import Doctor, DoctorSpecialty, Specialty
+from doctors.registry import SpecialtyRegistry
+from users.models import CustomUser as User
+
+
+@override_settings(SPECIALTY_REGISTRY_CHECK_INTERVAL=0)
+class DoctorMainSpecialtyTests(TestCase):
+    def setUp(self):
+        cache_patcher = patch.object(
+            SpecialtyRegistry, "cache", LocMemCache(self.id(), {})
+        )
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+
+        self.main_specialty = Specialty.objects.create(
+            name_en="Cardiology", name_ar="قلبية"
+        )
+        self.subspecialty = Specialty.objects.create(
+            name_en="Pediatric Cardiology", name_ar="قلبية أطفال"
+        )
+        self.subspecialty.main_specialties.add(self.main_specialty)
+
+        user = User.objects.create_user(
+            phone="0988100001",
+            password="abcX123!",
+            first_name="doctor",
+            last_name="user",
+            role=User.Role.DOCTOR.value,
+            is_verified_phone=True,
+            gender="female",
+            birth_date="1990-05-01",
+        )
+        self.doctor = Doctor.objects.create(
+            user=user,
+            about="About Test",
+            education="Test",
+            certificate=generate_test_pdf(),
+            start_work_date=timezone.now().date() - timedelta(days=30),
+            status=Doctor.Status.APPROVED.value,
+        )
+
+    def test_bulk_created_specialties_are_denormalized(self):
+        main, _ = DoctorSpecialty.objects.bulk_create(
+            [
+                DoctorSpecialty(
+                    doctor=self.doctor,
+                    specialty=self.main_specialty,
+                    university="Damascus",
+                ),
+                DoctorSpecialty(
+                    doctor=self.doctor,
+                    specialty=self.subspecialty,
+                    university="Damascus",
+                ),
+            ]
+        )
+        self.doctor.refresh_from_db()
+
+        self.assertEqual(self.doctor.main_doctor_specialty_id, main.pk)
+        self.assertEqual(
+            self.doctor.specialty_ids,
+            sorted([self.main_specialty.pk, self.subspecialty.pk]),
+        )
+
+    def test_specialty_changes_are_denormalized(self):
+        main = DoctorSpecialty.objects.create(
+            doctor=self.doctor, specialty=self.main_specialty, university="Damascus"
+        )
+        sub = DoctorSpecialty.objects.create(
+            doctor=self.doctor, specialty=self.subspecialty, university="Damascus"
+        )
+        self.doctor.refresh_from_db()
+        self.assertEqual(self.doctor.main_doctor_specialty_id, main.pk)
+
+        sub.delete()
+        main.delete()
+        self.doctor.refresh_from_db()
+
+        self.assertIsNone(self.doctor.main_doctor_specialty_id)
+        self.assertEqual(self.doctor.specialty_ids, [])
+
+    def test_recategorized_specialty_is_denormalized(self):
+        sub = DoctorSpecialty.objects.create(
+            doctor=self.doctor, specialty=self.subspecialty, university="Damascus"
+        )
+        self.doctor.refresh_from_db()
+        self.assertIsNone(self.doctor.main_doctor_specialty_id)
+
+        self.subspecialty.main_specialties.clear()
+        self.doctor.refresh_from_db()
+
+        self.assertEqual(self.doctor.main_doctor_specialty_id, sub.pk)
+
+    def test_main_specialty_is_selected_with_the_doctor(self):
+        DoctorSpecialty.objects.create(
+            doctor=self.doctor, specialty=self.main_specialty, university="Damascus"
+        )
+        doctor = Doctor.objects.with_main_specialty().get(pk=self.doctor.pk)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(doctor.main_specialty.specialty, self.main_specialty)
+
+    def test_filter_by_specialty_uses_the_ids(self):
+        DoctorSpecialty.objects.create(
+            doctor=self.doctor, specialty=self.subspecialty, university="Damascus"
+        )
+
+        self.assertQuerySetEqual(
+            Doctor.objects.filter(specialty_ids__overlap=[self.subspecialty.pk]),
+            [self.doctor],
+        )
+        self.assertFalse(
+            Doctor.objects.filter(
+                specialty_ids__overlap=[self.main_specialty.pk]
+            ).exists()
+        )
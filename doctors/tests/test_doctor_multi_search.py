@@ -0,0 +1,132 @@
+import threading
+import time
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from common.cache import get_or_compute_once
+from common.utils import generate_test_pdf
+from doctors.models import Doctor, DoctorSpecialty, Specialty
+from doctors.services import balance_multi_search, multi_search
+from doctors.views.search import DoctorMultiSearchListView
+from users.models import CustomUser as User
+
+
+class DoctorMultiSearchTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.specialties = [
+            Specialty.objects.create(
+                name_en=f"Cardiology {index}", name_ar=f"قلبية {index}"
+            )
+            for index in range(3)
+        ]
+        cls.doctors = []
+        for index in range(8):
+            user = User.objects.create_user(
+                phone=f"098831000{index}",
+                password="abcX123!",
+                first_name="Samir",
+                last_name=f"Cardio{index}",
+                role=User.Role.DOCTOR.value,
+                is_verified_phone=True,
+                gender="male",
+                birth_date="1985-05-01",
+            )
+            doctor = Doctor.objects.create(
+                user=user,
+                about="About Test",
+                education="Test",
+                certificate=generate_test_pdf(),
+                start_work_date=timezone.now().date() - timedelta(days=365),
+                status=Doctor.Status.APPROVED.value,
+            )
+            DoctorSpecialty.objects.create(
+                doctor=doctor, specialty=cls.specialties[0], university="Damascus"
+            )
+            cls.doctors.append(doctor)
+        cls.path = reverse("doctor-multi-search")
+
+    def setUp(self):
+        cache_patcher = patch.object(
+            DoctorMultiSearchListView, "cache", LocMemCache(self.id(), {})
+        )
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+
+    def search(self, query):
+        response = self.client.get(self.path, {"query": query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_specialties_fill_the_share_doctors_leave(self):
+        data = self.search("cardiology")
+
+        self.assertEqual(len(data["specialties"]), 3)
+        self.assertEqual(len(data["doctors"]), 7)
+
+    @patch("doctors.views.search.multi_search", wraps=multi_search)
+    def test_identical_normalized_queries_are_cached(self, search):
+        first = self.search("Cardiology")
+        second = self.search("  cardiology ")
+
+        self.assertEqual(search.call_count, 1)
+        self.assertEqual(first, second)
+
+    def test_balance_gives_the_unused_share_to_the_other_side(self):
+        self.assertEqual(balance_multi_search(10, 10), (5, 5))
+        self.assertEqual(balance_multi_search(2, 10), (2, 8))
+        self.assertEqual(balance_multi_search(10, 2), (8, 2))
+        self.assertEqual(balance_multi_search(6, 2), (6, 2))
+        self.assertEqual(balance_multi_search(0, 0), (0, 0))
+
+
+class GetOrComputeOnceTests(SimpleTestCase):
+    def setUp(self):
+        self.cache = LocMemCache(self.id(), {})
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        time.sleep(0.2)
+        return [self.calls]
+
+    def test_concurrent_misses_compute_once(self):
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    get_or_compute_once(self.cache, "key", self.compute)
+                )
+            )
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results, [[1]] * 5)
+
+    def test_waiters_compute_when_the_first_caller_fails(self):
+        def fail():
+            time.sleep(0.1)
+            raise RuntimeError
+
+        def first_caller():
+            with self.assertRaises(RuntimeError):
+                get_or_compute_once(self.cache, "key", fail)
+
+        thread = threading.Thread(target=first_caller)
+        thread.start()
+        time.sleep(0.05)
+
+        self.assertEqual(get_or_compute_once(self.cache, "key", self.compute), [1])
+        thread.join()
@@ -0,0 +1,91 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+
+from common.normalization import normalize_search_text
+from common.utils import generate_test_pdf
+from doctors.models import Doctor, DoctorSpecialty, Specialty
+from users.models import CustomUser as User
+
+
+class DoctorSearchDocumentTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.specialty = Specialty.objects.create(name_en="Cardiology", name_ar="قلبية")
+        cls.user = User.objects.create_user(
+            phone="0988300000",
+            password="abcX123!",
+            first_name="Samir",
+            last_name="Khalil",
+            role=User.Role.DOCTOR.value,
+            is_verified_phone=True,
+            gender="male",
+            birth_date="1985-05-01",
+        )
+        cls.doctor = Doctor.objects.create(
+            user=cls.user,
+            about="About Test",
+            education="Test",
+            certificate=generate_test_pdf(),
+            start_work_date=timezone.now().date() - timedelta(days=365),
+            status=Doctor.Status.APPROVED.value,
+        )
+        DoctorSpecialty.objects.create(
+            doctor=cls.doctor, specialty=cls.specialty, university="Damascus"
+        )
+        cls.path = reverse("doctor-search")
+
+    def search(self, query):
+        response = self.client.get(self.path, {"query": query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [doctor["user"]["id"] for doctor in response.data["results"]]
+
+    def test_document_holds_names_and_specialties(self):
+        self.doctor.refresh_from_db()
+        self.specialty.refresh_from_db()
+
+        self.assertEqual(self.doctor.search_document, "samir khalil cardiology قلبيه")
+        self.assertEqual(self.specialty.search_document, "cardiology قلبيه")
+
+    def test_doctors_are_found_by_misspelled_name_and_specialty(self):
+        self.assertEqual(self.search("Khalill"), [self.doctor.pk])
+        self.assertEqual(self.search("cardiolgy"), [self.doctor.pk])
+        self.assertEqual(self.search("قلبية"), [self.doctor.pk])
+        self.assertEqual(self.search("Dermatology"), [])
+
+    def test_arabic_spelling_variants_match(self):
+        self.assertEqual(self.search("قَلْبِيّة"), [self.doctor.pk])
+        self.assertEqual(self.search("قلـــبيه"), [self.doctor.pk])
+
+    def test_document_follows_renames(self):
+        self.user.last_name = "Haddad"
+        self.user.save()
+        self.specialty.name_en = "Cardiac Surgery"
+        self.specialty.save()
+
+        self.assertEqual(self.search("Haddad"), [self.doctor.pk])
+        self.assertEqual(self.search("Khalil"), [])
+        self.assertEqual(self.search("surgery"), [self.doctor.pk])
+
+    def test_removing_a_specialty_updates_the_document(self):
+        DoctorSpecialty.objects.filter(doctor=self.doctor).delete()
+
+        self.assertEqual(self.search("Cardiology"), [])
+
+
+class NormalizeSearchTextTests(SimpleTestCase):
+    def test_arabic_variants_are_unified(self):
+        self.assertEqual(
+            normalize_search_text("إبراهيم"), normalize_search_text("ابراهيم")
+        )
+        self.assertEqual(
+            normalize_search_text("مستشفى"), normalize_search_text("مستشفي")
+        )
+        self.assertEqual(normalize_search_text("قلبية"), normalize_search_text("قلبيه"))
+
+    def test_diacritics_tatweel_case_and_spaces_are_removed(self):
+        self.assertEqual(normalize_search_text("  Samir   قَلْبِـــيّة "), "samir قلبيه")
@@ -0,0 +1,96 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.gis.geos import Point
+from django.urls import reverse
+from django.utils import timezone
+from google.maps.routing_v2.types import RouteMatrixElement
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from clinics.models import Clinic
+from common.utils import generate_test_pdf
+from doctors.filters import DoctorOrdering
+from doctors.models import Doctor, DoctorSpecialty, Specialty
+from users.models import CustomUser as User
+
+
+class DoctorSearchDistanceOrderingTests(APITestCase):
+    # Clinics in straight-line order north of the origin, with their road distances
+    ROAD_DISTANCES = [5000, 3000, 1000, 4000, 2000]
+
+    @classmethod
+    def setUpTestData(cls):
+        main_specialty = Specialty.objects.create(name_en="Test1", name_ar="تجريبي1")
+        cls.doctors = []
+        for index, road_distance in enumerate(cls.ROAD_DISTANCES):
+            user = User.objects.create_user(
+                phone=f"098820000{index}",
+                password="abcX123!",
+                first_name="doctor",
+                last_name=f"user{index}",
+                role=User.Role.DOCTOR.value,
+                is_verified_phone=True,
+                gender="female",
+                birth_date="1990-05-01",
+            )
+            doctor = Doctor.objects.create(
+                user=user,
+                about="About Test",
+                education="Test",
+                certificate=generate_test_pdf(),
+                start_work_date=timezone.now().date() - timedelta(days=30),
+                status=Doctor.Status.APPROVED.value,
+            )
+            DoctorSpecialty.objects.create(
+                doctor=doctor, specialty=main_specialty, university="Damascus"
+            )
+            Clinic.objects.create(
+                doctor=doctor,
+                address="Test Street",
+                location=Point(36.3, 33.5 + (index + 1) / 100, srid=4326),
+                phone=f"011 223 333{index}",
+            )
+            cls.doctors.append(doctor)
+        cls.path = reverse("doctor-search")
+
+    def route_matrix_elements(self, origins, destinations, field_mask_list, **kwargs):
+        self.requested_destinations.append(len(destinations))
+        return [
+            RouteMatrixElement(
+                origin_index=0,
+                destination_index=index,
+                distance_meters=self.ROAD_DISTANCES[
+                    round(destination["latitude"] * 100) - 3351
+                ],
+            )
+            for index, destination in enumerate(destinations)
+        ]
+
+    def get_page(self, page):
+        response = self.client.get(
+            self.path,
+            {
+                "ordering": "distance",
+                "latitude": 33.5,
+                "longitude": 36.3,
+                "page_size": 2,
+                "page": page,
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [doctor["user"]["id"] for doctor in response.data["results"]]
+
+    @patch.object(DoctorOrdering, "distance_margin", 1)
+    def test_pages_are_refined_by_road_distance_and_stable(self):
+        self.requested_destinations = []
+        with patch(
+            "doctors.filters.get_route_matrix_elements",
+            side_effect=self.route_matrix_elements,
+        ):
+            pages = [self.get_page(page) for page in (1, 2, 3)]
+
+        ids = [doctor.pk for doctor in self.doctors]
+        self.assertEqual(pages, [[ids[1], ids[2]], [ids[3], ids[4]], [ids[0]]])
+        # Only the candidates up to the page plus the margin are refined
+        self.assertEqual(self.requested_destinations[0], 3)
@@ -0,0 +1,76 @@
+from unittest.mock import patch
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from doctors.models import DoctorSpecialty, Specialty
+from doctors.registry import SpecialtyRegistry, specialty_registry
+
+
+@override_settings(SPECIALTY_REGISTRY_CHECK_INTERVAL=0)
+class SpecialtyRegistryTests(TestCase):
+    def setUp(self):
+        cache_patcher = patch.object(
+            SpecialtyRegistry, "cache", LocMemCache(self.id(), {})
+        )
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+
+        self.main_specialty = Specialty.objects.create(
+            name_en="Cardiology", name_ar="قلبية"
+        )
+        self.subspecialty = Specialty.objects.create(
+            name_en="Pediatric Cardiology", name_ar="قلبية أطفال"
+        )
+        self.subspecialty.main_specialties.add(self.main_specialty)
+
+    def test_specialty_list_is_served_without_queries(self):
+        self.client.get(reverse("specialty-list"))
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("specialty-list"))
+
+        self.assertEqual(
+            [specialty["id"] for specialty in response.data], [self.main_specialty.pk]
+        )
+        self.assertEqual(
+            [specialty["id"] for specialty in response.data[0]["subspecialties"]],
+            [self.subspecialty.pk],
+        )
+
+    def test_changes_invalidate_the_registry(self):
+        self.assertTrue(specialty_registry.is_main_specialty(self.main_specialty.pk))
+        other = Specialty.objects.create(name_en="Neurology", name_ar="عصبية")
+
+        self.assertTrue(specialty_registry.is_main_specialty(other.pk))
+
+        other.main_specialties.add(self.main_specialty)
+
+        self.assertFalse(specialty_registry.is_main_specialty(other.pk))
+        self.assertTrue(
+            specialty_registry.is_subspecialty_of(other.pk, self.main_specialty.pk)
+        )
+
+    def test_other_processes_reload_on_version_change(self):
+        other_process = SpecialtyRegistry()
+        self.assertEqual(other_process.main_specialty_ids(), {self.main_specialty.pk})
+
+        Specialty.objects.filter(pk=self.subspecialty.pk).update(
+            name_en="Cardiac Surgery"
+        )
+        specialty_registry.invalidate()
+
+        self.assertEqual(
+            other_process.get(self.subspecialty.pk).name_en, "Cardiac Surgery"
+        )
+
+    def test_categorized_specialties_need_no_self_join(self):
+        queryset = DoctorSpecialty.objects.main_specialties_only()
+
+        self.assertNotIn(
+            Specialty.subspecialties.through._meta.db_table, str(queryset.query)
+        )
+        self.assertNotIn(
+            "DISTINCT", str(Specialty.objects.main_specialties_only().query)
+        )
@@ -1,4 +1,3 @@
-from django.contrib.auth.models import AnonymousUser
 from django.utils.translation import gettext_lazy as _
 from rest_framework import status
 from rest_framework import generics
@@ -8,7 +7,8 @@ from rest_framework.throttling import ScopedRateThrottle
 from rest_framework.parsers import MultiPartParser
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiExample
 
-from doctors.models import Doctor, Specialty
+from doctors.documents import get_doctor_cards, get_doctor_detail, set_is_favorite
+from doctors.models import Doctor
 from doctors.serializers import (
     DoctorLoginSerializer,
     DoctorCreateSerializer,
@@ -19,6 +19,7 @@ from doctors.serializers import (
     DoctorDetailSerializer,
 )
 from doctors.permissions import IsDoctorWithClinic
+from doctors.registry import specialty_registry
 from users.models import CustomUser as User
 
 
@@ -88,7 +89,11 @@ class DoctorRetrieveUpdateView(generics.RetrieveUpdateAPIView):
 
     def get_queryset(self):
         user: User = self.request.user
-        return Doctor.objects.with_full_profile().filter(user=user)
+        return (
+            Doctor.objects.with_full_profile()
+            .with_categorized_specialties()
+            .filter(user=user)
+        )
 
     def get_object(self):
         return self.get_queryset().first()
@@ -100,9 +105,11 @@ class DoctorRetrieveUpdateView(generics.RetrieveUpdateAPIView):
     tags=["Specialty"],
 )
 class SpecialtyListView(generics.ListAPIView):
-    queryset = Specialty.objects.main_specialties_with_their_subspecialties()
     serializer_class = SpecialtyListSerializer
 
+    def get_queryset(self):
+        return specialty_registry.main_specialties()
+
 
 @extend_schema(
     summary="List Newest Doctors",
@@ -113,11 +120,11 @@ class DoctorNewestListView(generics.ListAPIView):
     serializer_class = DoctorSummarySerializer
 
     def get_queryset(self):
-        user = self.request.user
-        qs = Doctor.objects.with_full_profile().order_by("-user__created_at")
-        if isinstance(user, AnonymousUser):
-            return qs[:7]
-        return qs.with_is_favorite_for_patient(user.id)[:7]
+        return Doctor.objects.not_deleted().approved().order_by("-user__created_at")
+
+    def list(self, request, *args, **kwargs):
+        doctor_ids = self.get_queryset().values_list("pk", flat=True)[:7]
+        return Response(get_doctor_cards(request, doctor_ids))
 
 
 @extend_schema(
@@ -129,8 +136,12 @@ class DoctorDetailRetrieveView(generics.RetrieveAPIView):
     serializer_class = DoctorDetailSerializer
 
     def get_queryset(self):
-        user = self.request.user
-        qs = Doctor.objects.with_full_profile()
-        if isinstance(user, AnonymousUser):
-            return qs
-        return qs.with_is_favorite_for_patient(user.id)
+        return Doctor.objects.with_full_profile().with_categorized_specialties()
+
+    def retrieve(self, request, *args, **kwargs):
+        detail = get_doctor_detail(request, self.kwargs["pk"])
+        if detail is None:
+            # Not rendered yet, or not a listed doctor
+            detail = self.get_serializer(self.get_object()).data
+            set_is_favorite(request.user, [detail])
+        return Response(detail)
@@ -1,20 +1,20 @@
-from django.contrib.auth.models import AnonymousUser
 from django.utils.translation import gettext_lazy as _
 from rest_framework import generics
 from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiExample
 
-from services.googlemaps import X_GOOG_FIELDMASK
+from services.googlemaps import X_GOOG_FIELDMASK, is_approximate
 from services import get_route_matrix_elements
 
+from doctors.documents import get_doctor_cards
 from doctors.models import Doctor
 from doctors.serializers import (
     DoctorHighestRatedSerializer,
 )
 from patients.serializers import LocationQuerySerializer
 
-from appointments.services import get_next_available_slots_for_clinics
+from appointments.services import get_cached_next_available_slots_for_clinics
 
 
 @extend_schema(
@@ -26,38 +26,41 @@ class DoctorHighestRatedListView(generics.ListAPIView):
     serializer_class = DoctorHighestRatedSerializer
 
     def list(self, request, *args, **kwargs):
-        qs = self.get_queryset()
-        doctors = list(qs)
+        doctors = list(self.get_queryset())
+        cards = {
+            card["user"]["id"]: card
+            for card in get_doctor_cards(request, [doctor.pk for doctor in doctors])
+        }
         latitude, longitude = self.get_lat_lng()
         origins = [{"latitude": latitude, "longitude": longitude}]
-        slots = get_next_available_slots_for_clinics([doctor.pk for doctor in doctors])
-        destinations = [
-            {"longitude": doctor.clinic.longitude, "latitude": doctor.clinic.latitude}
-            for doctor in doctors
-        ]
-        route_matrix_elements = self.get_route_matrix_elements(origins, destinations)
-        for route_matrix_element in route_matrix_elements:
-            doctor = doctors[route_matrix_element.destination_index]
-            doctor.clinic_distance = route_matrix_element.distance_meters
-
+        slots = get_cached_next_available_slots_for_clinics(
+            [doctor.pk for doctor in doctors]
+        )
         for doctor in doctors:
             visit_date, visit_time = slots.get(doctor.pk, (None, None))
             if visit_date is None:
-                doctor.appointment = None
+                cards[doctor.pk]["appointment"] = None
                 continue
-            doctor.appointment = {
+            cards[doctor.pk]["appointment"] = {
                 "visit_date": visit_date,
                 "visit_time": visit_time,
             }
-        serializer = self.get_serializer(qs, many=True)
-        return Response(serializer.data)
+
+        destinations = [
+            {"longitude": doctor.clinic.longitude, "latitude": doctor.clinic.latitude}
+            for doctor in doctors
+        ]
+        route_matrix_elements = self.get_route_matrix_elements(origins, destinations)
+        for route_matrix_element in route_matrix_elements:
+            card = cards[doctors[route_matrix_element.destination_index].pk]
+            card["clinic_distance"] = int(route_matrix_element.distance_meters)
+            card["is_approximate_distance"] = is_approximate(route_matrix_element)
+        return Response([cards[doctor.pk] for doctor in doctors])
 
     def get_queryset(self):
-        user = self.request.user
-        qs = Doctor.objects.with_full_profile().order_by("-rate")
-        if isinstance(user, AnonymousUser):
-            return qs[:7]
-        return qs.with_is_favorite_for_patient(user.id)[:7]
+        return (
+            Doctor.objects.not_deleted().approved().with_clinic().order_by("-rate")[:7]
+        )
 
     def get_route_matrix_elements(self, origins, destinations):
         return get_route_matrix_elements(
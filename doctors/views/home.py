@@ -1,4 +1,6 @@
 from django.utils.timezone import datetime, timedelta, now
+from datetime import date
+from calendar import monthrange
 from drf_spectacular.utils import extend_schema, OpenApiExample, extend_schema_view
 
 
@@ -11,6 +13,11 @@ from rest_framework import status
 from doctors.permissions import IsDoctorWithClinic
 from doctors.serializers import NumOfAppointmentsSerializer, BasicStatisticsSerializer
 from appointments.models import Appointment
+from clinic_statistics.services import (
+    count_appointments_by_day,
+    get_clinic_daily_stats,
+    sum_clinic_daily_stats,
+)
 
 
 @extend_schema(
@@ -49,43 +56,33 @@ from appointments.models import Appointment
 )
 class NumOfAppointmentsView(APIView):
     permission_classes = [IsAuthenticated, IsDoctorWithClinic]
-    
+
     def get(self, request):
         start_date_str = request.query_params.get("start-date")
         end_date_str = request.query_params.get("end-date")
-        
+
         if not start_date_str or not end_date_str:
             return Response(
                 {"detail": "start-date and end-date are required"},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
+
         start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
         end_date = datetime.strptime(end_date_str, "%Y-%m-%d").date()
-        
+
         user = request.user
         clinic = getattr(user.doctor, "clinic", None)
-        
-        output = []
-        
-        current_date = start_date
-        
-        while current_date <= end_date:
-            num_of_appointments = Appointment.objects.filter(
-                clinic=clinic,
-                visit_date=current_date
-            ).exclude(
-                status=Appointment.Status.CANCELLED
-            ).count()
-            
-            day_data = {"date": current_date, "num_of_appointments": num_of_appointments}
-            
-            output.append(day_data)
-            current_date += timedelta(days=1)
-        
+
+        output = [
+            {"date": day, "num_of_appointments": num_of_appointments}
+            for day, num_of_appointments in count_appointments_by_day(
+                clinic.pk, start_date, end_date
+            ).items()
+        ]
+
         serializer = NumOfAppointmentsSerializer(output, many=True)
         return Response(serializer.data, status.HTTP_200_OK)
-            
+
 @extend_schema(
     summary="Basic Statistics",
     description="Count num_of_absent_patients_this_month, num_of_booked_appointment_this_month, num_of_registered_patients",
@@ -106,11 +103,11 @@ class NumOfAppointmentsView(APIView):
 
 class BasicStatisticsView(APIView):
     permission_classes = [IsAuthenticated, IsDoctorWithClinic]
-    
+
     def get(self, request):
         user = request.user
         clinic = getattr(user.doctor, "clinic", None)
-        
+
         appointments = Appointment.objects.filter(
             clinic=clinic,
             visit_date__year=now().year,
@@ -118,21 +115,32 @@ class BasicStatisticsView(APIView):
         ).exclude(
             status=Appointment.Status.CANCELLED
         )
-        
-        num_of_absent_patients_this_month = appointments.filter(
-            status=Appointment.Status.ABSENT
-        ).count()
-        
-        num_of_booked_appointment_this_month = appointments.count()
-        
+
+        current_year, current_month = now().year, now().month
+        this_month = sum_clinic_daily_stats(
+            get_clinic_daily_stats(
+                clinic.pk,
+                date(current_year, current_month, 1),
+                date(
+                    current_year,
+                    current_month,
+                    monthrange(current_year, current_month)[1],
+                ),
+                ["appointments"],
+            )
+        )
+
+        num_of_absent_patients_this_month = this_month["num_of_absent"]
+
+        num_of_booked_appointment_this_month = this_month["num_of_appointments"]
+
         num_of_registered_patients = appointments.values("patient").distinct().count()
-        
+
         data = {
             "num_of_absent_patients_this_month": num_of_absent_patients_this_month,
             "num_of_booked_appointment_this_month": num_of_booked_appointment_this_month,
             "num_of_registered_patients": num_of_registered_patients
         }
-        
+
         serializer = BasicStatisticsSerializer(data)
         return Response(serializer.data, status.HTTP_200_OK)
-            
\ No newline at end of file
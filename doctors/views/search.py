@@ -1,3 +1,8 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import caches
 from django.utils.translation import gettext_lazy as _
 
 from rest_framework import generics
@@ -5,15 +10,21 @@ from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiTypes
 
+from common.cache import get_or_compute_once
 from common.filters import TrigramSearchFilter
+from common.normalization import normalize_search_text
 
+from doctors.documents import get_doctor_cards
 from doctors.models import Doctor, Specialty
 from doctors.filters import (
     DoctorSpecialtyFilter,
     DoctorGenderFilter,
     DoctorDistanceFilter,
     DoctorOrdering,
+    get_origin,
 )
+from doctors.registry import specialty_registry
+from doctors.services import multi_search
 from doctors.serializers import (
     DoctorSummarySerializer,
     DoctorMultiSearchResultSerializer,
@@ -29,14 +40,14 @@ class DoctorSearchPagination(PageNumberPagination):
 
 @extend_schema(
     summary="Search Doctors",
-    description="Search and filter doctors using full name trigram matching, filtering, and ordering options. "
+    description="Search and filter doctors using trigram matching on their names and specialties, filtering, and ordering options. "
     "Supports pagination and returns summarized doctor data.",
     parameters=[
         OpenApiParameter(
             name="query",
             type=OpenApiTypes.STR,
             location=OpenApiParameter.QUERY,
-            description="Search by doctor's first or last name",
+            description="Search by doctor's first or last name, or specialty name (English or Arabic)",
         ),
         OpenApiParameter(
             name="specialties",
@@ -100,7 +111,6 @@ class DoctorSearchPagination(PageNumberPagination):
     tags=["Doctor"],
 )
 class DoctorSearchListView(generics.ListAPIView):
-    queryset = Doctor.objects.distinct().with_full_profile()
     serializer_class = DoctorSummarySerializer
     pagination_class = DoctorSearchPagination
     filter_backends = [
@@ -110,7 +120,18 @@ class DoctorSearchListView(generics.ListAPIView):
         DoctorDistanceFilter,
         DoctorOrdering,
     ]
-    search_fields = ["user__first_name", "user__last_name"]
+    search_fields = ["search_document"]
+
+    def get_queryset(self):
+        # The clinic locates the doctor for the distance filter and ordering
+        return Doctor.objects.not_deleted().approved().with_clinic()
+
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        cards = get_doctor_cards(
+            request, [doctor.pk for doctor in page], with_favorites=False
+        )
+        return self.get_paginated_response(cards)
 
 
 @extend_schema(
@@ -165,44 +186,60 @@ class DoctorSearchListView(generics.ListAPIView):
 )
 class DoctorMultiSearchListView(generics.ListAPIView):
     serializer_class = DoctorMultiSearchResultSerializer
+    max_total = 10
+    cache = caches["search"]
+    filter_params = ["specialties", "gender", "distance", "unit"]
 
-    def list(self, request, *args, **kwargs):
-        self.queryset = Doctor.objects.distinct().with_full_profile()
+    def get_cache_key(self, request):
+        params = {
+            "query": normalize_search_text(
+                request.query_params.get(TrigramSearchFilter.search_param, "")
+            ),
+            **{param: request.query_params.get(param) for param in self.filter_params},
+        }
+        if params["specialties"]:
+            params["specialties"] = sorted(
+                pk.strip() for pk in params["specialties"].split(",") if pk.strip()
+            )
+        if params["distance"]:
+            params["origin"] = get_origin(request)
+        digest = hashlib.sha256(
+            json.dumps(params, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        return f"multi:{digest}"
+
+    def search(self):
+        self.queryset = Doctor.objects.with_full_profile()
         self.filter_backends = [
             TrigramSearchFilter,
             DoctorSpecialtyFilter,
             DoctorGenderFilter,
             DoctorDistanceFilter,
         ]
-        self.search_fields = ["user__first_name", "user__last_name"]
+        self.search_fields = ["search_document"]
         doctor_qs = self.filter_queryset(self.get_queryset())
-        self.queryset = Specialty.objects.distinct().main_specialties_only()
+        self.queryset = Specialty.objects.main_specialties_only()
         self.filter_backends = [TrigramSearchFilter]
-        self.search_fields = ["name_en", "name_ar"]
+        self.search_fields = ["search_document"]
         specialty_qs = self.filter_queryset(self.get_queryset())
 
-        doctor_count = doctor_qs.count()
-        specialty_count = specialty_qs.count()
-
-        max_total = 10
-        half = max_total // 2
-
-        max_doctors = min(doctor_count, half)
-        max_specialties = min(specialty_count, half)
+        return multi_search(doctor_qs, specialty_qs, self.max_total)
 
-        remaining = max_total - (max_doctors + max_specialties)
-        if remaining > 0:
-            if doctor_count - max_doctors >= remaining:
-                max_doctors += remaining
-            else:
-                max_specialties += remaining
-
-        doctors = doctor_qs[:max_doctors]
-        specialties = specialty_qs[:max_specialties]
+    def list(self, request, *args, **kwargs):
+        doctor_ids, specialty_ids = get_or_compute_once(
+            self.cache,
+            self.get_cache_key(request),
+            self.search,
+            lock_timeout=settings.MULTI_SEARCH_LOCK_TIMEOUT,
+        )
 
+        doctors = Doctor.objects.with_full_profile().in_bulk(doctor_ids)
+        specialties = Specialty.objects.in_bulk(specialty_ids)
         data = {
-            "doctors": doctors,
-            "specialties": specialties,
+            "doctors": [doctors[pk] for pk in doctor_ids if pk in doctors],
+            "specialties": [
+                specialties[pk] for pk in specialty_ids if pk in specialties
+            ],
         }
 
         serializer = self.get_serializer(data)
@@ -219,15 +256,13 @@ class DoctorMultiSearchListView(generics.ListAPIView):
 class SubspecialtySearchListView(generics.ListAPIView):
     serializer_class = SpecialtySerializer
     filter_backends = [TrigramSearchFilter]
-    search_fields = ["name_en", "name_ar"]
+    search_fields = ["search_document"]
 
     def get_queryset(self):
         pk = self.kwargs["pk"]
-        main_specialty = (
-            Specialty.objects.main_specialties_with_their_subspecialties()
-            .filter(pk=pk)
-            .first()
+        if not specialty_registry.is_main_specialty(pk):
+            return Specialty.objects.none()
+        subspecialties = specialty_registry.get(pk).subspecialties.all()
+        return Specialty.objects.filter(
+            pk__in=[subspecialty.pk for subspecialty in subspecialties]
         )
-        if main_specialty:
-            return main_specialty.subspecialties.all()
-        return Specialty.objects.none()
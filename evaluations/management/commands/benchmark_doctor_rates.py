@@ -0,0 +1,113 @@
+import time as timer
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Avg
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+
+from appointments.models import Appointment
+from clinics.models import Clinic
+from common.benchmark import rolled_back
+from evaluations.models import Evaluation
+from evaluations.services import rebuild_patient_ratings
+from patients.models import Patient
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks keeping a doctor's rate up to date on a clinic with many "
+        "generated evaluations, comparing the incremental aggregates with a "
+        "full recompute. Everything runs in a rolled back transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=100_000)
+        parser.add_argument(
+            "--patients",
+            type=int,
+            default=100,
+            help="Number of existing patients rating the clinic",
+        )
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument(
+            "--clinic", type=int, help="Clinic id, defaults to the first clinic"
+        )
+
+    def handle(self, *args, **options):
+        clinic = (
+            Clinic.objects.filter(pk=options["clinic"])
+            if options["clinic"]
+            else Clinic.objects.all()
+        )
+        clinic = clinic.first()
+        patients = list(Patient.objects.select_related("user")[: options["patients"]])
+        if clinic is None or not patients:
+            raise CommandError("A clinic and a patient are required.")
+
+        with rolled_back():
+            self.run(clinic, patients, options["count"], options["repeat"])
+
+    def run(self, clinic, patients, count, repeat):
+        start = datetime.combine(
+            now().date() - timedelta(days=count // 1440 + 1), datetime.min.time()
+        )
+        appointments = Appointment.objects.bulk_create(
+            [
+                Appointment(
+                    patient=patients[i % len(patients)].user,
+                    clinic=clinic,
+                    visit_date=(start + timedelta(minutes=i)).date(),
+                    visit_time=(start + timedelta(minutes=i)).time(),
+                    status=Appointment.Status.COMPLETED,
+                )
+                for i in range(count + repeat)
+            ],
+            batch_size=5000,
+        )
+        Evaluation.objects.bulk_create(
+            [
+                Evaluation(
+                    patient=patients[i % len(patients)],
+                    appointment=appointment,
+                    clinic=clinic,
+                    rate=i % 5 + 1,
+                )
+                for i, appointment in enumerate(appointments[:count])
+            ],
+            batch_size=5000,
+        )
+
+        started = timer.perf_counter()
+        rebuild_patient_ratings([clinic.pk])
+        rebuild = timer.perf_counter() - started
+
+        started = timer.perf_counter()
+        for _ in range(repeat):
+            patient_averages = list(
+                Evaluation.objects.by_clinic(clinic.pk)
+                .values("patient")
+                .annotate(patient_avg_rate=Avg("rate"))
+                .values_list("patient_avg_rate", flat=True)
+            )
+        full = (timer.perf_counter() - started) / repeat
+
+        with CaptureQueriesContext(connection) as queries:
+            started = timer.perf_counter()
+            for i, appointment in enumerate(appointments[count:]):
+                evaluation = Evaluation.objects.create(
+                    patient=patients[i % len(patients)], appointment=appointment, rate=5
+                )
+                evaluation.rate = 1
+                evaluation.save()
+            incremental = (timer.perf_counter() - started) / repeat
+
+        self.stdout.write(f"evaluations:              {count}")
+        self.stdout.write(f"raters:                   {len(patient_averages)}")
+        self.stdout.write(f"rebuild:                  {rebuild * 1000:.1f} ms")
+        self.stdout.write(
+            f"full recompute:           {full * 1000:.2f} ms per evaluation save"
+        )
+        self.stdout.write(f"incremental create+edit:  {incremental * 1000:.2f} ms")
+        self.stdout.write(f"queries per create+edit:  {len(queries) / repeat:.1f}")
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from evaluations.services import rebuild_patient_ratings
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the per (clinic, patient) rating aggregates and the doctors' "
+        "rates derived from them from the evaluations."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--clinic",
+            type=int,
+            action="append",
+            dest="clinics",
+            help="Clinic id to rebuild, may be repeated; defaults to every clinic",
+        )
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_patient_ratings(options["clinics"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rebuilt} rating aggregates."))
@@ -0,0 +1,77 @@
+# Generated by Django 5.2.1 on 2025-09-06 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def populate_evaluation_clinic(apps, schema_editor):
+    Appointment = apps.get_model("appointments", "Appointment")
+    Evaluation = apps.get_model("evaluations", "Evaluation")
+
+    Evaluation.objects.update(
+        clinic_id=Subquery(
+            Appointment.objects.filter(pk=OuterRef("appointment_id")).values(
+                "clinic_id"
+            )[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("appointments", "0004_reminder"),
+        ("clinics", "0003_trigram_ext"),
+        ("evaluations", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="evaluation",
+            name="clinic",
+            field=models.ForeignKey(
+                editable=False,
+                help_text="Clinic of the evaluated appointment",
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="evaluations",
+                to="clinics.clinic",
+                verbose_name="Clinic",
+            ),
+        ),
+        migrations.AddField(
+            model_name="historicalevaluation",
+            name="clinic",
+            field=models.ForeignKey(
+                blank=True,
+                db_constraint=False,
+                editable=False,
+                help_text="Clinic of the evaluated appointment",
+                null=True,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="+",
+                to="clinics.clinic",
+                verbose_name="Clinic",
+            ),
+        ),
+        migrations.RunPython(populate_evaluation_clinic, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="evaluation",
+            name="clinic",
+            field=models.ForeignKey(
+                editable=False,
+                help_text="Clinic of the evaluated appointment",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="evaluations",
+                to="clinics.clinic",
+                verbose_name="Clinic",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="evaluation",
+            index=models.Index(
+                fields=["clinic", "updated_at"], name="evaluations_clinic__c301c0_idx"
+            ),
+        ),
+    ]
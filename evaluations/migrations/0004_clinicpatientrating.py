@@ -0,0 +1,114 @@
+# Generated by Django 5.2.1 on 2025-09-08 10:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Avg, Count, F, FloatField, Sum
+from django.db.models.functions import Cast
+
+
+def populate_patient_ratings(apps, schema_editor):
+    ClinicPatientRating = apps.get_model("evaluations", "ClinicPatientRating")
+    Doctor = apps.get_model("doctors", "Doctor")
+    Evaluation = apps.get_model("evaluations", "Evaluation")
+
+    rows = (
+        Evaluation.objects.values("clinic_id", "patient_id")
+        .annotate(rates_sum=Sum("rate"), rates_count=Count("id"))
+        .order_by()
+    )
+    ClinicPatientRating.objects.bulk_create(
+        (ClinicPatientRating(**row) for row in rows.iterator()),
+        batch_size=1000,
+    )
+
+    totals = (
+        ClinicPatientRating.objects.annotate(
+            patient_average=Cast("rates_sum", FloatField()) / F("rates_count")
+        )
+        .values("clinic_id")
+        .annotate(
+            averages_sum=Sum("patient_average"),
+            raters=Count("id"),
+            average_rate=Avg("patient_average"),
+        )
+        .order_by()
+    )
+    Doctor.objects.bulk_update(
+        [
+            Doctor(
+                pk=row["clinic_id"],
+                rates_sum=row["averages_sum"],
+                rates_count=row["raters"],
+                rate=round(row["average_rate"], 1),
+            )
+            for row in totals
+        ],
+        ["rates_sum", "rates_count", "rate"],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clinics", "0003_trigram_ext"),
+        ("doctors", "0005_doctor_rates_count_doctor_rates_sum_and_more"),
+        ("evaluations", "0003_evaluation_clinic"),
+        ("patients", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ClinicPatientRating",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "rates_sum",
+                    models.PositiveIntegerField(default=0, verbose_name="Sum of Rates"),
+                ),
+                (
+                    "rates_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Number of Rates"
+                    ),
+                ),
+                (
+                    "clinic",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="patient_ratings",
+                        to="clinics.clinic",
+                        verbose_name="Clinic",
+                    ),
+                ),
+                (
+                    "patient",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="clinic_ratings",
+                        to="patients.patient",
+                        verbose_name="Patient",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Clinic Patient Rating",
+                "verbose_name_plural": "Clinic Patient Ratings",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("clinic", "patient"),
+                        name="unique_clinic_patient_rating",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(populate_patient_ratings, migrations.RunPython.noop),
+    ]
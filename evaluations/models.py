@@ -22,7 +22,7 @@ class EvaluationQuerySet(models.QuerySet):
         return self.filter(created_at__gte=twenty_four_hours_ago)
 
     def by_clinic(self, clinic_id):
-        return self.filter(appointment__clinic_id=clinic_id)
+        return self.filter(clinic_id=clinic_id)
 
     def comment_not_empty(self):
         return self.filter(comment__isnull=False)
@@ -57,6 +57,14 @@ class Evaluation(models.Model):
         related_name="evaluation",
         verbose_name=_("Appointment"),
     )
+    clinic = models.ForeignKey(
+        Clinic,
+        on_delete=models.CASCADE,
+        related_name="evaluations",
+        editable=False,
+        verbose_name=_("Clinic"),
+        help_text=_("Clinic of the evaluated appointment"),
+    )
     rate = models.IntegerField(validators=[MinValueValidator(1), MaxValueValidator(5)], verbose_name=_("Rate"))
     comment = models.TextField(null=True, blank=True, verbose_name=_("Comment"))
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created At"))
@@ -71,10 +79,10 @@ class Evaluation(models.Model):
     def editable(self):
         return self.created_at + timedelta(hours=24) > timezone.now()
 
-    @property
-    @admin.display(description=_("Clinic"))
-    def clinic(self) -> Clinic:
-        return self.appointment.clinic
+    def save(self, *args, **kwargs):
+        if self.clinic_id is None:
+            self.clinic_id = self.appointment.clinic_id
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{str(self.patient)} - {self.rate}"
@@ -85,5 +93,47 @@ class Evaluation(models.Model):
         indexes = [
             models.Index(fields=["created_at"]),
             models.Index(fields=["updated_at"]),
+            models.Index(fields=["clinic", "updated_at"]),
         ]
         ordering = ["-created_at"]
+
+
+class ClinicPatientRating(models.Model):
+    """
+    Running aggregate of one patient's evaluations of a clinic, kept in step
+    with Evaluation so that the doctor's rate never has to be recomputed
+    from every evaluation of the clinic.
+    """
+
+    clinic = models.ForeignKey(
+        Clinic,
+        on_delete=models.CASCADE,
+        related_name="patient_ratings",
+        verbose_name=_("Clinic"),
+    )
+    patient = models.ForeignKey(
+        Patient,
+        on_delete=models.CASCADE,
+        related_name="clinic_ratings",
+        verbose_name=_("Patient"),
+    )
+    rates_sum = models.PositiveIntegerField(default=0, verbose_name=_("Sum of Rates"))
+    rates_count = models.PositiveIntegerField(
+        default=0, verbose_name=_("Number of Rates")
+    )
+
+    @property
+    def average(self):
+        return self.rates_sum / self.rates_count if self.rates_count else None
+
+    def __str__(self):
+        return f"{str(self.patient)} - {self.clinic_id}"
+
+    class Meta:
+        verbose_name = _("Clinic Patient Rating")
+        verbose_name_plural = _("Clinic Patient Ratings")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["clinic", "patient"], name="unique_clinic_patient_rating"
+            ),
+        ]
@@ -0,0 +1,123 @@
+from django.db import transaction
+from django.db.models import Count, F, FloatField, Sum, Value
+from django.db.models.functions import Cast, Coalesce, NullIf, Round
+
+from doctors.documents import refresh_doctor_documents
+from doctors.models import Doctor
+from .models import ClinicPatientRating, Evaluation
+
+
+def doctor_rate(rates_sum, rates_count):
+    """
+    The doctor's rate from the sum and number of per-patient average rates,
+    rounded to one decimal in SQL so that every path rounds halves alike.
+    """
+    return Coalesce(
+        Round(rates_sum / NullIf(rates_count, 0), 1),
+        Value(0.0),
+        output_field=FloatField(),
+    )
+
+
+def update_patient_rating(clinic_id, patient_id, rate_delta, count_delta):
+    """
+    Applies a change of one patient's evaluations of a clinic to the running
+    aggregates and derives the doctor's rate and number of rates from them,
+    without reading the clinic's other evaluations.
+
+    The doctor's rate is the average of the per-patient average rates.
+    """
+    with transaction.atomic():
+        ratings = ClinicPatientRating.objects.select_for_update()
+        try:
+            if count_delta > 0:
+                rating, _ = ratings.get_or_create(
+                    clinic_id=clinic_id, patient_id=patient_id
+                )
+            else:
+                rating = ratings.get(clinic_id=clinic_id, patient_id=patient_id)
+        except ClinicPatientRating.DoesNotExist:
+            return
+
+        old_average = rating.average
+        rating.rates_sum += rate_delta
+        rating.rates_count += count_delta
+        new_average = rating.average
+
+        if rating.rates_count:
+            ClinicPatientRating.objects.filter(pk=rating.pk).update(
+                rates_sum=F("rates_sum") + rate_delta,
+                rates_count=F("rates_count") + count_delta,
+            )
+        else:
+            rating.delete()
+
+        raters_delta = (new_average is not None) - (old_average is not None)
+        sum_delta = (new_average or 0.0) - (old_average or 0.0)
+        if not raters_delta and not sum_delta:
+            return
+
+        Doctor.objects.filter(pk=clinic_id).update(
+            rates_sum=F("rates_sum") + sum_delta,
+            rates_count=F("rates_count") + raters_delta,
+            rate=doctor_rate(
+                F("rates_sum") + sum_delta, F("rates_count") + raters_delta
+            ),
+        )
+        refresh_doctor_documents([clinic_id])
+
+
+def rebuild_patient_ratings(clinic_ids=None):
+    """
+    Rebuilds the running aggregates, and the doctors' rates derived from
+    them, from the evaluations; all clinics are rebuilt when clinic_ids is
+    None.
+
+    Returns the number of rebuilt aggregates.
+    """
+    evaluations = Evaluation.objects.all()
+    ratings = ClinicPatientRating.objects.all()
+    doctors = Doctor.objects.all()
+    if clinic_ids is not None:
+        evaluations = evaluations.filter(clinic_id__in=clinic_ids)
+        ratings = ratings.filter(clinic_id__in=clinic_ids)
+        doctors = doctors.filter(pk__in=clinic_ids)
+
+    rows = (
+        evaluations.values("clinic_id", "patient_id")
+        .annotate(rates_sum=Sum("rate"), rates_count=Count("id"))
+        .order_by()
+    )
+
+    with transaction.atomic():
+        ratings.delete()
+        created = ClinicPatientRating.objects.bulk_create(
+            (ClinicPatientRating(**row) for row in rows.iterator()),
+            batch_size=1000,
+        )
+        doctors.update(rates_sum=0.0, rates_count=0)
+
+        totals = (
+            ratings.annotate(
+                patient_average=Cast("rates_sum", FloatField()) / F("rates_count")
+            )
+            .values("clinic_id")
+            .annotate(averages_sum=Sum("patient_average"), raters=Count("id"))
+            .order_by()
+        )
+        Doctor.objects.bulk_update(
+            [
+                Doctor(
+                    pk=row["clinic_id"],
+                    rates_sum=row["averages_sum"],
+                    rates_count=row["raters"],
+                )
+                for row in totals
+            ],
+            ["rates_sum", "rates_count"],
+            batch_size=1000,
+        )
+        doctors.update(rate=doctor_rate(F("rates_sum"), F("rates_count")))
+    refresh_doctor_documents(clinic_ids)
+
+    return len(created)
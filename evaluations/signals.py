@@ -1,23 +1,52 @@
 from django.dispatch import receiver
-from django.db.models.signals import post_save
-from django.db.models import Avg
+from django.db.models.signals import post_save, pre_delete, pre_save
 
-from doctors.models import Doctor
 from evaluations.models import Evaluation
+from evaluations.services import update_patient_rating
+
+
+@receiver(pre_save, sender=Evaluation)
+def remember_previous_rate(sender, instance, raw, **kwargs):
+    instance._previous = None
+    if instance.pk and not raw:
+        instance._previous = (
+            Evaluation.objects.filter(pk=instance.pk)
+            .values("clinic_id", "patient_id", "rate")
+            .first()
+        )
 
 
 @receiver(post_save, sender=Evaluation)
-def update_doctor_rate(sender, instance, created, **kwargs):
+def update_doctor_rate(sender, instance, created, raw, **kwargs):
     evaluation: Evaluation = instance
-    patient_averages = (
-        Evaluation.objects.by_clinic(evaluation.clinic.pk)
-        .values("patient")
-        .annotate(patient_avg_rate=Avg("rate"))
-        .values_list("patient_avg_rate", flat=True)
-    )
-
-    rate = 0.0
-    if patient_averages:
-        rate = sum(patient_averages) / len(patient_averages)
-
-    Doctor.objects.filter(pk=evaluation.clinic.pk).update(rate=rate)
+    if raw:
+        return
+
+    previous = getattr(evaluation, "_previous", None)
+    if previous and (previous["clinic_id"], previous["patient_id"]) != (
+        evaluation.clinic_id,
+        evaluation.patient_id,
+    ):
+        update_patient_rating(
+            previous["clinic_id"], previous["patient_id"], -previous["rate"], -1
+        )
+        previous = None
+
+    if previous:
+        if previous["rate"] != evaluation.rate:
+            update_patient_rating(
+                evaluation.clinic_id,
+                evaluation.patient_id,
+                evaluation.rate - previous["rate"],
+                0,
+            )
+    else:
+        update_patient_rating(
+            evaluation.clinic_id, evaluation.patient_id, evaluation.rate, 1
+        )
+
+
+@receiver(pre_delete, sender=Evaluation)
+def remove_doctor_rate(sender, instance, **kwargs):
+    # Runs before a cascade removes the aggregate together with the evaluation
+    update_patient_rating(instance.clinic_id, instance.patient_id, -instance.rate, -1)
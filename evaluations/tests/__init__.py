@@ -1,4 +1,5 @@
 from .test_create import *
 from .test_list import *
 from .test_retrieve import *
-from .test_update import *
\ No newline at end of file
+from .test_update import *
+from .test_rates import *
\ No newline at end of file
@@ -0,0 +1,129 @@
+from datetime import datetime, timedelta
+
+from django.contrib.gis.geos import Point
+from django.utils import timezone
+
+from appointments.models import Appointment
+from doctors.models import Doctor
+from evaluations.models import ClinicPatientRating, Evaluation
+from evaluations.services import rebuild_patient_ratings
+from evaluations.tests.base import EvaluationBaseTestCase
+from patients.models import Patient
+from users.models import CustomUser as User
+
+
+class DoctorRateTests(EvaluationBaseTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.patient_user_2 = User.objects.create_user(
+            phone="0999111131",
+            password="abcX123!",
+            first_name="Zora",
+            last_name="Ideale",
+            role=User.Role.PATIENT.value,
+            is_verified_phone=True,
+            gender="male",
+            birth_date="1995-05-01",
+        )
+        cls.patient_2 = Patient.objects.create(
+            user=cls.patient_user_2,
+            address="Damascus",
+            location=Point(36.29, 33.51, srid=4326),
+            job="Engineer",
+            blood_type="A+",
+            medical_history="",
+            surgical_history="",
+            allergies="",
+            medicines="",
+            is_smoker=False,
+            is_drinker=False,
+            is_married=False,
+        )
+        cls.start = datetime.combine(
+            timezone.now().date() - timedelta(days=30), datetime.min.time()
+        )
+        cls.appointments_count = 0
+
+    def evaluate(self, patient, rate):
+        visit = self.start + timedelta(minutes=self.appointments_count)
+        type(self).appointments_count += 1
+        appointment = Appointment.objects.create(
+            patient=patient.user,
+            clinic=self.clinic,
+            visit_date=visit.date(),
+            visit_time=visit.time(),
+            status=Appointment.Status.COMPLETED.value,
+        )
+        return Evaluation.objects.create(
+            patient=patient, appointment=appointment, rate=rate
+        )
+
+    def assertDoctorRate(self, rate, rates_count):
+        doctor = Doctor.objects.get(pk=self.doctor.pk)
+        self.assertAlmostEqual(float(doctor.rate), rate)
+        self.assertEqual(doctor.rates_count, rates_count)
+
+    def test_rate_is_average_of_patient_averages(self):
+        self.evaluate(self.patient, 5)
+        self.evaluate(self.patient, 3)
+        self.evaluate(self.patient_2, 2)
+
+        self.assertDoctorRate(3.0, 2)
+        rating = ClinicPatientRating.objects.get(
+            clinic=self.clinic, patient=self.patient
+        )
+        self.assertEqual((rating.rates_sum, rating.rates_count), (8, 2))
+
+    def test_rate_follows_update_and_delete(self):
+        evaluation = self.evaluate(self.patient, 5)
+        self.evaluate(self.patient_2, 1)
+
+        evaluation.rate = 3
+        evaluation.save()
+        self.assertDoctorRate(2.0, 2)
+
+        evaluation.delete()
+        self.assertDoctorRate(1.0, 1)
+        self.assertFalse(
+            ClinicPatientRating.objects.filter(patient=self.patient).exists()
+        )
+
+    def test_rebuild_matches_incremental_aggregates(self):
+        for rate in (5, 4, 2):
+            self.evaluate(self.patient, rate)
+        self.evaluate(self.patient_2, 4)
+        incremental = Doctor.objects.values("rate", "rates_count").get(
+            pk=self.doctor.pk
+        )
+
+        Doctor.objects.filter(pk=self.doctor.pk).update(
+            rate=0.0, rates_sum=0.0, rates_count=0
+        )
+        rebuild_patient_ratings()
+
+        self.assertEqual(
+            Doctor.objects.values("rate", "rates_count").get(pk=self.doctor.pk),
+            incremental,
+        )
+
+    def test_rebuild_rounds_halves_like_incremental(self):
+        # Patient averages of 2.5 and 2.0 average to 2.25
+        self.evaluate(self.patient, 3)
+        self.evaluate(self.patient, 2)
+        self.evaluate(self.patient_2, 2)
+        self.assertDoctorRate(2.3, 2)
+
+        Doctor.objects.filter(pk=self.doctor.pk).update(
+            rate=0.0, rates_sum=0.0, rates_count=0
+        )
+        rebuild_patient_ratings([self.clinic.pk])
+
+        self.assertDoctorRate(2.3, 2)
+
+    def test_rate_follows_cascade_delete(self):
+        self.evaluate(self.patient, 4)
+        self.evaluate(self.patient_2, 2).appointment.delete()
+
+        self.assertDoctorRate(4.0, 1)
@@ -6,3 +6,6 @@ class FavoritesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "favorites"
     verbose_name = _("Favorites")
+
+    def ready(self):
+        import favorites.signals
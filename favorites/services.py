@@ -0,0 +1,37 @@
+from django.core.cache import caches
+from django.db import transaction
+
+from .models import Favorite
+
+
+def get_favorites_cache():
+    return caches["favorites"]
+
+
+def favorite_doctor_ids_key(patient_id):
+    return f"patient:{patient_id}"
+
+
+def get_favorite_doctor_ids(patient_id) -> frozenset[int]:
+    """
+    Returns the ids of the doctors in the patient's favorites with a single
+    cache read, loading them from the database on a miss.
+    """
+    cache = get_favorites_cache()
+    key = favorite_doctor_ids_key(patient_id)
+    doctor_ids = cache.get(key)
+    if doctor_ids is None:
+        doctor_ids = frozenset(
+            Favorite.objects.filter(patient_id=patient_id).values_list(
+                "doctor_id", flat=True
+            )
+        )
+        cache.set(key, doctor_ids)
+    return doctor_ids
+
+
+def invalidate_favorite_doctor_ids(patient_id):
+    key = favorite_doctor_ids_key(patient_id)
+    get_favorites_cache().delete(key)
+    # Again on commit, as concurrent requests may cache the old ids until then
+    transaction.on_commit(lambda: get_favorites_cache().delete(key))
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from patients.models import Patient
+from .models import Favorite
+from .services import invalidate_favorite_doctor_ids
+
+
+@receiver(post_save, sender=Favorite)
+@receiver(post_delete, sender=Favorite)
+def invalidate_patient_favorites(sender, instance, **kwargs):
+    invalidate_favorite_doctor_ids(instance.patient_id)
+
+
+@receiver(post_save, sender=Patient)
+def invalidate_new_patient_favorites(sender, instance, created, **kwargs):
+    # A reused id must not inherit the favorites cached for a deleted patient
+    if created:
+        invalidate_favorite_doctor_ids(instance.pk)
@@ -1,2 +1,3 @@
 from .test_destroy import *
 from .test_list_create import *
+from .test_favorite_ids import *
@@ -0,0 +1,58 @@
+from unittest.mock import patch
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.urls import reverse
+from rest_framework import status
+
+from favorites.services import get_favorite_doctor_ids
+
+from .base import FavoriteBaseTestCase
+
+
+class FavoriteDoctorIdsTestCase(FavoriteBaseTestCase):
+
+    def setUp(self):
+        cache_patcher = patch(
+            "favorites.services.get_favorites_cache",
+            return_value=LocMemCache(self.id(), {}),
+        )
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+        self.client.force_authenticate(self.patient_user)
+
+    def newest_is_favorite(self):
+        response = self.client.get(reverse("doctor-newest-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {doctor["user"]["id"]: doctor["is_favorite"] for doctor in response.data}
+
+    def test_favorite_ids_are_read_from_the_cache(self):
+        self.assertEqual(
+            get_favorite_doctor_ids(self.patient.pk), {self.favorite_doctor.pk}
+        )
+
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                get_favorite_doctor_ids(self.patient.pk), {self.favorite_doctor.pk}
+            )
+
+    def test_writes_update_the_favorite_ids(self):
+        self.assertEqual(self.newest_is_favorite(), {self.favorite_doctor.pk: True})
+
+        response = self.client.delete(
+            reverse("favorite-destroy", kwargs={"doctor_id": self.favorite_doctor.pk})
+        )
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.newest_is_favorite(), {self.favorite_doctor.pk: False})
+
+        response = self.client.post(
+            reverse("favorite-list-create"), {"doctor_id": self.favorite_doctor.pk}
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.newest_is_favorite(), {self.favorite_doctor.pk: True})
+
+    def test_anonymous_users_get_no_is_favorite(self):
+        self.client.force_authenticate(None)
+
+        response = self.client.get(reverse("doctor-newest-list"))
+
+        self.assertNotIn("is_favorite", response.data[0])
@@ -1,3 +1,4 @@
+from django.db.models import Prefetch
 from drf_spectacular.types import OpenApiTypes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.pagination import PageNumberPagination
@@ -8,6 +9,7 @@ from rest_framework.generics import (
 
 from drf_spectacular.utils import extend_schema_view, extend_schema, OpenApiParameter
 
+from doctors.models import Doctor
 from favorites.models import Favorite
 from patients.models import Patient
 from users.models import CustomUser as User
@@ -67,7 +69,12 @@ class FavoriteListCreateView(ListCreateAPIView):
 
     def get_queryset(self):
         patient: Patient = self.request.user.patient
-        return Favorite.objects.filter(patient_id=patient.pk)
+        return Favorite.objects.filter(patient_id=patient.pk).prefetch_related(
+            Prefetch(
+                "doctor",
+                queryset=Doctor.objects.with_user().with_clinic().with_main_specialty(),
+            )
+        )
 
     def perform_create(self, serializer):
         patient: Patient = self.request.user.patient
@@ -3,14 +3,13 @@ from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
 from doctors.models import Specialty
-from doctors.serializers import SpecialtySerializer
+from doctors.serializers import MainSpecialtyPrimaryKeyRelatedField, SpecialtySerializer
 
 from patients.models import Patient, PatientSpecialtyAccess
 
 
 class PatientSpecialtyAccessListCreateSerializer(serializers.ModelSerializer):
-    specialty_id = serializers.PrimaryKeyRelatedField(
-        queryset=Specialty.objects.main_specialties_only().all(),
+    specialty_id = MainSpecialtyPrimaryKeyRelatedField(
         source="specialty",
         write_only=True,
     )
@@ -13,5 +13,7 @@ python manage.py loaddata doctors
 # python manage.py loaddata doctor_specialties
 python manage.py loaddata clinics
 python manage.py loaddata assistants
+python manage.py rebuild_search_documents
+python manage.py rebuild_doctor_documents
 
 echo "✅ All seeders completed successfully!"
@@ -0,0 +1,50 @@
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def encode(latitude: float, longitude: float, precision: int) -> str:
+    """
+    Encodes a coordinate as a geohash of `precision` characters; every
+    coordinate of the same cell shares the same geohash.
+    """
+    latitude_range, longitude_range = [-90.0, 90.0], [-180.0, 180.0]
+    geohash = []
+    bit, char, even = 0, 0, True
+    while len(geohash) < precision:
+        value, value_range = (
+            (longitude, longitude_range) if even else (latitude, latitude_range)
+        )
+        middle = (value_range[0] + value_range[1]) / 2
+        char <<= 1
+        if value >= middle:
+            char |= 1
+            value_range[0] = middle
+        else:
+            value_range[1] = middle
+        even = not even
+        bit += 1
+        if bit == 5:
+            geohash.append(BASE32[char])
+            bit, char = 0, 0
+    return "".join(geohash)
+
+
+def decode(geohash: str) -> tuple[float, float]:
+    """
+    Returns the (latitude, longitude) of the center of the geohash cell.
+    """
+    latitude_range, longitude_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        bits = BASE32.index(char)
+        for shift in range(4, -1, -1):
+            value_range = longitude_range if even else latitude_range
+            middle = (value_range[0] + value_range[1]) / 2
+            if bits >> shift & 1:
+                value_range[0] = middle
+            else:
+                value_range[1] = middle
+            even = not even
+    return (
+        (latitude_range[0] + latitude_range[1]) / 2,
+        (longitude_range[0] + longitude_range[1]) / 2,
+    )
@@ -1,3 +1,9 @@
+import copy
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 from enum import Enum
 
 from google.maps.routing_v2.types import (
@@ -11,14 +17,134 @@ from google.maps.routing_v2.types import (
     Units,
     TrafficModel,
     TransitPreferences,
+    RouteMatrixElement,
+    RouteMatrixElementCondition,
+    FallbackInfo,
+    FallbackReason,
 )
+from google.api_core.exceptions import GoogleAPIError
 from google.protobuf.timestamp_pb2 import Timestamp
+from google.rpc import code_pb2
 from google.maps.routing_v2.services.routes import RoutesClient
 from google.api_core.client_options import ClientOptions
 from google.type.latlng_pb2 import LatLng
 
 from django.conf import settings
 from django.core.cache import caches
+from django.db import connection
+from prometheus_client import Counter
+
+from common.lazy import process_local
+
+from . import geohash
+
+
+ROUTE_CACHE_LOOKUPS = Counter(
+    "google_maps_route_cache_lookups_total",
+    "Route matrix elements looked up in the cache.",
+    ["result"],
+)
+ROUTE_FALLBACKS = Counter(
+    "google_maps_route_fallbacks_total",
+    "Route matrix requests answered from geodesic distances.",
+    ["reason"],
+)
+
+# Estimated average speeds in meters per second, used for fallback durations
+TRAVEL_MODE_SPEEDS = {
+    RouteTravelMode.WALK: 1.4,
+    RouteTravelMode.BICYCLE: 4.2,
+    RouteTravelMode.TRANSIT: 5.5,
+    RouteTravelMode.TWO_WHEELER: 8.3,
+    RouteTravelMode.DRIVE: 8.3,
+}
+
+
+class CircuitOpen(Exception):
+    pass
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing dependency for `reset_timeout` seconds once at
+    least `failure_rate` of the last `window` calls failed; calls slower
+    than `latency_budget` seconds count as failures. After the timeout a
+    single trial call decides whether to close the circuit again.
+    """
+
+    def __init__(self, failure_rate, window, min_calls, latency_budget, reset_timeout):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.latency_budget = latency_budget
+        self.reset_timeout = reset_timeout
+        self.outcomes = deque(maxlen=window)
+        self.opened_at = None
+        self.trial_running = False
+        self.lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        return self.opened_at is not None
+
+    def call(self, function, *args, **kwargs):
+        """
+        Calls the function unless the circuit is open, in which case
+        CircuitOpen is raised.
+        """
+        with self.lock:
+            trial = False
+            if self.opened_at is not None:
+                if (
+                    self.trial_running
+                    or time.monotonic() - self.opened_at < self.reset_timeout
+                ):
+                    raise CircuitOpen
+                self.trial_running = trial = True
+
+        started = time.monotonic()
+        try:
+            result = function(*args, **kwargs)
+        except Exception:
+            self.record(False, trial)
+            raise
+        self.record(time.monotonic() - started <= self.latency_budget, trial)
+        return result
+
+    def record(self, success, trial=False):
+        with self.lock:
+            if trial:
+                self.trial_running = False
+                if success:
+                    self.opened_at = None
+                    self.outcomes.clear()
+                else:
+                    self.opened_at = time.monotonic()
+                return
+
+            self.outcomes.append(success)
+            calls, failures = len(self.outcomes), self.outcomes.count(False)
+            if calls >= self.min_calls and failures >= self.failure_rate * calls:
+                self.opened_at = time.monotonic()
+                self.outcomes.clear()
+
+
+def is_approximate(route_matrix_element):
+    """
+    Whether the element was estimated from the geodesic distance instead of
+    being computed by the Routes API.
+    """
+    return "fallback_info" in route_matrix_element
+
+
+def is_definitive(route_matrix_element):
+    """
+    Whether the element is a lasting answer that may be cached: a route, or
+    the absence of one. Per-element errors may be transient.
+    """
+    return (
+        route_matrix_element.status.code == code_pb2.OK
+        or route_matrix_element.condition == RouteMatrixElementCondition.ROUTE_NOT_FOUND
+    )
 
 
 class X_GOOG_FIELDMASK(Enum):
@@ -35,15 +161,23 @@ class GoogleMapsService:
     For more information: https://googleapis.dev/python/routing/latest/index.html
     """
 
-    client = RoutesClient(
-        client_options=ClientOptions(api_key=settings.GOOGLE_MAPS_API_KEY)
-    )
     cache = caches["google_maps"]
+    breaker = CircuitBreaker(
+        failure_rate=settings.GOOGLE_MAPS_BREAKER_FAILURE_RATE,
+        window=settings.GOOGLE_MAPS_BREAKER_WINDOW,
+        min_calls=settings.GOOGLE_MAPS_BREAKER_MIN_CALLS,
+        latency_budget=settings.GOOGLE_MAPS_LATENCY_BUDGET,
+        reset_timeout=settings.GOOGLE_MAPS_BREAKER_RESET_TIMEOUT,
+    )
+
+    @process_local
+    def client(self):
+        return RoutesClient(
+            client_options=ClientOptions(api_key=settings.GOOGLE_MAPS_API_KEY)
+        )
 
-    def get_cache_key(
+    def get_options_key(
         self,
-        origins: list[dict],
-        destinations: list[dict],
         field_mask: str,
         travel_mode: RouteTravelMode | None,
         routing_preference: RoutingPreference | None,
@@ -73,19 +207,7 @@ class GoogleMapsService:
         if transit_preferences:
             tp_rp_value = transit_preferences.routing_preference.value
 
-        origin_keys = []
-        for origin in origins:
-            origin_keys.append(f"{origin["latitude"]:.6f},{origin['longitude']:.6}")
-
-        destination_keys = []
-        for destination in destinations:
-            destination_keys.append(
-                f"{destination["latitude"]:.6f},{destination["longitude"]:.6f}"
-            )
-
         return (
-            f"origins={'|'.join(origin_keys)};"
-            f"destinations={'|'.join(destination_keys)};"
             f"field_mask={field_mask};"
             f"travel_mode={travel_mode.value};"
             f"routing_preference={routing_preference.value};"
@@ -98,6 +220,30 @@ class GoogleMapsService:
             f"transit_preferences={tp_rp_value or 'none'}"
         )
 
+    def get_cache_key(self, origin_geohash: str, destination: dict, options_key: str):
+        """
+        Key of a single route matrix element; origins are keyed on their
+        geohash cell so that nearby users share cached elements.
+        """
+        return (
+            f"origin={origin_geohash};"
+            f"destination={destination["latitude"]:.6f},{destination["longitude"]:.6f};"
+            f"{options_key}"
+        )
+
+    def quantize(self, origin: dict):
+        """
+        Returns the geohash cell of the origin and its center, which is
+        sent to the API in place of the exact origin.
+        """
+        origin_geohash = geohash.encode(
+            origin["latitude"],
+            origin["longitude"],
+            settings.GOOGLE_MAPS_ORIGIN_GEOHASH_PRECISION,
+        )
+        latitude, longitude = geohash.decode(origin_geohash)
+        return origin_geohash, {"latitude": latitude, "longitude": longitude}
+
     def route_matrix(
         self,
         origins: list[dict],
@@ -113,11 +259,18 @@ class GoogleMapsService:
         traffic_model: TrafficModel | None = None,
         transit_preferences: TransitPreferences | None = None,
     ):
-        field_mask = ",".join(item.value for item in field_mask_list)
+        """
+        Returns the route matrix elements of every (origin, destination) pair,
+        ordered by origin then destination index.
 
-        cache_key = self.get_cache_key(
-            origins,
-            destinations,
+        Elements are cached one pair at a time; only the pairs missing from
+        the cache are requested from the API. While the API fails or the
+        circuit breaker is open, missing pairs are estimated from geodesic
+        distances and flagged by `is_approximate`; those are not cached, nor
+        are the elements the API returned with an error.
+        """
+        field_mask = ",".join(item.value for item in field_mask_list)
+        options_key = self.get_options_key(
             field_mask,
             travel_mode,
             routing_preference,
@@ -130,10 +283,201 @@ class GoogleMapsService:
             transit_preferences,
         )
 
-        cached_results = self.cache.get(cache_key)
-        if cached_results is not None:
-            return cached_results
+        quantized_origins = [self.quantize(origin) for origin in origins]
+        cache_keys = {
+            (origin_index, destination_index): self.get_cache_key(
+                origin_geohash, destination, options_key
+            )
+            for origin_index, (origin_geohash, _) in enumerate(quantized_origins)
+            for destination_index, destination in enumerate(destinations)
+        }
+        cached = self.cache.get_many(list(set(cache_keys.values())))
+
+        elements = {}
+        missing = []
+        for pair, cache_key in cache_keys.items():
+            if cache_key in cached:
+                elements[pair] = cached[cache_key]
+            else:
+                missing.append(pair)
+        ROUTE_CACHE_LOOKUPS.labels(result="hit").inc(len(elements))
+        ROUTE_CACHE_LOOKUPS.labels(result="miss").inc(len(missing))
+
+        if missing:
+            # Request the sub-matrix of the origins and destinations that
+            # have a missing pair; usually a single origin.
+            missing_origins = sorted({origin_index for origin_index, _ in missing})
+            missing_destinations = sorted(
+                {destination_index for _, destination_index in missing}
+            )
+            try:
+                fetched = self.breaker.call(
+                    self.compute_route_matrix,
+                    [quantized_origins[index][1] for index in missing_origins],
+                    [destinations[index] for index in missing_destinations],
+                    field_mask,
+                    travel_mode=travel_mode,
+                    routing_preference=routing_preference,
+                    departure_time=departure_time,
+                    arrival_time=arrival_time,
+                    language_code=language_code,
+                    region_code=region_code,
+                    units=units,
+                    traffic_model=traffic_model,
+                    transit_preferences=transit_preferences,
+                )
+            except (CircuitOpen, GoogleAPIError) as error:
+                reason = "circuit_open" if isinstance(error, CircuitOpen) else "error"
+                ROUTE_FALLBACKS.labels(reason=reason).inc()
+                estimates = self.estimate_route_matrix(
+                    [origins[index] for index in missing_origins],
+                    [destinations[index] for index in missing_destinations],
+                    travel_mode,
+                    missing_origins,
+                    missing_destinations,
+                )
+                for pair in missing:
+                    elements[pair] = estimates[pair]
+                fetched = []
+            to_cache = {}
+            for element in fetched:
+                pair = (
+                    missing_origins[element.origin_index],
+                    missing_destinations[element.destination_index],
+                )
+                elements[pair] = element
+                if is_definitive(element):
+                    to_cache[cache_keys[pair]] = element
+            self.cache.set_many(to_cache)
+
+        route_matrix_elements = []
+        for (origin_index, destination_index), element in sorted(elements.items()):
+            # Pairs sharing a cache key share the element
+            element = copy.copy(element)
+            element.origin_index = origin_index
+            element.destination_index = destination_index
+            route_matrix_elements.append(element)
+        return route_matrix_elements
 
+    def estimate_route_matrix(
+        self,
+        origins: list[dict],
+        destinations: list[dict],
+        travel_mode: RouteTravelMode | None,
+        origin_indexes: list[int],
+        destination_indexes: list[int],
+    ):
+        """
+        Returns {(origin index, destination index): element} estimated from
+        the PostGIS geodesic distance of every pair, with a duration at the
+        average speed of the travel mode.
+        """
+        pairs = [
+            (origin, destination) for origin in origins for destination in destinations
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT ST_Distance(
+                    ST_SetSRID(ST_MakePoint(pair.origin_longitude, pair.origin_latitude), 4326)::geography,
+                    ST_SetSRID(ST_MakePoint(pair.destination_longitude, pair.destination_latitude), 4326)::geography
+                )
+                FROM unnest(%s::float8[], %s::float8[], %s::float8[], %s::float8[])
+                    WITH ORDINALITY AS pair(origin_longitude, origin_latitude, destination_longitude, destination_latitude, ordinal)
+                ORDER BY pair.ordinal
+                """,
+                [
+                    [origin["longitude"] for origin, _ in pairs],
+                    [origin["latitude"] for origin, _ in pairs],
+                    [destination["longitude"] for _, destination in pairs],
+                    [destination["latitude"] for _, destination in pairs],
+                ],
+            )
+            distances = [distance for (distance,) in cursor.fetchall()]
+
+        speed = TRAVEL_MODE_SPEEDS[travel_mode or RouteTravelMode.DRIVE]
+        elements = {}
+        for position, distance in enumerate(distances):
+            pair = (
+                origin_indexes[position // len(destinations)],
+                destination_indexes[position % len(destinations)],
+            )
+            elements[pair] = RouteMatrixElement(
+                origin_index=pair[0],
+                destination_index=pair[1],
+                distance_meters=round(distance),
+                duration=timedelta(seconds=round(distance / speed)),
+                condition=RouteMatrixElementCondition.ROUTE_EXISTS,
+                fallback_info=FallbackInfo(reason=FallbackReason.SERVER_ERROR),
+            )
+        return elements
+
+    def compute_route_matrix(
+        self,
+        origins: list[dict],
+        destinations: list[dict],
+        field_mask: str,
+        **kwargs,
+    ):
+        """
+        Requests the route matrix of every origin and destination from the
+        API, split into requests within the element limit which are issued
+        concurrently.
+
+        The indexes of the returned elements refer to the given origins and
+        destinations.
+        """
+        if kwargs.get("routing_preference") == RoutingPreference.TRAFFIC_AWARE_OPTIMAL:
+            max_elements = settings.GOOGLE_MAPS_MAX_TRAFFIC_AWARE_OPTIMAL_ELEMENTS
+        else:
+            max_elements = settings.GOOGLE_MAPS_MAX_ROUTE_MATRIX_ELEMENTS
+
+        chunks = []
+        origins_chunk_size = min(len(origins), max_elements)
+        for origins_start in range(0, len(origins), origins_chunk_size):
+            origins_chunk = origins[origins_start : origins_start + origins_chunk_size]
+            destinations_chunk_size = max_elements // len(origins_chunk)
+            for destinations_start in range(
+                0, len(destinations), destinations_chunk_size
+            ):
+                destinations_end = destinations_start + destinations_chunk_size
+                chunks.append(
+                    (
+                        origins_start,
+                        origins_chunk,
+                        destinations_start,
+                        destinations[destinations_start:destinations_end],
+                    )
+                )
+
+        def compute_chunk(chunk):
+            origins_start, origins_chunk, destinations_start, destinations_chunk = chunk
+            elements = self.compute_route_matrix_chunk(
+                origins_chunk, destinations_chunk, field_mask, **kwargs
+            )
+            for element in elements:
+                element.origin_index += origins_start
+                element.destination_index += destinations_start
+            return elements
+
+        if len(chunks) == 1:
+            return compute_chunk(chunks[0])
+
+        max_workers = min(len(chunks), settings.GOOGLE_MAPS_MAX_CONCURRENT_REQUESTS)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return [
+                element
+                for elements in executor.map(compute_chunk, chunks)
+                for element in elements
+            ]
+
+    def compute_route_matrix_chunk(
+        self,
+        origins: list[dict],
+        destinations: list[dict],
+        field_mask: str,
+        **kwargs,
+    ):
         route_origins = [
             RouteMatrixOrigin(
                 waypoint=Waypoint(
@@ -163,24 +507,25 @@ class GoogleMapsService:
         request = ComputeRouteMatrixRequest(
             origins=route_origins,
             destinations=route_destinations,
-            travel_mode=travel_mode,
-            routing_preference=routing_preference,
-            departure_time=departure_time,
-            arrival_time=arrival_time,
-            language_code=language_code,
-            region_code=region_code,
-            units=units,
-            traffic_model=traffic_model,
-            transit_preferences=transit_preferences,
+            **kwargs,
+        )
+        # The indexes are needed to place the elements in the full matrix
+        field_mask = ",".join(
+            dict.fromkeys(
+                [
+                    *field_mask.split(","),
+                    X_GOOG_FIELDMASK.ORIGIN_INDEX.value,
+                    X_GOOG_FIELDMASK.DESTINATION_INDEX.value,
+                ]
+            )
         )
         headers = [("x-goog-fieldmask", field_mask)]
-        route_matrix_elements = list(
-            self.client.compute_route_matrix(request, metadata=headers)
+        # The deadline covers the whole response stream
+        return list(
+            self.client.compute_route_matrix(
+                request, metadata=headers, timeout=settings.GOOGLE_MAPS_REQUEST_TIMEOUT
+            )
         )
 
-        self.cache.set(cache_key, route_matrix_elements)
-
-        return route_matrix_elements
-
     def clear_cache(self):
         self.cache.clear()
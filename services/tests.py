@@ -0,0 +1,334 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import grpc
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase, TestCase, override_settings
+from google.api_core.exceptions import ServiceUnavailable
+from google.maps.routing_v2.services.routes import RoutesClient
+from google.maps.routing_v2.services.routes.transports import RoutesGrpcTransport
+from google.maps.routing_v2.types import (
+    ComputeRouteMatrixRequest,
+    RouteMatrixElement,
+    RouteMatrixElementCondition,
+)
+from google.rpc import code_pb2
+
+from services.googlemaps import (
+    CircuitBreaker,
+    CircuitOpen,
+    GoogleMapsService,
+    X_GOOG_FIELDMASK,
+    is_approximate,
+)
+
+
+class FakeRoutesClient:
+    """
+    Answers every pair with the destination latitude as distance.
+    """
+
+    def __init__(self):
+        self.requests = []
+
+    def compute_route_matrix(self, request, metadata, **kwargs):
+        self.requests.append(request)
+        for origin_index, _ in enumerate(request.origins):
+            for destination_index, destination in enumerate(request.destinations):
+                yield RouteMatrixElement(
+                    origin_index=origin_index,
+                    destination_index=destination_index,
+                    distance_meters=int(
+                        destination.waypoint.location.lat_lng.latitude * 1000
+                    ),
+                )
+
+
+class RouteMatrixCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.service = GoogleMapsService()
+        self.service.client = FakeRoutesClient()
+        self.service.cache = LocMemCache(self.id(), {})
+        self.origin = {"latitude": 33.5138, "longitude": 36.2765}
+        self.destinations = [
+            {"latitude": 33.0 + index / 100, "longitude": 36.0} for index in range(3)
+        ]
+
+    def route_matrix(self, origins, destinations):
+        elements = self.service.route_matrix(
+            origins, destinations, [X_GOOG_FIELDMASK.DISTANCE_METERS]
+        )
+        return [
+            (element.destination_index, element.distance_meters) for element in elements
+        ]
+
+    def test_only_missing_pairs_are_requested(self):
+        self.route_matrix([self.origin], self.destinations)
+        destinations = [
+            *self.destinations[:1],
+            {"latitude": 34.0, "longitude": 36.0},
+            *self.destinations[1:],
+        ]
+
+        elements = self.route_matrix([self.origin], destinations)
+
+        self.assertEqual(elements, [(0, 33000), (1, 34000), (2, 33010), (3, 33020)])
+        self.assertEqual(len(self.service.client.requests), 2)
+        self.assertEqual(len(self.service.client.requests[1].destinations), 1)
+
+    def test_nearby_origins_share_cached_elements(self):
+        self.route_matrix([self.origin], self.destinations)
+        nearby = {
+            "latitude": self.origin["latitude"] + 0.0001,
+            "longitude": self.origin["longitude"],
+        }
+
+        self.route_matrix([nearby], self.destinations)
+
+        self.assertEqual(len(self.service.client.requests), 1)
+
+
+class PartlyFailingRoutesClient(FakeRoutesClient):
+    """
+    Answers the first destination with an error and the second with no
+    route.
+    """
+
+    def compute_route_matrix(self, request, metadata, **kwargs):
+        for element in super().compute_route_matrix(request, metadata, **kwargs):
+            if element.destination_index == 0:
+                element = RouteMatrixElement(
+                    destination_index=0, status={"code": code_pb2.UNAVAILABLE}
+                )
+            elif element.destination_index == 1:
+                element = RouteMatrixElement(
+                    destination_index=1,
+                    condition=RouteMatrixElementCondition.ROUTE_NOT_FOUND,
+                )
+            yield element
+
+
+class RouteMatrixElementStatusTests(SimpleTestCase):
+    def setUp(self):
+        self.service = GoogleMapsService()
+        self.service.client = PartlyFailingRoutesClient()
+        self.service.cache = LocMemCache(self.id(), {})
+        self.origins = [{"latitude": 33.5138, "longitude": 36.2765}]
+        self.destinations = [
+            {"latitude": 33.0 + index / 100, "longitude": 36.0} for index in range(3)
+        ]
+
+    def route_matrix(self):
+        return self.service.route_matrix(
+            self.origins, self.destinations, [X_GOOG_FIELDMASK.DISTANCE_METERS]
+        )
+
+    def test_failed_elements_are_not_cached(self):
+        (failed, *_) = self.route_matrix()
+        self.service.client = FakeRoutesClient()
+
+        elements = self.route_matrix()
+
+        self.assertEqual(failed.status.code, code_pb2.UNAVAILABLE)
+        self.assertEqual(len(self.service.client.requests), 1)
+        self.assertEqual(len(self.service.client.requests[0].destinations), 1)
+        self.assertEqual(elements[0].distance_meters, 33000)
+        self.assertEqual(
+            elements[1].condition, RouteMatrixElementCondition.ROUTE_NOT_FOUND
+        )
+
+
+class RoutesClientTests(SimpleTestCase):
+    def test_client_is_built_on_first_use(self):
+        service = GoogleMapsService()
+        self.assertNotIn("client", vars(service))
+
+        self.assertIs(service.client, service.client)
+
+    def test_client_is_rebuilt_in_forked_processes(self):
+        service = GoogleMapsService()
+        parent_client = service.client
+
+        with patch("common.lazy.os.getpid", return_value=os.getpid() + 1):
+            self.assertIsNot(service.client, parent_client)
+
+
+class FakeRoutesServer:
+    """
+    Local gRPC server implementing ComputeRouteMatrix like FakeRoutesClient,
+    optionally answering after a delay.
+    """
+
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.requests = []
+        self.server = grpc.server(ThreadPoolExecutor(max_workers=8))
+        self.server.add_generic_rpc_handlers(
+            (
+                grpc.method_handlers_generic_handler(
+                    "google.maps.routing.v2.Routes",
+                    {
+                        "ComputeRouteMatrix": grpc.unary_stream_rpc_method_handler(
+                            self.compute_route_matrix,
+                            request_deserializer=ComputeRouteMatrixRequest.deserialize,
+                            response_serializer=RouteMatrixElement.serialize,
+                        )
+                    },
+                ),
+            )
+        )
+        self.port = self.server.add_insecure_port("127.0.0.1:0")
+
+    def compute_route_matrix(self, request, context):
+        self.requests.append(request)
+        time.sleep(self.delay)
+        yield from FakeRoutesClient().compute_route_matrix(request, metadata=None)
+
+    def __enter__(self):
+        self.server.start()
+        self.channel = grpc.insecure_channel(f"127.0.0.1:{self.port}")
+        return RoutesClient(transport=RoutesGrpcTransport(channel=self.channel))
+
+    def __exit__(self, *exc_info):
+        self.channel.close()
+        self.server.stop(None)
+
+
+@override_settings(
+    GOOGLE_MAPS_MAX_ROUTE_MATRIX_ELEMENTS=10, GOOGLE_MAPS_REQUEST_TIMEOUT=2
+)
+class RouteMatrixChunkTests(TestCase):
+    def setUp(self):
+        self.service = GoogleMapsService()
+        self.service.cache = LocMemCache(self.id(), {})
+        self.service.breaker = CircuitBreaker(
+            failure_rate=0.5, window=2, min_calls=2, latency_budget=1, reset_timeout=60
+        )
+        self.origins = [{"latitude": 33.5138, "longitude": 36.2765}]
+        self.destinations = [
+            {"latitude": 33.0 + index / 100, "longitude": 36.0} for index in range(25)
+        ]
+
+    def test_large_matrix_is_split_within_element_limit(self):
+        server = FakeRoutesServer()
+        with server as self.service.client:
+            elements = self.service.route_matrix(
+                self.origins, self.destinations, [X_GOOG_FIELDMASK.DISTANCE_METERS]
+            )
+
+        self.assertEqual(len(server.requests), 3)
+        self.assertTrue(
+            all(len(request.destinations) <= 10 for request in server.requests)
+        )
+        self.assertEqual(
+            [
+                (element.destination_index, element.distance_meters)
+                for element in elements
+            ],
+            [
+                (index, int(destination["latitude"] * 1000))
+                for index, destination in enumerate(self.destinations)
+            ],
+        )
+
+    @override_settings(GOOGLE_MAPS_REQUEST_TIMEOUT=0.2)
+    def test_slow_requests_hit_the_deadline(self):
+        with FakeRoutesServer(delay=1) as self.service.client:
+            started = time.monotonic()
+            elements = self.service.route_matrix(
+                self.origins, self.destinations, [X_GOOG_FIELDMASK.DISTANCE_METERS]
+            )
+
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertTrue(all(is_approximate(element) for element in elements))
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        self.breaker = CircuitBreaker(
+            failure_rate=0.5,
+            window=4,
+            min_calls=4,
+            latency_budget=0.05,
+            reset_timeout=0.1,
+        )
+
+    def fail(self):
+        raise ServiceUnavailable("unavailable")
+
+    def test_breaker_opens_at_failure_rate(self):
+        for function in (self.fail, lambda: None, self.fail, lambda: None):
+            try:
+                self.breaker.call(function)
+            except ServiceUnavailable:
+                pass
+
+        with self.assertRaises(CircuitOpen):
+            self.breaker.call(lambda: None)
+
+    def test_slow_calls_count_as_failures(self):
+        for _ in range(4):
+            self.breaker.call(time.sleep, 0.06)
+
+        self.assertTrue(self.breaker.is_open)
+
+    def test_successful_trial_closes_the_breaker(self):
+        for _ in range(4):
+            with self.assertRaises(ServiceUnavailable):
+                self.breaker.call(self.fail)
+
+        time.sleep(0.1)
+        self.assertEqual(self.breaker.call(lambda: "ok"), "ok")
+        self.assertFalse(self.breaker.is_open)
+
+
+class UnavailableRoutesClient:
+    def __init__(self):
+        self.calls = 0
+
+    def compute_route_matrix(self, request, metadata, **kwargs):
+        self.calls += 1
+        raise ServiceUnavailable("unavailable")
+
+
+class RouteMatrixFallbackTests(TestCase):
+    def setUp(self):
+        self.service = GoogleMapsService()
+        self.service.client = UnavailableRoutesClient()
+        self.service.cache = LocMemCache(self.id(), {})
+        self.service.breaker = CircuitBreaker(
+            failure_rate=0.5, window=2, min_calls=2, latency_budget=1, reset_timeout=60
+        )
+        self.origins = [{"latitude": 33.5, "longitude": 36.3}]
+        # About 1 km north of the origin
+        self.destinations = [{"latitude": 33.509, "longitude": 36.3}]
+
+    def route_matrix(self):
+        return self.service.route_matrix(
+            self.origins,
+            self.destinations,
+            [X_GOOG_FIELDMASK.DISTANCE_METERS, X_GOOG_FIELDMASK.DURATION],
+        )
+
+    def test_geodesic_distance_is_used_when_the_api_fails(self):
+        (element,) = self.route_matrix()
+
+        self.assertTrue(is_approximate(element))
+        self.assertAlmostEqual(element.distance_meters, 998, delta=5)
+        self.assertGreater(element.duration.total_seconds(), 0)
+
+    def test_estimates_are_not_cached(self):
+        self.route_matrix()
+        self.service.client = FakeRoutesClient()
+
+        (element,) = self.route_matrix()
+
+        self.assertFalse(is_approximate(element))
+
+    def test_open_breaker_skips_the_api(self):
+        for _ in range(3):
+            self.route_matrix()
+
+        self.assertEqual(self.service.client.calls, 2)
@@ -0,0 +1,91 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+from common.benchmark import Timings
+from users.services import SMSService
+
+
+class FakeTextBeeHandler(BaseHTTPRequestHandler):
+    """
+    Minimal stand-in for the TextBee send-sms endpoint.
+    """
+
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True
+    latency = 0.0
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        recipients = json.loads(body or b"{}").get("recipients", [])
+        time.sleep(self.latency)
+        payload = json.dumps(
+            {"data": {"success": True, "recipients": len(recipients)}}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeTextBeeServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class Command(BaseCommand):
+    help = "Benchmarks SMSService throughput against a local fake TextBee server."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument(
+            "--concurrency", type=int, default=10, help="Simulated worker slots"
+        )
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=0.005,
+            help="Fake gateway latency in seconds",
+        )
+        parser.add_argument(
+            "--no-session",
+            action="store_true",
+            help="Open a new connection per request, like a plain requests.post",
+        )
+
+    def handle(self, *args, **options):
+        handler = type(
+            "Handler", (FakeTextBeeHandler,), {"latency": options["latency"]}
+        )
+        server = FakeTextBeeServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        service = SMSService()
+        service.url = f"http://127.0.0.1:{server.server_port}/send-sms"
+        if options["no_session"]:
+            service.session.headers["Connection"] = "close"
+
+        def send(_):
+            started = time.perf_counter()
+            success, _ = service.send_sms("+963900000000", "Benchmark message")
+            return success, time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as executor:
+            results = list(executor.map(send, range(options["requests"])))
+        elapsed = time.perf_counter() - started
+        server.shutdown()
+
+        latencies = Timings(latency for _, latency in results)
+        failures = sum(1 for success, _ in results if not success)
+        self.stdout.write(f"requests:   {len(results)} ({failures} failed)")
+        self.stdout.write(f"throughput: {len(results) / elapsed:.1f} req/s")
+        self.stdout.write(f"latency:    {latencies}")
@@ -4,11 +4,18 @@ from django.core.cache import caches
 from django.conf import settings
 
 import random
+import time
 import requests
+from prometheus_client import Counter, Histogram
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
+from urllib3.exceptions import ReadTimeoutError
+from urllib3.util.retry import Retry
 from rest_framework import status
 from rest_framework.exceptions import AuthenticationFailed
 
+from common.lazy import process_local
+
 
 class OTPService:
     """
@@ -76,17 +83,35 @@ class OTPService:
         """
         self.validate(key, otp)
         self.cache.set(key, make_password("VERIFIED"), timeout=300)
-        
+
+
+SMS_REQUEST_DURATION = Histogram(
+    "sms_request_duration_seconds",
+    "Duration of TextBee send-sms requests.",
+    ["outcome"],
+)
+SMS_REQUEST_FAILURES = Counter(
+    "sms_request_failures_total",
+    "Failed TextBee send-sms requests.",
+    ["reason"],
+)
 
 
 class SMSService:
     """
     Service for sending SMS messages via the TextBee API.
 
+    Requests go through a pooled keep-alive session with connect/read
+    timeouts. Connection failures and throttling/unavailable responses are
+    retried with jittered exponential backoff; read timeouts are not, since
+    the gateway may already have sent the message.
+
     Attributes:
         api_key (str): API key for authenticating requests to TextBee.
         device_id (str): Identifier of the SMS sending device.
         url (str): Full endpoint URL for sending SMS messages.
+        timeout (tuple): (connect, read) timeouts in seconds.
+        session (requests.Session): Pooled HTTP session.
     """
 
     def __init__(self):
@@ -98,8 +123,38 @@ class SMSService:
         self.device_id = settings.TEXTBEE_DEVICE_ID
         # Construct the URL for the send-sms endpoint
         self.url = (
-            f"https://api.textbee.dev/api/v1/gateway/devices/{self.device_id}/send-sms"
+            f"{settings.TEXTBEE_API_URL}/gateway/devices/{self.device_id}/send-sms"
         )
+        self.timeout = (settings.SMS_CONNECT_TIMEOUT, settings.SMS_READ_TIMEOUT)
+
+    @process_local
+    def session(self):
+        """
+        Keep-alive session with a bounded connection pool and retries, built
+        on first use in each process.
+        """
+        retry = Retry(
+            total=settings.SMS_MAX_RETRIES,
+            connect=settings.SMS_MAX_RETRIES,
+            read=0,
+            status=settings.SMS_MAX_RETRIES,
+            status_forcelist=(429, 502, 503, 504),
+            allowed_methods=frozenset({"POST"}),
+            backoff_factor=0.5,
+            backoff_jitter=0.5,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=settings.SMS_POOL_MAXSIZE,
+            max_retries=retry,
+        )
+        session = requests.Session()
+        session.headers.update({"x-api-key": self.api_key})
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
 
     def send_sms(self, recipient, message):
         """
@@ -130,24 +185,28 @@ class SMSService:
                    On success, response is the JSON data from the API.
                    On failure, response is an error message.
         """
-        # Prepare HTTP headers with API key for authentication
-        headers = {
-            "x-api-key": self.api_key,
-        }
         # Prepare request payload containing recipients and message body
         payload = {
             "recipients": recipients,
             "message": message,
         }
 
+        started = time.perf_counter()
         try:
-            # Execute the POST request to the SMS gateway
-            response = requests.post(self.url, json=payload, headers=headers)
+            # Execute the POST request to the SMS gateway (API key is a session header)
+            response = self.session.post(self.url, json=payload, timeout=self.timeout)
             # Raise an exception for HTTP error codes (4xx, 5xx)
             response.raise_for_status()
+            SMS_REQUEST_DURATION.labels("success").observe(
+                time.perf_counter() - started
+            )
             # Return success flag and parsed JSON response
             return True, response.json()
         except RequestException as e:
+            SMS_REQUEST_DURATION.labels("failure").observe(
+                time.perf_counter() - started
+            )
+            SMS_REQUEST_FAILURES.labels(type(e).__name__).inc()
             # Handle exceptions and map to user-friendly messages
             return False, self._handle_exception(e)
 
@@ -173,6 +232,11 @@ class SMSService:
             # Other API errors: include response body for debugging
             else:
                 return f"API error: {exception.response.text}"
+        # Read timeouts reach here wrapped in a connection error by the retry adapter
+        elif isinstance(exception, requests.exceptions.ConnectionError) and isinstance(
+            getattr(exception.args[0], "reason", None), ReadTimeoutError
+        ):
+            return "Request timed out"
         # Network connectivity issues
         elif isinstance(exception, requests.exceptions.ConnectionError):
             return "Network connection failed"
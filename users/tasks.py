@@ -1,7 +1,14 @@
 from celery import shared_task
+from celery.utils.time import get_exponential_backoff_interval
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
 
+from common.cache import take_rate_limit_slot
 from .services import SMSService
 
+RATE_LIMIT_PERIODS = {"s": 1, "m": 60, "h": 3600}
+
 
 sms_service = SMSService()
 
@@ -16,3 +23,53 @@ def send_sms(phone, message):
 def send_bulk_sms(phones, message):
     recipients = [f"+963{phone[1:]}" for phone in phones]
     return sms_service.send_bulk_sms(recipients, message)
+
+
+@shared_task(bind=True, max_retries=5)
+def send_sms_batch(self, messages):
+    """
+    Sends a batch of (phone, message) pairs, one bulk request per distinct
+    message. Failed messages are retried with exponential backoff; the ones
+    already delivered are not sent again.
+
+    Batches beyond SMS_BATCH_RATE_LIMIT, counted across all the workers, are
+    postponed to the next window without using up their retries.
+    """
+    limit, unit = settings.SMS_BATCH_RATE_LIMIT.split("/")
+    wait = take_rate_limit_slot(
+        caches["default"], "sms-batch-rate", int(limit), RATE_LIMIT_PERIODS[unit]
+    )
+    if wait:
+        self.apply_async(args=(messages,), countdown=wait, retries=self.request.retries)
+        return f"{len(messages)} messages postponed"
+
+    phones_by_message = {}
+    for phone, message in messages:
+        phones_by_message.setdefault(message, []).append(phone)
+
+    failed = []
+    for message, phones in phones_by_message.items():
+        success, _ = send_bulk_sms(phones, message)
+        if not success:
+            failed.extend((phone, message) for phone in phones)
+
+    if failed:
+        countdown = get_exponential_backoff_interval(
+            factor=settings.SMS_BATCH_RETRY_BACKOFF,
+            retries=self.request.retries,
+            maximum=600,
+            full_jitter=True,
+        )
+        raise self.retry(args=(failed,), countdown=countdown)
+    return f"{len(messages)} messages sent"
+
+
+def enqueue_sms_batches(messages):
+    """
+    Enqueues (phone, message) pairs as send_sms_batch tasks of at most
+    SMS_BATCH_SIZE messages each, once the surrounding transaction commits.
+    """
+    messages = list(messages)
+    for start in range(0, len(messages), settings.SMS_BATCH_SIZE):
+        batch = messages[start : start + settings.SMS_BATCH_SIZE]
+        transaction.on_commit(lambda batch=batch: send_sms_batch.delay(batch))
@@ -3,3 +3,5 @@ from .test_destroy import *
 from .test_forgot_password import *
 from .test_image import *
 from .test_signup_otp import *
+from .test_sms_service import *
+from .test_sms_batch import *
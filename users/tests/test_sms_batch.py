@@ -0,0 +1,30 @@
+from unittest.mock import patch
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase, override_settings
+
+from users.tasks import send_sms_batch
+
+
+@override_settings(SMS_BATCH_RATE_LIMIT="2/h")
+class SMSBatchRateLimitTests(SimpleTestCase):
+    def setUp(self):
+        caches_patcher = patch(
+            "users.tasks.caches", {"default": LocMemCache(self.id(), {})}
+        )
+        caches_patcher.start()
+        self.addCleanup(caches_patcher.stop)
+
+    @patch("users.tasks.send_sms_batch.apply_async")
+    @patch("users.tasks.send_bulk_sms", return_value=(True, {}))
+    def test_batches_beyond_the_limit_are_postponed(self, send_bulk_sms, apply_async):
+        messages = [("0999999999", "message")]
+
+        for _ in range(3):
+            send_sms_batch.run(messages)
+
+        self.assertEqual(send_bulk_sms.call_count, 2)
+        apply_async.assert_called_once()
+        self.assertEqual(apply_async.call_args.kwargs["args"], (messages,))
+        self.assertGreater(apply_async.call_args.kwargs["countdown"], 0)
+        self.assertEqual(apply_async.call_args.kwargs["retries"], 0)
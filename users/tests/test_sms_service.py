@@ -0,0 +1,111 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.test import SimpleTestCase, override_settings
+from prometheus_client import REGISTRY
+
+from users.services import SMSService
+
+
+class GatewayHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.requests.append(self.headers["x-api-key"])
+        status_code, delay = self.server.responses.pop(0)
+        time.sleep(delay)
+        body = b'{"success": true}'
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class SMSServiceSessionTests(SimpleTestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), GatewayHandler)
+        self.server.requests = []
+        self.server.responses = []
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        settings_override = override_settings(
+            TEXTBEE_API_KEY="test-key",
+            TEXTBEE_API_URL=f"http://127.0.0.1:{self.server.server_port}",
+            SMS_CONNECT_TIMEOUT=1,
+            SMS_READ_TIMEOUT=0.2,
+            SMS_MAX_RETRIES=2,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_session_uses_the_configured_timeouts(self):
+        service = SMSService()
+
+        self.assertEqual(service.timeout, (1, 0.2))
+        retry = service.session.get_adapter(service.url).max_retries
+        self.assertEqual(
+            (retry.total, retry.connect, retry.read, retry.status), (2, 2, 0, 2)
+        )
+
+    def test_session_is_reused(self):
+        service = SMSService()
+        self.server.responses = [(200, 0), (200, 0)]
+
+        service.send_sms("0999999999", "first")
+        service.send_sms("0999999999", "second")
+
+        self.assertIs(service.session, service.session)
+        self.assertEqual(self.server.requests, ["test-key", "test-key"])
+
+    def test_unavailable_gateway_is_retried(self):
+        self.server.responses = [(503, 0), (503, 0), (200, 0)]
+
+        success, response = SMSService().send_sms("0999999999", "message")
+
+        self.assertTrue(success)
+        self.assertEqual(response, {"success": True})
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_retries_are_bounded(self):
+        self.server.responses = [(503, 0), (503, 0), (503, 0), (200, 0)]
+
+        success, _ = SMSService().send_sms("0999999999", "message")
+
+        self.assertFalse(success)
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_read_timeout_is_not_retried(self):
+        # The gateway may have sent the message before the response timed out
+        self.server.responses = [(200, 0.5), (200, 0)]
+
+        success, response = SMSService().send_sms("0999999999", "message")
+
+        self.assertFalse(success)
+        self.assertEqual(response, "Request timed out")
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_calls_are_measured(self):
+        def sample(name, **labels):
+            return REGISTRY.get_sample_value(name, labels) or 0
+
+        successes = sample("sms_request_duration_seconds_count", outcome="success")
+        failures = sample("sms_request_failures_total", reason="HTTPError")
+        self.server.responses = [(200, 0), (404, 0)]
+
+        SMSService().send_sms("0999999999", "message")
+        SMSService().send_sms("0999999999", "message")
+
+        self.assertEqual(
+            sample("sms_request_duration_seconds_count", outcome="success"),
+            successes + 1,
+        )
+        self.assertEqual(
+            sample("sms_request_failures_total", reason="HTTPError"), failures + 1
+        )